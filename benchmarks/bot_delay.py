@@ -0,0 +1,89 @@
+"""Measure how long bots actually take to play.
+
+A game with one human player and some bots runs in process. The human
+player passes immediately on each turn, and for every bot turn, the time
+between the turn starting and the bot's play arriving is compared with
+the `bot_play_delay` rule.
+
+Usage: python benchmarks/bot_delay.py [--delay SECONDS] [--turns N]
+"""
+
+import time
+from argparse import ArgumentParser
+from statistics import quantiles
+from typing import Any
+
+from tuno.server.models.Game import Game
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.shared.game_state_patch import apply_game_state_patch
+from tuno.shared.Scheduler import Scheduler
+from tuno.shared.sse_events import GameStateEvent, GameStatePatchEvent
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    scheduler = Scheduler()
+    scheduler.start()
+
+    game = Game("bench", scheduler=scheduler)
+    game.update_rules(
+        {
+            "bot_count": 2,
+            "bot_play_delay": args.delay,
+            "initial_hand_size": 16,
+            "shuffle_players": False,
+        },
+        operator_name=None,
+        operator_is_player=False,
+    )
+    human = game.get_player("human", allow_creation=True)
+    human.subscription_token = "bench"
+
+    game_state: Any = None
+    turn_begin: float | None = None
+    bot_turn_durations: list[float] = []
+    game.start(human.name)
+
+    while len(bot_turn_durations) < args.turns:
+
+        events = human.message_queue.drain(10, is_active=lambda: True)
+        timestamp = time.perf_counter()
+
+        previous_turn = game_state and game_state["current_player_index"]
+        for event in events:
+            if isinstance(event, GameStateEvent):
+                game_state = event.data
+            elif isinstance(event, GameStatePatchEvent):
+                game_state = apply_game_state_patch(game_state, event.data)
+        if not game_state["started"]:
+            break  # someone won
+
+        current_turn = game_state["current_player_index"]
+        if current_turn == previous_turn:
+            continue
+        if (turn_begin is not None) and (previous_turn != 0):
+            bot_turn_durations.append(timestamp - turn_begin)
+        turn_begin = timestamp
+
+        if current_turn == 0:  # human's turn
+            game.play(human.name, [], None)
+
+    percentiles = quantiles(bot_turn_durations, n=100)
+    print(
+        f"bot_play_delay={args.delay * 1000:.0f}ms "
+        f"turns={len(bot_turn_durations)} "
+        f"p50={percentiles[49] * 1000:.1f}ms "
+        f"p99={percentiles[98] * 1000:.1f}ms "
+        f"max={max(bot_turn_durations) * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Round-trip latency of client actions, with and without keep-alive.
+
+A server is started in a subprocess, and rule updates (as sent by
+`UnoClient.update_rules`) are sent to it (a) directly and (b) through a
+proxy simulating a slow link, which delays the bytes in each direction
+by half of `--rtt` and new connections by a whole round trip (for the
+TCP handshake). For each link, actions are sent:
+
+- `per_request`: by module-level `requests.put`, with a new connection
+  per action (as the client did before);
+- `session`: one by one over the keep-alive session of the client;
+- `queue`: all submitted to an `ActionQueue` at once, timing each action
+  from submission to its `on_done` (as the UI waits for it).
+
+Latency percentiles (ms) and the total time are printed as JSON lines.
+Note that the development server of the default backend closes every
+connection after a response, so connections are only kept alive by the
+async backend (`--async`).
+
+Usage: python benchmarks/client_actions.py [--actions N] [--rtt MS]
+       [--port PORT] [--async]
+"""
+
+import json
+import socket
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from contextlib import nullcontext
+from queue import Queue
+from statistics import quantiles
+from threading import Event, Thread
+
+import requests
+
+from tuno.client.utils.ActionQueue import ActionQueue, ApiAction, create_session
+
+RULES = {"shuffle_players": False}
+
+
+class DelayProxy:
+    """Forward TCP connections to `target`, delaying bytes by `delay`
+    seconds in each direction, and new connections by `2 * delay`."""
+
+    def __init__(self, target: tuple[str, int], delay: float) -> None:
+        self.target = target
+        self.delay = delay
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.address = self.listener.getsockname()
+        Thread(target=self.accept, daemon=True).start()
+
+    def accept(self) -> None:
+        while True:
+            client, _ = self.listener.accept()
+            Thread(target=self.connect, args=(client,), daemon=True).start()
+
+    def connect(self, client: socket.socket) -> None:
+        time.sleep(2 * self.delay)  # handshake
+        upstream = socket.create_connection(self.target)
+        for connection in (client, upstream):
+            # forward chunks as they're due, without waiting for acks
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for source, destination in ((client, upstream), (upstream, client)):
+            chunks: Queue[tuple[float, bytes]] = Queue()
+            Thread(target=self.read, args=(source, chunks), daemon=True).start()
+            Thread(target=self.write, args=(destination, chunks), daemon=True).start()
+
+    def read(self, source: socket.socket, chunks: "Queue[tuple[float, bytes]]") -> None:
+        while True:
+            try:
+                chunk = source.recv(65536)
+            except OSError:
+                chunk = b""
+            chunks.put((time.perf_counter() + self.delay, chunk))
+            if not chunk:
+                return
+
+    def write(
+        self,
+        destination: socket.socket,
+        chunks: "Queue[tuple[float, bytes]]",
+    ) -> None:
+        while True:
+            due_time, chunk = chunks.get()
+            time.sleep(max(0.0, due_time - time.perf_counter()))
+            try:
+                if chunk:
+                    destination.sendall(chunk)
+                else:
+                    destination.shutdown(socket.SHUT_WR)
+                    return
+            except OSError:
+                return
+
+
+def wait_for_server(base_url: str) -> None:
+    for _ in range(100):
+        try:
+            requests.get(base_url, timeout=0.5)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start.")
+
+
+def run_sequential(send: Callable[[], requests.Response], count: int) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(count):
+        timestamp_begin = time.perf_counter()
+        send().raise_for_status()
+        latencies.append(time.perf_counter() - timestamp_begin)
+    return latencies
+
+
+def run_queue(url: str, count: int) -> list[float]:
+
+    action_queue = ActionQueue(error_context=lambda error_title: nullcontext())
+    latencies: list[float] = []
+    all_done = Event()
+
+    def submit() -> None:
+        timestamp_begin = time.perf_counter()
+
+        def on_done(succeeded: bool) -> None:
+            assert succeeded
+            latencies.append(time.perf_counter() - timestamp_begin)
+            if len(latencies) == count:
+                all_done.set()
+
+        action_queue.submit(
+            ApiAction("PUT", url, "Benchmark", json=RULES, on_done=on_done)
+        )
+
+    for _ in range(count):
+        submit()
+    if not all_done.wait(timeout=count * 10):
+        raise RuntimeError("Actions timed out.")
+    action_queue.close()
+    return latencies
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    percentiles = quantiles(latencies, n=100)
+    return {
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p90_ms": round(percentiles[89] * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "total_ms": round(sum(latencies) * 1000, 1),
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--rtt", type=float, default=100, help="simulated RTT (ms)")
+    parser.add_argument("--port", type=int, default=5098)
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="test the async backend",
+    )
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tuno", "server", "-l", "ERROR"]
+        + ["--host", "127.0.0.1", "-p", str(args.port)]
+        + (["--async"] if args.use_async else []),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+
+        wait_for_server(f"http://127.0.0.1:{args.port}")
+        proxy = DelayProxy(("127.0.0.1", args.port), args.rtt / 2000)
+        links = {
+            "localhost": args.port,
+            f"rtt_{args.rtt:g}ms": proxy.address[1],
+        }
+
+        for link, port in links.items():
+
+            url = f"http://127.0.0.1:{port}/api/game/rules"
+            session = create_session()
+            results = {
+                "per_request": run_sequential(
+                    lambda: requests.put(url, json=RULES), args.actions
+                ),
+                "session": run_sequential(
+                    lambda: session.put(url, json=RULES), args.actions
+                ),
+                "queue": run_queue(url, args.actions),
+            }
+            session.close()
+
+            for mode, latencies in results.items():
+                summary = summarize(latencies)
+                if mode == "queue":
+                    # latencies overlap, as actions wait in the queue
+                    summary["total_ms"] = round(max(latencies) * 1000, 1)
+                print(
+                    json.dumps({"link": link, "mode": mode, **summary}),
+                    flush=True,
+                )
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Headless update time of the in-game screen at full capacity.
+
+The client app is run headless (by Textual's `run_test`) with a game of
+`MAX_PLAYER_CAPACITY` players, played by bots locally (no server). Game
+states are then assigned to the in-game screen one by one, and the time
+until the `Players` grid and the `Sidebar` are updated and the app is
+idle again is recorded, for:
+
+- `plays`: states after successive bot plays (a few fields change);
+- `churn`: a player leaves and another joins in each state;
+- `reorder`: the players are shuffled in each state.
+
+Times per update (ms) are printed as JSON lines, along with the widget
+refreshes requested per update (and those requiring a layout, which
+reflows the whole screen).
+
+Usage: python benchmarks/client_render.py [--updates N] [--seed SEED]
+"""
+
+import asyncio
+import json
+import random
+from argparse import ArgumentParser
+from collections import Counter
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import Any
+
+from textual.widget import Widget
+
+from tuno.client.components.InGameScreen import InGameScreen
+from tuno.client.UnoApp import UnoApp
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.shared.constraints import MAX_PLAYER_CAPACITY
+from tuno.shared.sse_events import GameStateEvent
+
+type GameState = GameStateEvent.DataType
+
+ROOM_ID = "render"
+
+refresh_counts: Counter[str] = Counter()
+
+
+def count_refreshes() -> None:
+    """Count calls to `Widget.refresh()` (by wrapping it)."""
+
+    refresh = Widget.refresh
+
+    def counted_refresh(self: Widget, *args: Any, **kwargs: Any) -> Widget:
+        refresh_counts["refreshes"] += 1
+        if kwargs.get("layout"):
+            refresh_counts["layouts"] += 1
+        return refresh(self, *args, **kwargs)
+
+    Widget.refresh = counted_refresh  # type: ignore[method-assign]
+
+
+def collect_play_states(update_count: int) -> list[GameState]:
+
+    registry = GameRegistry()  # its scheduler is not started
+    game = registry.get_game(ROOM_ID)
+    game.update_rules(
+        # enough cards to deal at full capacity
+        {"player_capacity": MAX_PLAYER_CAPACITY, "initial_hand_size": 4},
+        operator_name=None,
+        operator_is_player=False,
+    )
+    for i in range(MAX_PLAYER_CAPACITY):
+        game.get_player(f"player{i}", allow_creation=True)
+
+    states: list[GameState] = []
+    while len(states) < update_count:
+        if game.started:
+            game.play_as_bot()
+        else:
+            game.start("benchmark")
+        states.append(game.get_game_state_event().data)
+    return states
+
+
+def create_churn_states(base: GameState, update_count: int) -> list[GameState]:
+    states: list[GameState] = []
+    players = list(base["players"])
+    for i in range(update_count):
+        players = players[1:] + [
+            GameStateEvent.PlayerDataType(
+                name=f"joined{i}",
+                connected=True,
+                card_count=7,
+            )
+        ]
+        states.append({**base, "players": players})
+    return states
+
+
+def create_reorder_states(
+    base: GameState,
+    update_count: int,
+    rng: random.Random,
+) -> list[GameState]:
+    states: list[GameState] = []
+    for _ in range(update_count):
+        players = list(base["players"])
+        rng.shuffle(players)
+        states.append({**base, "players": players})
+    return states
+
+
+async def run(scenarios: dict[str, list[GameState]], first: GameState) -> None:
+
+    app = UnoApp()
+    async with app.run_test() as pilot:
+
+        client = app.client
+        assert client is not None
+        client.server_address = "localhost:5000"
+        client.player_name = first["players"][0]["name"]
+        client.update_game_state(first)
+        while not isinstance(app.screen, InGameScreen):
+            await pilot.pause(0.05)
+        screen = app.screen
+
+        for scenario, states in scenarios.items():
+
+            # warm up (and mount the players of the scenario)
+            screen.game_state = states[0]
+            await pilot.pause()
+
+            durations: list[float] = []
+            refresh_counts.clear()
+            for game_state in states[1:]:
+                timestamp_begin = perf_counter()
+                screen.game_state = game_state
+                await pilot.pause()
+                durations.append(perf_counter() - timestamp_begin)
+
+            percentiles = quantiles(durations, n=100)
+            print(
+                json.dumps(
+                    {
+                        "scenario": scenario,
+                        "players": len(states[-1]["players"]),
+                        "updates": len(durations),
+                        "mean_ms": round(mean(durations) * 1000, 3),
+                        "p50_ms": round(percentiles[49] * 1000, 3),
+                        "p90_ms": round(percentiles[89] * 1000, 3),
+                        **{
+                            f"{key}_per_update": round(count / len(durations), 1)
+                            for key, count in sorted(refresh_counts.items())
+                        },
+                    }
+                ),
+                flush=True,
+            )
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=300, help="per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+    count_refreshes()
+    rng = random.Random(args.seed)
+
+    play_states = collect_play_states(args.updates)
+    base = play_states[-1]
+    scenarios = {
+        "plays": play_states,
+        "churn": create_churn_states(base, args.updates),
+        "reorder": create_reorder_states(base, args.updates, rng),
+    }
+    asyncio.run(run(scenarios, play_states[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Stress test of concurrent requests against one room.
+
+Writer threads play turns (as bots do) while reader threads look up the
+room, a player and the latest game state (as request handlers and new
+subscriptions do), and a consumer thread drains the message queues of
+the players (as their subscriptions do). Readers pause between reads
+(as if doing network I/O), so that read throughput should scale with
+the number of readers unless reads are blocked by plays. For each
+concurrency level, throughputs and read latencies are printed as a JSON
+line.
+
+Usage: python benchmarks/concurrency.py [--duration SECONDS]
+       [--levels 1,2,4,8] [--players COUNT] [--read-interval SECONDS]
+"""
+
+import json
+from argparse import ArgumentParser
+from statistics import quantiles
+from threading import Event, Thread
+from time import perf_counter, sleep
+
+from tuno.server.exceptions import ApiException
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.utils.Logger import Logger, LogLevel
+
+ROOM_ID = "stress"
+
+
+def run_level(
+    concurrency: int,
+    *,
+    player_count: int,
+    duration_seconds: float,
+    read_interval_seconds: float,
+) -> dict[str, object]:
+
+    registry = GameRegistry()  # its scheduler is not started
+    game = registry.get_game(ROOM_ID)
+    game.update_rules(
+        {"player_capacity": player_count},
+        operator_name=None,
+        operator_is_player=False,
+    )
+
+    stopped = Event()
+    consumer_stopped = Event()  # drains until the writers stop
+    play_counts = [0] * concurrency
+    read_latencies: list[list[float]] = [[] for _ in range(concurrency)]
+
+    def write(index: int) -> None:
+        while not stopped.is_set():
+            game = registry.get_game(ROOM_ID)
+            try:
+                if game.started:
+                    game.play_as_bot()
+                else:
+                    game.start("stress")
+            except ApiException:
+                continue  # raced with other writers
+            play_counts[index] += 1
+
+    def read(index: int) -> None:
+        latencies = read_latencies[index]
+        i = 0
+        while not stopped.is_set():
+            timestamp_begin = perf_counter()
+            game = registry.get_game(ROOM_ID)
+            game.get_player(f"player{i % player_count}")
+            game.get_latest_game_state_event()
+            latencies.append(perf_counter() - timestamp_begin)
+            i += 1
+            sleep(read_interval_seconds)
+
+    def consume() -> None:
+        while not consumer_stopped.is_set():
+            for player in game.get_players():
+                player.message_queue.drain(0, is_active=lambda: True)
+            sleep(0.001)
+
+    consumer = Thread(target=consume)
+    consumer.start()
+    for i in range(player_count):
+        game.get_player(f"player{i}", allow_creation=True)
+    game.start("stress")
+
+    threads = [Thread(target=write, args=(i,)) for i in range(concurrency)]
+    threads.extend(Thread(target=read, args=(i,)) for i in range(concurrency))
+    for thread in threads:
+        thread.start()
+    sleep(duration_seconds)
+    stopped.set()
+    for thread in threads:
+        thread.join()
+    consumer_stopped.set()
+    consumer.join()
+
+    latencies = sorted(latency for part in read_latencies for latency in part)
+    percentiles = quantiles(latencies, n=100, method="inclusive")
+    return {
+        "concurrency": concurrency,
+        "plays_per_second": round(sum(play_counts) / duration_seconds),
+        "reads_per_second": round(len(latencies) / duration_seconds),
+        "read_latency_us": {
+            "p50": round(percentiles[49] * 1e6, 1),
+            "p99": round(percentiles[98] * 1e6, 1),
+            "max": round(latencies[-1] * 1e6, 1),
+        },
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=3, help="seconds per level")
+    parser.add_argument("--levels", default="1,2,4,8", help="numbers of threads")
+    parser.add_argument("--players", type=int, default=20, help="players in the room")
+    parser.add_argument(
+        "--read-interval",
+        type=float,
+        default=0.001,
+        help="seconds each reader pauses between reads",
+    )
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    for level in args.levels.split(","):
+        result = run_level(
+            int(level),
+            player_count=args.players,
+            duration_seconds=args.duration,
+            read_interval_seconds=args.read_interval,
+        )
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
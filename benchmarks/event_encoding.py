@@ -0,0 +1,121 @@
+"""Payload size and encode/decode time of event encodings.
+
+For each table size, a game is played by bots while the events sent to
+one player are collected. The events are then encoded as SSE frames in
+each encoding (uncached) and decoded back from the `data:` field, as
+subscriptions and the client do. Bytes and times per event, along with
+bytes per event type and the bytes of a compressed stream (see
+`StreamCompressor`), are printed as JSON lines.
+
+Usage: python benchmarks/event_encoding.py [--players 2,6,20]
+       [--events COUNT]
+"""
+
+import json
+from argparse import ArgumentParser
+from time import perf_counter
+
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.server.utils.StreamCompressor import StreamCompressor
+from tuno.shared.event_encoding import (
+    EVENT_ENCODINGS,
+    EventEncoding,
+    decode_event_data,
+)
+from tuno.shared.sse_events import ServerSentEvent
+
+ROOM_ID = "encoding"
+
+
+def collect_events(player_count: int, event_count: int) -> list[ServerSentEvent]:
+    """Play until `event_count` events are sent to the first player."""
+
+    registry = GameRegistry()  # its scheduler is not started
+    game = registry.get_game(ROOM_ID)
+    game.update_rules(
+        {"player_capacity": player_count},
+        operator_name=None,
+        operator_is_player=False,
+    )
+    players = [
+        game.get_player(f"player{i}", allow_creation=True) for i in range(player_count)
+    ]
+    observer = players[0]
+
+    events: list[ServerSentEvent] = []
+    while len(events) < event_count:
+        if game.started:
+            game.play_as_bot()
+        else:
+            game.start("benchmark")
+        events.extend(observer.message_queue.drain(0, is_active=lambda: True))
+
+    return events
+
+
+def get_data_text(frame: str) -> str | None:
+    for line in frame.splitlines():
+        if line.startswith("data: "):
+            return line[len("data: ") :]
+    return None
+
+
+def run_encoding(
+    encoding: EventEncoding,
+    events: list[ServerSentEvent],
+) -> dict[str, object]:
+
+    timestamp_begin = perf_counter()
+    frames = [event.to_sse(encoding) for event in events]
+    encode_seconds = perf_counter() - timestamp_begin
+
+    data_texts = [get_data_text(frame) for frame in frames]
+    timestamp_begin = perf_counter()
+    for event, data_text in zip(events, data_texts):
+        if data_text is not None:
+            decode_event_data(event.type, data_text, encoding)
+    decode_seconds = perf_counter() - timestamp_begin
+
+    encoded_frames = [frame.encode() for frame in frames]
+    bytes_by_type: dict[str, list[int]] = {}
+    for event, encoded_frame in zip(events, encoded_frames):
+        bytes_by_type.setdefault(event.type, []).append(len(encoded_frame))
+
+    compressor = StreamCompressor("gzip")
+    compressed_byte_count = sum(
+        len(compressor.compress(encoded_frame)) for encoded_frame in encoded_frames
+    )
+
+    event_count = len(events)
+    return {
+        "encoding": encoding,
+        "bytes_per_event": round(sum(map(len, encoded_frames)) / event_count, 1),
+        "compressed_bytes_per_event": round(compressed_byte_count / event_count, 1),
+        "encode_us_per_event": round(encode_seconds / event_count * 1e6, 2),
+        "decode_us_per_event": round(decode_seconds / event_count * 1e6, 2),
+        "bytes_per_event_by_type": {
+            event_type: round(sum(sizes) / len(sizes), 1)
+            for event_type, sizes in sorted(bytes_by_type.items())
+        },
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--players", default="2,6,20", help="table sizes")
+    parser.add_argument("--events", type=int, default=5000, help="events per table")
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    for player_count in map(int, args.players.split(",")):
+        events = collect_events(player_count, args.events)
+        for encoding in EVENT_ENCODINGS:
+            result = run_encoding(encoding, events)
+            print(json.dumps({"players": player_count, **result}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
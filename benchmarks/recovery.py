@@ -0,0 +1,114 @@
+"""Recovery time of games persisted in a journal, by journal size.
+
+For each size, bot-only games are played in several rooms with a journal
+enabled, then the games are recovered into a new registry, (a) by
+replaying the whole journal and (b) from a snapshot plus the entries
+appended after it. Recovered games are checked against the originals,
+and the sizes and recovery times are printed as JSON lines.
+
+Usage: python benchmarks/recovery.py [--sizes 1000,10000,100000]
+       [--rooms COUNT]
+"""
+
+import json
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.utils.Logger import Logger, LogLevel
+
+
+def create_journal(directory: Path, entry_count: int, room_count: int) -> GameRegistry:
+    """Play games until about `entry_count` entries are journaled."""
+
+    registry = GameRegistry()  # its scheduler is not started
+    registry.enable_journal(directory)
+    journal = registry.journal
+    assert journal is not None
+
+    games = [registry.get_game(f"room{i}") for i in range(room_count)]
+    for game in games:
+        game.update_rules(
+            {"bot_count": 4, "shuffle_players": True},
+            operator_name=None,
+            operator_is_player=False,
+        )
+
+    while journal.last_seq < entry_count:
+        for game in games:
+            if game.started:
+                game.play_as_bot()
+            else:
+                game.start("recovery")
+
+    return registry
+
+
+def measure_recovery(directory: Path) -> tuple[float, GameRegistry]:
+    registry = GameRegistry()
+    timestamp_begin = perf_counter()
+    registry.enable_journal(directory)
+    recovery_seconds = perf_counter() - timestamp_begin
+    assert registry.journal is not None
+    registry.journal.close()
+    return recovery_seconds, registry
+
+
+def check_games(original: GameRegistry, recovered: GameRegistry) -> bool:
+    return {game.tag: game.get_snapshot() for game in original.get_games()} == {
+        game.tag: game.get_snapshot() for game in recovered.get_games()
+    }
+
+
+def get_journal_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.glob("journal-*.jsonl"))
+
+
+def run_size(entry_count: int, room_count: int) -> dict[str, object]:
+
+    with TemporaryDirectory() as temp_dir:
+
+        directory = Path(temp_dir)
+        original = create_journal(directory, entry_count, room_count)
+        assert original.journal is not None
+        original.journal.close()  # without another snapshot
+        journal_bytes = get_journal_bytes(directory)
+
+        # (a) the snapshot taken on creation is empty
+        replay_seconds, recovered = measure_recovery(directory)
+        replay_consistent = check_games(original, recovered)
+
+        # (b) recovery (a) has taken a snapshot
+        snapshot_seconds, recovered = measure_recovery(directory)
+        snapshot_consistent = check_games(original, recovered)
+        snapshot_bytes = (directory / "snapshot.json").stat().st_size
+
+    return {
+        "entries": original.journal.last_seq,
+        "journal_bytes": journal_bytes,
+        "replay_seconds": round(replay_seconds, 3),
+        "replay_entries_per_second": round(original.journal.last_seq / replay_seconds),
+        "snapshot_bytes": snapshot_bytes,
+        "snapshot_seconds": round(snapshot_seconds, 3),
+        "consistent": replay_consistent and snapshot_consistent,
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="entry counts")
+    parser.add_argument("--rooms", type=int, default=20, help="rooms played in")
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    for size in args.sizes.split(","):
+        result = run_size(int(size), args.rooms)
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
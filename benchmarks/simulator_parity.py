@@ -0,0 +1,157 @@
+"""Parity of simulated games with headless `Game`s.
+
+For each combination of player counts, initial hand sizes and the
+`any_last_play` rule, games are played with fixed seeds both by
+`simulate_game()` and by bots in headless `Game`s driven with
+`play_as_bot()`, and their results (turns, winner, reshuffles and how
+they stopped) are compared game by game. Throughputs of both are printed
+as JSON lines. Exits with status 1 if any game differs, so that rule
+changes to `Game` which the simulator doesn't follow are caught.
+
+Usage: python benchmarks/simulator_parity.py [--games COUNT]
+       [--players 2,4,10] [--hand-sizes 2,7,16]
+"""
+
+import json
+import random
+import sys
+from argparse import ArgumentParser
+from itertools import product
+from time import perf_counter
+
+from tuno.server.models.Game import Game
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.shared.constraints import MAX_BOT_COUNT
+from tuno.simulator.simulate_games import MAX_TURN_COUNT, GameResult, simulate_game
+
+
+def play_headless_game(
+    game: Game,
+    *,
+    player_count: int,
+    initial_hand_size: int,
+    any_last_play: bool,
+) -> GameResult:
+    """Play a game of bots like `tuno simulate` did before its lean engine,
+    drawing random numbers from the global generator."""
+
+    game.update_rules(
+        {
+            "bot_count": player_count,
+            "initial_hand_size": initial_hand_size,
+            "any_last_play": any_last_play,
+        },
+        operator_name=None,
+        operator_is_player=False,
+    )
+    turn_count_begin = game.turn_count
+    game.start("parity")
+
+    while game.started and (game.turn_count - turn_count_begin < MAX_TURN_COUNT):
+        game.play_as_bot()
+
+    turn_limit_reached = game.started
+    if turn_limit_reached:
+        game.stop(operator_name=None, operator_is_player=False)
+
+    return GameResult(
+        game.turn_count - turn_count_begin,
+        game.winner_index,
+        game.reshuffle_count,
+        turn_limit_reached,
+    )
+
+
+def run_config(
+    game_count: int,
+    *,
+    player_count: int,
+    initial_hand_size: int,
+    any_last_play: bool,
+) -> dict[str, object]:
+
+    seed = f"parity/{player_count}/{initial_hand_size}/{any_last_play}"
+
+    random.seed(seed)
+    game = Game("parity", scheduler=None)
+    timestamp_begin = perf_counter()
+    expected_results = [
+        play_headless_game(
+            game,
+            player_count=player_count,
+            initial_hand_size=initial_hand_size,
+            any_last_play=any_last_play,
+        )
+        for _ in range(game_count)
+    ]
+    game_seconds = perf_counter() - timestamp_begin
+
+    rng = random.Random(seed)
+    timestamp_begin = perf_counter()
+    results = [
+        simulate_game(
+            rng,
+            player_count=player_count,
+            initial_hand_size=initial_hand_size,
+            any_last_play=any_last_play,
+        )
+        for _ in range(game_count)
+    ]
+    simulator_seconds = perf_counter() - timestamp_begin
+
+    mismatches = [
+        index
+        for index, (result, expected_result) in enumerate(
+            zip(results, expected_results)
+        )
+        if result != expected_result
+    ]
+
+    return {
+        "players": player_count,
+        "initial_hand_size": initial_hand_size,
+        "any_last_play": any_last_play,
+        "games": game_count,
+        "reshuffles": sum(result.reshuffle_count for result in expected_results),
+        "game_games_per_second": round(game_count / game_seconds, 1),
+        "simulator_games_per_second": round(game_count / simulator_seconds, 1),
+        "mismatched_games": mismatches[:10],
+        "consistent": not mismatches,
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=50, help="games per config")
+    parser.add_argument("--players", default="2,4,10", help="player counts")
+    parser.add_argument("--hand-sizes", default="2,7,16", help="initial hand sizes")
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    player_counts = [int(count) for count in args.players.split(",")]
+    # (headless games are played by bots only)
+    assert all(count <= MAX_BOT_COUNT for count in player_counts)
+    hand_sizes = [int(size) for size in args.hand_sizes.split(",")]
+
+    consistent = True
+    for player_count, initial_hand_size, any_last_play in product(
+        player_counts, hand_sizes, (True, False)
+    ):
+        result = run_config(
+            args.games,
+            player_count=player_count,
+            initial_hand_size=initial_hand_size,
+            any_last_play=any_last_play,
+        )
+        consistent = consistent and bool(result["consistent"])
+        print(json.dumps(result), flush=True)
+
+    if not consistent:
+        print("Simulated games differ from headless games.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Bytes and CPU time per SSE event with and without stream compression.
+
+For each table size, a game is played by bots while the events sent to
+one player are collected in chunks (as a subscription writes them after
+each play). The chunks are then encoded (a) uncompressed, (b) with one
+deflate context per stream and a sync flush after each chunk, as the
+server does, and (c) with a new context per chunk, for comparison. The
+bytes and compression/decompression times per event are printed as JSON
+lines.
+
+Usage: python benchmarks/sse_compression.py [--players 2,6,20]
+       [--events COUNT]
+"""
+
+import json
+import zlib
+from argparse import ArgumentParser
+from collections.abc import Callable
+from time import perf_counter
+
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.server.utils.StreamCompressor import StreamCompressor
+
+ROOM_ID = "compression"
+
+
+def collect_chunks(player_count: int, event_count: int) -> tuple[list[bytes], int]:
+    """Play until `event_count` events are sent to the first player."""
+
+    registry = GameRegistry()  # its scheduler is not started
+    game = registry.get_game(ROOM_ID)
+    game.update_rules(
+        {"player_capacity": player_count},
+        operator_name=None,
+        operator_is_player=False,
+    )
+    players = [
+        game.get_player(f"player{i}", allow_creation=True) for i in range(player_count)
+    ]
+    observer = players[0]
+    observer.message_queue.drain(0, is_active=lambda: True)
+
+    chunks: list[bytes] = []
+    collected_count = 0
+    while collected_count < event_count:
+        if game.started:
+            game.play_as_bot()
+        else:
+            game.start("benchmark")
+        events = observer.message_queue.drain(0, is_active=lambda: True)
+        if events:
+            chunks.append(b"".join(event.encode() for event in events))
+            collected_count += len(events)
+
+    return chunks, collected_count
+
+
+def measure(
+    chunks: list[bytes],
+    compress: Callable[[bytes], bytes],
+    decompress: Callable[[bytes], bytes],
+) -> tuple[int, float, float]:
+
+    timestamp_begin = perf_counter()
+    compressed_chunks = [compress(chunk) for chunk in chunks]
+    compress_seconds = perf_counter() - timestamp_begin
+
+    timestamp_begin = perf_counter()
+    decompressed_chunks = [decompress(chunk) for chunk in compressed_chunks]
+    decompress_seconds = perf_counter() - timestamp_begin
+
+    assert decompressed_chunks == chunks
+    return (
+        sum(len(chunk) for chunk in compressed_chunks),
+        compress_seconds,
+        decompress_seconds,
+    )
+
+
+def run_mode(
+    mode: str,
+    chunks: list[bytes],
+    event_count: int,
+) -> dict[str, object]:
+
+    if mode == "identity":
+        compress = decompress = lambda chunk: chunk
+    elif mode == "stream":
+        compress = StreamCompressor("gzip").compress
+        decompress = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    elif mode == "per_chunk":
+        compress = lambda chunk: zlib.compress(chunk, wbits=16 + zlib.MAX_WBITS)
+        decompress = lambda chunk: zlib.decompress(chunk, wbits=16 + zlib.MAX_WBITS)
+    else:
+        raise ValueError(mode)
+
+    byte_count, compress_seconds, decompress_seconds = measure(
+        chunks, compress, decompress
+    )
+    raw_byte_count = sum(len(chunk) for chunk in chunks)
+    return {
+        "mode": mode,
+        "bytes_per_event": round(byte_count / event_count, 1),
+        "ratio": round(byte_count / raw_byte_count, 3),
+        "compress_us_per_event": round(compress_seconds / event_count * 1e6, 2),
+        "decompress_us_per_event": round(decompress_seconds / event_count * 1e6, 2),
+    }
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--players", default="2,6,20", help="table sizes")
+    parser.add_argument("--events", type=int, default=5000, help="events per table")
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    for player_count in map(int, args.players.split(",")):
+        chunks, event_count = collect_chunks(player_count, args.events)
+        for mode in ("identity", "stream", "per_chunk"):
+            result = run_mode(mode, chunks, event_count)
+            print(json.dumps({"players": player_count, **result}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
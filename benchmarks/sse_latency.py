@@ -0,0 +1,180 @@
+"""Measure play-to-event latency of the SSE subscription.
+
+A server is started in a subprocess with two human players subscribed.
+The current player keeps passing, and the time between sending the play
+request and receiving the resulting `game_state` event on the other
+player's stream is recorded.
+
+Usage: python benchmarks/sse_latency.py [--samples N] [--interval SECONDS] [--async]
+"""
+
+import json
+import random
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from queue import Queue
+from statistics import quantiles
+from threading import Thread
+from typing import Any
+
+import requests
+from requests_sse import EventSource
+
+from tuno.shared.game_state_patch import apply_game_state_patch
+
+type StampedEvent = tuple[float, str, object]
+
+
+def subscribe(url: str, output: "Queue[StampedEvent]") -> None:
+    """Forward events to `output`, with game state patches resolved into
+    full `game_state` events."""
+    game_state: Any = None
+    with EventSource(url, timeout=30) as event_source:
+        for event in event_source:
+            timestamp = time.perf_counter()
+            event_type = event.type or ""
+            data = json.loads(event.data) if event.data else None
+            if event_type == "game_state_patch":
+                game_state = apply_game_state_patch(game_state, data)
+                event_type, data = "game_state", game_state
+            elif event_type == "game_state":
+                game_state = data
+            output.put((timestamp, event_type, data))
+
+
+def wait_for_server(base_url: str) -> None:
+    for _ in range(100):
+        try:
+            requests.get(base_url, timeout=0.5)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start.")
+
+
+def wait_for_play_result(
+    events: "Queue[StampedEvent]",
+    *,
+    player_index: int,
+    card_count: int,
+) -> tuple[float, dict[str, Any]]:
+    """Wait until a `game_state` event shows the pass of the player before
+    `player_index` (whose card count grows) or the end of game."""
+    while True:
+        timestamp, event_type, data = events.get(timeout=10)
+        if event_type == "game_state":
+            assert isinstance(data, dict)
+            if not data["started"]:
+                return timestamp, data
+            passed_player = data["players"][1 - player_index]
+            if (data["current_player_index"] == player_index) and (
+                passed_player["card_count"] > card_count
+            ):
+                return timestamp, data
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.3,
+        help="average seconds to wait between plays",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="test the async backend",
+    )
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    api_url = f"{base_url}/api"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tuno", "server", "-l", "ERROR"]
+        + ["--host", "127.0.0.1", "-p", str(args.port)]
+        + (["--async"] if args.use_async else []),
+    )
+
+    try:
+
+        wait_for_server(base_url)
+
+        player_names = ("alice", "bob")
+        streams: dict[str, Queue[StampedEvent]] = {}
+        for name in player_names:
+            streams[name] = Queue()
+            Thread(
+                target=subscribe,
+                args=(f"{api_url}/player/{name}", streams[name]),
+                daemon=True,
+            ).start()
+        time.sleep(1)
+
+        requests.put(f"{api_url}/game/rules", json={"shuffle_players": False})
+
+        latencies: list[float] = []
+        while len(latencies) < args.samples:
+
+            response = requests.put(f"{api_url}/game/start")
+            if response.status_code != 200:
+                time.sleep(0.5)
+                continue
+
+            # skip events sent before the game is fully started
+            first_stream = streams[player_names[0]]
+            while True:
+                _, event_type, data = first_stream.get(timeout=10)
+                if event_type == "game_state":
+                    assert isinstance(data, dict)
+                    if data["started"]:
+                        break
+            turn_order = [player["name"] for player in data["players"]]
+            time.sleep(0.5)
+            for stream in streams.values():
+                while not stream.empty():
+                    stream.get_nowait()
+
+            current = 0
+            card_counts = [player["card_count"] for player in data["players"]]
+            while len(latencies) < args.samples:
+
+                player_name = turn_order[current]
+                observer = streams[turn_order[1 - current]]
+
+                timestamp_begin = time.perf_counter()
+                requests.post(f"{api_url}/player/{player_name}/play", json=[])
+                timestamp_end, data = wait_for_play_result(
+                    observer,
+                    player_index=1 - current,
+                    card_count=card_counts[current],
+                )
+                if not data["started"]:
+                    break  # out of cards
+                card_counts[current] = data["players"][current]["card_count"]
+
+                latencies.append(timestamp_end - timestamp_begin)
+                current = 1 - current
+                time.sleep(random.uniform(0.5, 1.5) * args.interval)
+
+        percentiles = quantiles(latencies, n=100)
+        print(
+            f"samples={len(latencies)} "
+            f"p50={percentiles[49] * 1000:.2f}ms "
+            f"p99={percentiles[98] * 1000:.2f}ms "
+            f"max={max(latencies) * 1000:.2f}ms"
+        )
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Load test of concurrent SSE subscribers.
+
+A server is started in a subprocess, then many subscribers connect to it,
+spread across rooms. Once all of them have received their initial states,
+the rules of every room are updated and the time until every subscriber
+receives the resulting notification is recorded. The memory and
+thread count of the server process are reported as well. (Linux only.)
+
+Usage: python benchmarks/sse_load.py [--subscribers N] [--rooms N] [--sync]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from statistics import quantiles
+
+import requests
+
+NOTIFICATION_EVENT_LINE = b"event: notification\n"
+MAX_PENDING_CONNECTIONS = 100
+
+
+async def read_chunked_body(reader: asyncio.StreamReader) -> bytes:
+    size_line = await reader.readline()
+    size = int(size_line.strip() or b"0", 16)
+    if size == 0:
+        raise ConnectionError("Stream ended.")
+    data = await reader.readexactly(size + 2)  # chunk + CRLF
+    return data[:-2]
+
+
+class Subscriber:
+
+    url_path: str
+    connected: asyncio.Event
+    connected_callback: Callable[[], object] | None
+    notification_timestamps: list[float]
+
+    def __init__(self, room_id: str, player_name: str) -> None:
+        self.url_path = f"/api/rooms/{room_id}/player/{player_name}"
+        self.connected = asyncio.Event()
+        self.connected_callback = None
+        self.notification_timestamps = []
+
+    async def run(self, host: str, port: int) -> None:
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(
+            f"GET {self.url_path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Accept: text/event-stream\r\n\r\n".encode()
+        )
+
+        headers = await reader.readuntil(b"\r\n\r\n")
+        if not headers.startswith(b"HTTP/1.1 200"):
+            raise ConnectionError(headers.decode())
+        chunked = b"transfer-encoding: chunked" in headers.lower()
+
+        buffer = b""
+        while True:
+            data = await (read_chunked_body(reader) if chunked else reader.read(65536))
+            if not data:
+                raise ConnectionError("Stream ended.")
+            buffer += data
+            *messages, buffer = buffer.split(b"\n\n")
+            for message in messages:
+                if message.startswith(b"event: game_state\n"):
+                    if self.connected_callback and not self.connected.is_set():
+                        self.connected_callback()
+                    self.connected.set()
+                elif message.startswith(NOTIFICATION_EVENT_LINE):
+                    self.notification_timestamps.append(time.perf_counter())
+
+
+def get_process_cpu_seconds(pid: int) -> float:
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    user_ticks, system_ticks = int(fields[11]), int(fields[12])
+    return (user_ticks + system_ticks) / os.sysconf("SC_CLK_TCK")
+
+
+def get_process_status(pid: int, key: str) -> str:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith(key + ":"):
+            return line.split(":", 1)[1].strip()
+    return "?"
+
+
+async def run_load_test(
+    *,
+    host: str,
+    port: int,
+    subscriber_count: int,
+    room_count: int,
+    server_pid: int,
+) -> None:
+
+    base_url = f"http://{host}:{port}"
+    subscribers = [
+        Subscriber(f"room{i % room_count}", f"player{i}")
+        for i in range(subscriber_count)
+    ]
+
+    timestamp_begin = time.perf_counter()
+    tasks = []
+    pending_connections = asyncio.Semaphore(MAX_PENDING_CONNECTIONS)
+    for subscriber in subscribers:
+        await pending_connections.acquire()  # don't overflow the listen backlog
+        subscriber.connected_callback = pending_connections.release
+        tasks.append(asyncio.create_task(subscriber.run(host, port)))
+    deadline = time.perf_counter() + 300
+    while not all(subscriber.connected.is_set() for subscriber in subscribers):
+        for task in tasks:
+            if task.done():
+                task.result()  # raise the error if any
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Subscribers failed to connect in time.")
+        await asyncio.sleep(0.1)
+    connect_duration = time.perf_counter() - timestamp_begin
+    print(f"connected: {subscriber_count} subscribers in {connect_duration:.1f}s")
+
+    await asyncio.sleep(3)  # let a few heartbeats pass
+    print(
+        "server: "
+        f"rss={get_process_status(server_pid, 'VmRSS')} "
+        f"threads={get_process_status(server_pid, 'Threads')}"
+    )
+
+    # fan out a state change to every subscriber
+    for subscriber in subscribers:
+        subscriber.notification_timestamps.clear()
+    server_cpu_begin = get_process_cpu_seconds(server_pid)
+    client_cpu_begin = time.process_time()
+    timestamp_update = time.perf_counter()
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                requests.put,
+                f"{base_url}/api/rooms/room{i}/game/rules",
+                json={"initial_hand_size": 8},
+            )
+            for i in range(room_count)
+        )
+    )
+    deadline = time.perf_counter() + 60
+    while (time.perf_counter() < deadline) and not all(
+        subscriber.notification_timestamps for subscriber in subscribers
+    ):
+        await asyncio.sleep(0.05)
+    server_cpu = get_process_cpu_seconds(server_pid) - server_cpu_begin
+    client_cpu = time.process_time() - client_cpu_begin
+
+    latencies = [
+        subscriber.notification_timestamps[0] - timestamp_update
+        for subscriber in subscribers
+        if subscriber.notification_timestamps
+    ]
+    percentiles = quantiles(latencies, n=100)
+    print(
+        f"fan-out: received={len(latencies)}/{subscriber_count} "
+        f"p50={percentiles[49] * 1000:.0f}ms "
+        f"p99={percentiles[98] * 1000:.0f}ms "
+        f"max={max(latencies) * 1000:.0f}ms "
+        f"(cpu: server={server_cpu:.2f}s client={client_cpu:.2f}s)"
+    )
+
+    for task in tasks:
+        task.cancel()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--port", type=int, default=5098)
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="test the default (threaded) backend instead of the async one",
+    )
+    args = parser.parse_args()
+
+    host = "127.0.0.1"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tuno", "server", "-l", "ERROR"]
+        + ["--host", host, "-p", str(args.port)]
+        + ([] if args.sync else ["--async"]),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+
+        for _ in range(100):
+            try:
+                requests.get(f"http://{host}:{args.port}", timeout=0.5)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("Server did not start.")
+
+        asyncio.run(
+            run_load_test(
+                host=host,
+                port=args.port,
+                subscriber_count=args.subscribers,
+                room_count=args.rooms,
+                server_pid=server.pid,
+            )
+        )
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
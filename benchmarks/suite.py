@@ -0,0 +1,326 @@
+"""Micro- and macro-benchmarks of the game engine and the transport.
+
+Each case is timed in process (no network), and the median time per
+operation of several repeats is reported. Results are written as JSON
+and compared against a stored baseline, so that regressions on hot paths
+are caught before deploying. Exits with status 1 if any case is slower
+than the baseline by more than the tolerance (or the wider tolerance of
+the case, for cases involving threads, which are noisier).
+
+Usage: python benchmarks/suite.py [-k PATTERN] [--output PATH]
+       [--baseline PATH] [--tolerance RATIO] [--update-baseline]
+"""
+
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from tuno.server.models.Game import Game
+from tuno.server.models.Player import Player
+from tuno.server.utils.create_deck import create_deck
+from tuno.server.utils.Logger import Logger, LogLevel
+from tuno.shared.card_codes import CARD_COUNT
+from tuno.shared.check_play import check_play
+from tuno.shared.rules import create_game_rules
+from tuno.shared.Scheduler import Scheduler
+from tuno.shared.sse_events import NotificationEvent
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+REPEAT_COUNT = 10
+
+type Operation = Callable[[], object]
+type CaseSetup = Callable[[], Operation]
+
+cases: dict[str, CaseSetup] = {}
+case_tolerances: dict[str, float] = {}
+
+
+def case(
+    name: str,
+    *,
+    tolerance: float | None = None,
+) -> Callable[[CaseSetup], CaseSetup]:
+    """Register a benchmark case, whose setup returns the operation to time.
+    (`tolerance` widens the allowed slowdown ratio of the case.)"""
+
+    def register(setup: CaseSetup) -> CaseSetup:
+        cases[name] = setup
+        if tolerance is not None:
+            case_tolerances[name] = tolerance
+        return setup
+
+    return register
+
+
+def create_game(
+    *,
+    human_count: int,
+    bot_count: int,
+    scheduler: Scheduler | None,
+) -> tuple[Game, list[Player]]:
+    """Create a game and return it with its human players."""
+    game = Game("bench", scheduler=scheduler)
+    game.update_rules(
+        {"player_capacity": max(human_count, 2), "bot_count": bot_count},
+        operator_name=None,
+        operator_is_player=False,
+    )
+    humans = [
+        game.get_player(f"player{i}", allow_creation=True) for i in range(human_count)
+    ]
+    return game, humans
+
+
+def drain_all(players: list[Player]) -> int:
+    """Drain the message queues of the players and return the number
+    of events drained."""
+    return sum(
+        len(player.message_queue.drain(0, is_active=lambda: True)) for player in players
+    )
+
+
+# -- game engine --
+
+
+@case("create_deck")
+def setup_create_deck() -> Operation:
+    return create_deck
+
+
+@case("game_start[players=4]")
+def setup_game_start() -> Operation:
+
+    game, _ = create_game(human_count=0, bot_count=4, scheduler=None)
+
+    def start() -> None:
+        game.start("bench")  # shuffle & dealing
+        game.stop(operator_name=None, operator_is_player=False)
+
+    return start
+
+
+@case("check_play")
+def setup_check_play() -> Operation:
+
+    rules = create_game_rules()
+
+    def check() -> None:
+        check_play(
+            (7,),
+            None,
+            lead_color="red",
+            lead_card=5,
+            skip_counter=0,
+            rules=rules,
+        )
+
+    return check
+
+
+@case("bot_play[hand=16]")
+def setup_bot_play() -> Operation:
+
+    rng = random.Random(0)
+    bot = Player("bot", is_bot=True)
+    bot.cards.extend(rng.sample(range(CARD_COUNT), 16))
+    rules = create_game_rules()
+
+    def bot_play() -> object:
+        return bot.bot_play(
+            lead_color="blue",
+            lead_card=5,
+            skip_counter=0,
+            rules=rules,
+        )
+
+    return bot_play
+
+
+@case("game_play[players=4]", tolerance=0.5)
+def setup_game_play() -> Operation:
+    """A turn played end to end, including state broadcasting."""
+
+    scheduler = Scheduler()  # not started, so bots are driven below
+    game, humans = create_game(human_count=1, bot_count=3, scheduler=scheduler)
+
+    def play() -> None:
+        if not game.started:
+            game.start("bench")
+        game.play_as_bot()
+        drain_all(humans)
+
+    return play
+
+
+for player_count in (2, 8, 20):
+
+    @case(f"game_state_to_sse[players={player_count}]")
+    def setup_game_state_to_sse(player_count: int = player_count) -> Operation:
+        game, _ = create_game(human_count=player_count, bot_count=0, scheduler=None)
+        event = game.get_game_state_event()
+        return event.to_sse
+
+
+for player_count in (2, 8, 20):
+
+    @case(f"broadcast[players={player_count}]", tolerance=0.5)
+    def setup_broadcast(player_count: int = player_count) -> Operation:
+        """An event broadcast through the game to its players, from
+        numbering and logging to the queues drained by subscribers."""
+
+        scheduler = Scheduler()  # not started, as there are no bots
+        game, humans = create_game(
+            human_count=player_count,
+            bot_count=0,
+            scheduler=scheduler,
+        )
+        drain_all(humans)  # states sent on joining
+
+        def broadcast() -> None:
+            event = NotificationEvent(
+                NotificationEvent.DataType(title="Bench", message="Hello!")
+            )
+            game.broadcast(event)
+            assert drain_all(humans) == player_count
+
+        return broadcast
+
+    @case(f"broadcast_game_state[players={player_count}]", tolerance=0.5)
+    def setup_broadcast_game_state(player_count: int = player_count) -> Operation:
+        """Game state patches broadcast in bursts, which are coalesced
+        in the queues before subscribers drain them."""
+
+        scheduler = Scheduler()  # not started, as there are no bots
+        game, humans = create_game(
+            human_count=player_count,
+            bot_count=0,
+            scheduler=scheduler,
+        )
+        drain_all(humans)  # states sent on joining
+
+        def broadcast_game_state() -> None:
+            for _ in range(5):
+                game.broadcast_game_state()
+            assert drain_all(humans) == player_count  # coalesced
+
+        return broadcast_game_state
+
+
+# -- transport --
+
+
+@case("sse_throughput[events=10]", tolerance=1.0)
+def setup_sse_throughput() -> Operation:
+    """Events delivered through the subscription route of the Flask app,
+    from broadcasting to the encoded chunk yielded by the response."""
+
+    from tuno.server import create_app
+    from tuno.server.models.GameRegistry import game_registry
+
+    app = create_app(log_level=LogLevel.ERROR)
+    client = app.test_client()
+    response = client.get("/api/rooms/bench/player/bench", buffered=False)
+    chunks: Iterator[bytes] = iter(response.response)
+    next(chunks)  # heartbeat
+    next(chunks)  # initial states
+
+    game = game_registry.get_game("bench")
+    events = [
+        NotificationEvent(NotificationEvent.DataType(title="Bench", message=str(i)))
+        for i in range(10)
+    ]
+
+    def deliver() -> None:
+        for event in events:
+            game.broadcast(event)
+        chunk = next(chunks)
+        assert chunk.count(b"event: notification") == len(events)
+
+    return deliver
+
+
+def run_case(setup: CaseSetup) -> float:
+    """Get the median time per operation in seconds."""
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(REPEAT_COUNT, number)) / number
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-k", "--filter", default="", help="run matching cases only")
+    parser.add_argument("--output", type=Path, help="write results to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown ratio against the baseline",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write results to the baseline file",
+    )
+    args = parser.parse_args()
+
+    Logger.level = LogLevel.ERROR
+
+    baseline: dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    results: dict[str, Any] = {}
+    regressions: list[str] = []
+
+    for name, setup in cases.items():
+
+        if args.filter not in name:
+            continue
+
+        seconds_per_op = run_case(setup)
+        result: dict[str, Any] = {"seconds_per_op": seconds_per_op}
+        line = f"{name:32s} {seconds_per_op * 1e6:12.2f}us"
+
+        baseline_result = baseline.get(name)
+        if baseline_result:
+            ratio = seconds_per_op / baseline_result["seconds_per_op"]
+            result["baseline_ratio"] = round(ratio, 3)
+            line += f"  x{ratio:.2f}"
+            tolerance = max(args.tolerance, case_tolerances.get(name, 0))
+            if ratio > 1 + tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+
+        results[name] = result
+        print(line, flush=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        for result in results.values():
+            result.pop("baseline_ratio", None)
+        args.baseline.write_text(
+            json.dumps({**report, "results": {**baseline, **results}}, indent=2) + "\n"
+        )
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
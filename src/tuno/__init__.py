@@ -3,7 +3,9 @@
 import click
 
 from tuno.client import start_client
+from tuno.loadtest import start_loadtest
 from tuno.server import start_server
+from tuno.simulator import start_simulator
 
 __version__ = "0.2.1"
 
@@ -25,3 +27,5 @@ def tuno() -> None:
 
 tuno.add_command(start_client)
 tuno.add_command(start_server)
+tuno.add_command(start_simulator)
+tuno.add_command(start_loadtest)
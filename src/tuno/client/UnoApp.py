@@ -17,6 +17,7 @@ from .components.ConnectScreen import ConnectScreen
 from .components.InGameScreen import InGameScreen
 from .components.PendingScreen import PendingScreen
 from .UnoClient import UnoClient
+from .utils.UpdateScheduler import UpdateScheduler
 
 
 class UnoApp(App[object]):
@@ -37,6 +38,7 @@ class UnoApp(App[object]):
         cards: Deck
 
     client: UnoClient | None
+    update_scheduler: UpdateScheduler
 
     notify_error = partialmethod(
         App.notify,
@@ -45,6 +47,7 @@ class UnoApp(App[object]):
     )
 
     def on_mount(self) -> None:
+        self.update_scheduler = UpdateScheduler(self)
         self.client = UnoClient(self)
         self.switch_mode("connect")
 
@@ -53,6 +56,7 @@ class UnoApp(App[object]):
         assert client is not None
         if client.close():
             self.log.debug("Subscription detached.")
+        client.action_queue.close()
 
     @on(GameStateUpdate)
     async def on_game_state_update(self, message: GameStateUpdate) -> None:
@@ -75,7 +79,7 @@ class UnoApp(App[object]):
 
     @on(CardsUpdate)
     def on_cards_update(self, message: CardsUpdate) -> None:
-        screen = self.screen
-        if isinstance(screen, InGameScreen):
-            screen.cards = message.cards
-            self.log.debug("Updated game state on InGameScreen.")
+        for screen in self.screen_stack:  # maybe under a CardsScreen
+            if isinstance(screen, InGameScreen):
+                screen.cards = message.cards
+                self.log.debug("Updated cards on InGameScreen.")
@@ -1,16 +1,26 @@
-import json
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from threading import RLock, Thread
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple, cast
 
-from requests import RequestException, get, post, put
+from requests import RequestException
 from requests_sse import EventSource
 from textual import log
 
-from tuno.client.config import SSE_MAX_RETRIES, SSE_TIMEOUT
+from tuno.client.config import SSE_EVENT_ENCODING, SSE_MAX_RETRIES, SSE_TIMEOUT
 from tuno.client.event_handlers import EventHandlerMap, load_event_handler_map
+from tuno.client.utils.ActionQueue import ActionCallback, ActionQueue, ApiAction
 from tuno.client.utils.ApiContext import ApiContext
-from tuno.shared.deck import Deck
+from tuno.server.exceptions import (
+    ApiException,
+    CardIdsNotFoundException,
+    GameNotStartedException,
+    InvalidLeadCardInfoException,
+    NotCurrentPlayerException,
+)
+from tuno.shared.card_codes import encode_card
+from tuno.shared.check_play import InvalidPlayException, check_play
+from tuno.shared.deck import BasicCardColor, Deck
+from tuno.shared.event_encoding import decode_event_data
 from tuno.shared.sse_events import GameStateEvent
 from tuno.shared.ThreadLockContext import ThreadLockContext
 
@@ -18,16 +28,27 @@ if TYPE_CHECKING:
     from tuno.client.UnoApp import UnoApp
 
 
+class PendingPlay(NamedTuple):
+    """Cards played but not reflected by the cards sent by the server yet."""
+
+    card_ids: frozenset[str]
+    confirmed: bool  # by the response to the play
+
+
 class UnoClient:
 
     app: "UnoApp"
     server_address: str
     player_name: str
     game_state: GameStateEvent.DataType | None
-    cards: Deck
+    cards: Deck  # without the cards of the pending play
+    confirmed_cards: Deck  # as last sent by the server
+    pending_play: PendingPlay | None
+    play_lock: RLock
     subscription: EventSource | None
     subscription_lock: RLock
     subscription_thread: Thread | None
+    action_queue: ActionQueue
     event_handler_map: EventHandlerMap
 
     def __init__(self, app: "UnoApp") -> None:
@@ -37,9 +58,15 @@ class UnoClient:
         self.player_name = ""
         self.game_state = None
         self.cards = []
+        self.confirmed_cards = []
+        self.pending_play = None
+        self.play_lock = RLock()
         self.subscription = None
         self.subscription_lock = RLock()
         self.subscription_thread = None
+        self.action_queue = ActionQueue(
+            error_context=lambda error_title: ApiContext(error_title, app=app),
+        )
         self.event_handler_map = load_event_handler_map()
 
     def get_connection_display(self) -> str:
@@ -58,11 +85,17 @@ class UnoClient:
     def reset(self, message: str | None) -> None:
 
         self.close()
+        discarded_action_count = self.action_queue.clear()
+        if discarded_action_count:
+            self.app.log.info(f"Discarded {discarded_action_count} pending actions.")
 
         self.server_address = ""
         self.player_name = ""
         self.game_state = None
-        self.cards = []
+        with ThreadLockContext(self.play_lock):
+            self.cards = []
+            self.confirmed_cards = []
+            self.pending_play = None
 
         log_message = "Client reset."
         if message:
@@ -71,7 +104,11 @@ class UnoClient:
 
     def get_api_url(self, api_path: str) -> str:
         assert self.server_address
-        return f"http://{self.server_address}/api{api_path}"
+        host, _, room_id = self.server_address.partition("/")
+        if room_id:
+            return f"http://{host}/api/rooms/{room_id}{api_path}"
+        else:
+            return f"http://{host}/api{api_path}"
 
     def subscribe(
         self,
@@ -85,7 +122,7 @@ class UnoClient:
         self.server_address = server_address
         self.player_name = player_name
 
-        url = self.get_api_url(f"/player/{player_name}")
+        url = self.get_api_url(f"/player/{player_name}?encoding={SSE_EVENT_ENCODING}")
         log.info(f'Connecting to "{url}"...')
 
         event_source = EventSource(
@@ -124,9 +161,13 @@ class UnoClient:
                     parsed_data: object = None
                     if event.data:
                         try:
-                            parsed_data = json.loads(event.data)
-                        except json.JSONDecodeError as error:
-                            error_message = f"Invalid JSON data: {event.data!r}"
+                            parsed_data = decode_event_data(
+                                event.type or "",
+                                event.data,
+                                SSE_EVENT_ENCODING,
+                            )
+                        except ValueError as error:
+                            error_message = f"Invalid event data: {event.data!r}"
                             log.error(error_message)
                             log.error(error)
                             self.app.notify_error(
@@ -175,64 +216,240 @@ class UnoClient:
         )
         self.subscription_thread.start()
 
-    def update_rules(self, modified_rules: Mapping[str, object]) -> None:
-        api_url = self.get_api_url("/game/rules")
-        assert self.player_name
-        with ApiContext("Rule Update Failed", app=self.app):
-            response = put(
-                api_url,
-                json=modified_rules,
-                params={
-                    "player_name": self.player_name,
-                },
+    def submit_action(
+        self,
+        method: str,
+        api_path: str,
+        *,
+        error_title: str,
+        params: Mapping[str, str | None] | None = None,
+        json: object = None,
+        on_done: ActionCallback | None = None,
+    ) -> None:
+        """Queue an API request to be sent after previous ones. `on_done`
+        is called with whether it succeeded on the sending thread (or the
+        calling one if the request is rejected), so UI updates in it should
+        go through `app.call_later`, which is thread-safe."""
+        self.action_queue.submit(
+            ApiAction(
+                method,
+                self.get_api_url(api_path),
+                error_title,
+                params=params,
+                json=json,
+                on_done=on_done,
             )
-            response.raise_for_status()
+        )
 
-    def start_game(self) -> None:
+    def update_rules(
+        self,
+        modified_rules: Mapping[str, object],
+        *,
+        on_done: ActionCallback | None = None,
+    ) -> None:
+        assert self.player_name
+        self.submit_action(
+            "PUT",
+            "/game/rules",
+            error_title="Rule Update Failed",
+            params={
+                "player_name": self.player_name,
+            },
+            json=modified_rules,
+            on_done=on_done,
+        )
+
+    def start_game(self, *, on_done: ActionCallback | None = None) -> None:
 
         player_name = self.player_name
         assert player_name
 
-        api_url = self.get_api_url(f"/game/start")
+        self.submit_action(
+            "PUT",
+            "/game/start",
+            error_title="Start Failed",
+            params={
+                "player_name": player_name,
+            },
+            on_done=on_done,
+        )
 
-        with ApiContext("Start Failed", app=self.app):
-            response = put(
-                api_url,
-                params={
-                    "player_name": player_name,
-                },
-            )
-            response.raise_for_status()
+    def reconcile_cards(self) -> Deck:
+        """Get the cards to show from the cards last sent by the server,
+        with the cards of the pending play hidden as long as they may have
+        been sent before the play was done. (Call with `play_lock` held.)
+
+        Cards sent before a confirmed play hold all of its cards and more.
+        Once other cards arrive, the play is settled: its cards are gone,
+        or its last card was drawn back (after a reshuffle, if a non-number
+        card can't be the last play), so they are shown as they are."""
+
+        cards = self.confirmed_cards
+        pending_play = self.pending_play
+        if pending_play is None:
+            return cards
+
+        if pending_play.confirmed and not (
+            pending_play.card_ids < {card["id"] for card in cards}
+        ):
+            self.pending_play = None
+            log.debug("Pending play settled.")
+            return cards
+
+        return [card for card in cards if card["id"] not in pending_play.card_ids]
+
+    def update_cards(self, cards: Deck) -> None:
+        """Update the cards as sent by the server, reconciling them with
+        the pending play (see `reconcile_cards()`)."""
+
+        with ThreadLockContext(self.play_lock):
+            self.confirmed_cards = cards
+            cards = self.cards = self.reconcile_cards()
+
+        self.app.update_scheduler.post(self.app.CardsUpdate(cards))
+
+    def update_game_state(self, game_state: GameStateEvent.DataType) -> None:
+        self.game_state = game_state
+        if not game_state["started"]:
+            self.roll_back_play()  # the game stopped before the play was confirmed
+        self.app.update_scheduler.post(self.app.GameStateUpdate(game_state))
+
+    def confirm_play(self, pending_play: PendingPlay) -> None:
+        """Confirm the pending play as done by the server, which allows the
+        next play without waiting for the cards sent after this one."""
+        with ThreadLockContext(self.play_lock):
+            if self.pending_play is not pending_play:
+                return  # dropped (e.g. as the game stopped)
+            self.pending_play = pending_play._replace(confirmed=True)
+            cards = self.cards = self.reconcile_cards()
+        log.debug("Pending play confirmed.")
+        self.app.update_scheduler.post(self.app.CardsUpdate(cards))
+
+    def roll_back_play(self) -> bool:
+        """Drop the pending play and restore its cards, if any. (Confirmed
+        plays are dropped without restoring, as their cards are gone.)"""
+        with ThreadLockContext(self.play_lock):
+            pending_play = self.pending_play
+            if pending_play is None:
+                return False
+            self.pending_play = None
+            if pending_play.confirmed:
+                return False
+            cards = self.cards = self.confirmed_cards
+        log.debug("Pending play rolled back.")
+        self.app.update_scheduler.post(self.app.CardsUpdate(cards))
+        return True
+
+    def check_play(self, card_ids: Sequence[str], color: str | None) -> None:
+        """Check a play against the latest game state and cards, as the
+        server does, so that plays bound to be rejected are not sent.
+        (Raises `ApiException`.)"""
+
+        game_state = self.game_state
+        if (game_state is None) or not game_state["started"]:
+            raise GameNotStartedException()
+
+        if (self.pending_play is not None) and not self.pending_play.confirmed:
+            raise InvalidPlayException("The previous play is not confirmed yet.")
+
+        current_player_name = game_state["players"][game_state["current_player_index"]][
+            "name"
+        ]
+        if current_player_name != self.player_name:
+            raise NotCurrentPlayerException(current_player_name)
+
+        if len(card_ids) == 0:
+            return  # pass
+
+        card_codes = {card["id"]: encode_card(card) for card in self.cards}
+        card_ids_not_found = [
+            card_id for card_id in dict.fromkeys(card_ids) if card_id not in card_codes
+        ]
+        if len(card_ids_not_found) > 0:
+            raise CardIdsNotFoundException(card_ids_not_found)
+
+        lead_card = game_state["lead_card"]
+        lead_color = game_state["lead_color"]
+        if (lead_card is None) or (lead_color is None):
+            raise InvalidLeadCardInfoException(lead_card, lead_color)
+
+        check_play(
+            [card_codes[card_id] for card_id in dict.fromkeys(card_ids)],
+            cast(BasicCardColor | None, color),
+            lead_color=lead_color,
+            lead_card=encode_card(lead_card),
+            skip_counter=game_state["skip_counter"],
+            rules=game_state["rules"],
+        )
 
-    def play(self, card_ids: list[str], color: str | None) -> None:
+    def play(
+        self,
+        card_ids: list[str],
+        color: str | None,
+        *,
+        on_done: ActionCallback | None = None,
+    ) -> bool:
+        """Check the play locally and send it, with its cards removed from
+        `cards` at once (pending until the server responds, or rolled back
+        if the play fails). Returns `False` if the play is rejected
+        locally, in which case it's not sent and `on_done` is not called."""
 
         player_name = self.player_name
         assert player_name
 
-        api_url = self.get_api_url(f"/player/{player_name}/play")
+        with ThreadLockContext(self.play_lock):
+
+            try:
+                self.check_play(card_ids, color)
+            except ApiException as exception:
+                log.warning("Play rejected locally:", exception.message)
+                self.app.notify_error(exception.message, title="Play Failed")
+                return False
+
+            pending_play: PendingPlay | None = None
+            if len(card_ids) > 0:
+                pending_play = PendingPlay(frozenset(card_ids), confirmed=False)
+                self.pending_play = pending_play
+                cards = self.cards = [
+                    card
+                    for card in self.cards
+                    if card["id"] not in pending_play.card_ids
+                ]
+                self.app.update_scheduler.post(self.app.CardsUpdate(cards))
+
+        def on_play_done(succeeded: bool) -> None:
+            if pending_play is not None:
+                if succeeded:
+                    self.confirm_play(pending_play)
+                else:
+                    self.roll_back_play()
+            if on_done is not None:
+                on_done(succeeded)
+
+        self.submit_action(
+            "POST",
+            f"/player/{player_name}/play",
+            error_title="Play Failed",
+            params={
+                "color": color,
+            },
+            json=card_ids,
+            on_done=on_play_done,
+        )
 
-        with ApiContext("Play Failed", app=self.app):
-            response = post(
-                api_url,
-                params={
-                    "color": color,
-                },
-                json=card_ids,
-            )
-            response.raise_for_status()
+        return True
 
-    def stop_game(self) -> None:
+    def stop_game(self, *, on_done: ActionCallback | None = None) -> None:
 
         player_name = self.player_name
         assert player_name
 
-        api_url = self.get_api_url(f"/game/stop")
-
-        with ApiContext("Stop Failed", app=self.app):
-            response = put(
-                api_url,
-                params={
-                    "player_name": player_name,
-                },
-            )
-            response.raise_for_status()
+        self.submit_action(
+            "PUT",
+            "/game/stop",
+            error_title="Stop Failed",
+            params={
+                "player_name": player_name,
+            },
+            on_done=on_done,
+        )
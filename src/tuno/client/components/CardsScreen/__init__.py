@@ -1,6 +1,5 @@
 from typing import cast
 
-from textual import work
 from textual.app import ComposeResult
 from textual.containers import Horizontal, HorizontalScroll, Vertical, VerticalScroll
 from textual.screen import ModalScreen
@@ -8,17 +7,25 @@ from textual.widgets import Button, Footer, Header, Label, Select
 
 from tuno.client.components.CardLabel import CardLabel
 from tuno.client.components.CheckboxContainer import CheckboxContainer
-from tuno.client.utils.LoadingContext import LoadingContext
+from tuno.shared.card_codes import encode_card, get_card_mask
+from tuno.shared.check_play import playable_mask
 from tuno.shared.deck import Card, basic_card_colors
 
 
 class CardCheckbox(CheckboxContainer):
 
+    DEFAULT_CSS = """
+    CardCheckbox.unplayable {
+        opacity: 50%;
+    }
+    """
+
     card_data: Card
 
-    def __init__(self, card_data: Card) -> None:
+    def __init__(self, card_data: Card, *, playable: bool) -> None:
         super().__init__(CardLabel())
         self.card_data = card_data
+        self.set_class(not playable, "unplayable")
 
     def on_mount(self) -> None:
         self.query_exactly_one(CardLabel).data = self.card_data
@@ -89,11 +96,31 @@ class CardsScreen(ModalScreen[object]):
 
         self.sub_title = client.get_connection_display()
 
+        # hint playable cards
+        playable_cards = -1  # all
+        game_state = client.game_state
+        if (
+            game_state
+            and game_state["started"]
+            and game_state["lead_card"]
+            and game_state["lead_color"]
+        ):
+            playable_cards = playable_mask(
+                get_card_mask(map(encode_card, client.cards)),
+                encode_card(game_state["lead_card"]),
+                game_state["lead_color"],
+                game_state["skip_counter"],
+            )
+
         cards_container = self.query_exactly_one("#cards-container", VerticalScroll)
         for card in client.cards:
-            cards_container.mount(CardCheckbox(card))
+            cards_container.mount(
+                CardCheckbox(
+                    card,
+                    playable=bool(playable_cards & (1 << encode_card(card))),
+                )
+            )
 
-    @work(thread=True)
     def action_submit(self) -> None:
 
         from tuno.client.UnoApp import UnoApp
@@ -113,16 +140,16 @@ class CardsScreen(ModalScreen[object]):
 
         selected_card_ids = [card["id"] for card in selected_cards]
         color_select_value = self.query_exactly_one(Select).value
-        with LoadingContext("Playing...", app=app):
-            client.play(
-                selected_card_ids,
-                color=(
-                    None
-                    if color_select_value is Select.BLANK
-                    else cast(str, color_select_value)
-                ),
-            )
-            self.app.call_from_thread(self.dismiss)
+        # played cards are removed at once, so there's nothing to wait for
+        if client.play(
+            selected_card_ids,
+            color=(
+                None
+                if color_select_value is Select.BLANK
+                else cast(str, color_select_value)
+            ),
+        ):
+            self.dismiss()
 
     def action_reset(self) -> None:
 
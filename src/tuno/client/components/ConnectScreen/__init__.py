@@ -66,7 +66,7 @@ class ConnectScreen(Screen[object]):
         input_server_address = Input(
             id="server_address",
             classes="form-item",
-            placeholder="HOST:PORT",
+            placeholder="HOST:PORT[/ROOM]",
             value=default_server_address,
         )
         input_server_address.border_title = "Server Address"
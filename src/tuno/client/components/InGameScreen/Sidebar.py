@@ -85,9 +85,25 @@ class Sidebar(VerticalScroll):
 
     game_state: reactive[GameStateEvent.DataType | None] = reactive(None)
 
+    __label_status: Label
+    __label_capacity: Label
+    __label_direction: Label
+    __label_current_player: Label
+    __label_draw_pile_size: Label
+    __label_discard_pile_size: Label
+    __label_draw_counter: Label
+    __label_skip_counter: Label
+    __widget_lead_color: CardColorLabel
+    __widget_lead_card: CardLabel
+    __label_texts: dict[Label, str]  # displayed texts
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__label_texts = {}
+
     def compose(self) -> ComposeResult:
 
-        label_status = Label(
+        label_status = self.__label_status = Label(
             "...",
             id="sidebar-info-status",
             classes="sidebar-info-section",
@@ -95,7 +111,7 @@ class Sidebar(VerticalScroll):
         label_status.border_title = "Game Status"
         yield label_status
 
-        label_capacity = Label(
+        label_capacity = self.__label_capacity = Label(
             "-/-",
             id="sidebar-info-capacity",
             classes="sidebar-info-section",
@@ -103,7 +119,7 @@ class Sidebar(VerticalScroll):
         label_capacity.border_title = "Capacity"
         yield label_capacity
 
-        label_direction = Label(
+        label_direction = self.__label_direction = Label(
             "-/-",
             id="sidebar-info-direction",
             classes="sidebar-info-section",
@@ -111,7 +127,7 @@ class Sidebar(VerticalScroll):
         label_direction.border_title = "Direction"
         yield label_direction
 
-        label_current_player = Label(
+        label_current_player = self.__label_current_player = Label(
             "-/-",
             id="sidebar-info-current-player",
             classes="sidebar-info-section",
@@ -119,12 +135,12 @@ class Sidebar(VerticalScroll):
         label_current_player.border_title = "Current"
         yield label_current_player
 
-        label_draw_pile_size = Label(
+        label_draw_pile_size = self.__label_draw_pile_size = Label(
             "-",
             id="sidebar-info-pile-size-draw",
         )
         label_draw_pile_size.tooltip = "Draw pile."
-        label_discard_pile_size = Label(
+        label_discard_pile_size = self.__label_discard_pile_size = Label(
             "-",
             id="sidebar-info-pile-size-discard",
         )
@@ -139,12 +155,12 @@ class Sidebar(VerticalScroll):
         container_pile_size.border_title = "Pile Size"
         yield container_pile_size
 
-        label_draw_counter = Label(
+        label_draw_counter = self.__label_draw_counter = Label(
             "-",
             id="sidebar-info-draw-counter",
         )
         label_draw_counter.tooltip = "Draw counter."
-        label_skip_counter = Label(
+        label_skip_counter = self.__label_skip_counter = Label(
             "-",
             id="sidebar-info-skip-counter",
         )
@@ -159,22 +175,30 @@ class Sidebar(VerticalScroll):
         container_counters.border_title = "Draw/Skip"
         yield container_counters
 
+        self.__widget_lead_color = CardColorLabel(id="sidebar-info-lead-color")
         widget_lead_color = Widget(
-            CardColorLabel(id="sidebar-info-lead-color"),
+            self.__widget_lead_color,
             id="sidebar-info-lead-color-container",
             classes="sidebar-info-section",
         )
         widget_lead_color.border_title = "Lead Color"
         yield widget_lead_color
 
+        self.__widget_lead_card = CardLabel(id="sidebar-info-lead-card")
         widget_lead_card = Widget(
-            CardLabel(id="sidebar-info-lead-card"),
+            self.__widget_lead_card,
             id="sidebar-info-lead-card-container",
             classes="sidebar-info-section",
         )
         widget_lead_card.border_title = "Lead Card"
         yield widget_lead_card
 
+    def __update_label(self, label: Label, text: str) -> None:
+        """Update the text of the label unless it's unchanged."""
+        if self.__label_texts.get(label) != text:
+            self.__label_texts[label] = text
+            label.update(text)
+
     def watch_game_state(
         self,
         game_state: GameStateEvent.DataType | None,
@@ -186,58 +210,41 @@ class Sidebar(VerticalScroll):
         assert isinstance(app, UnoApp)
         assert app.client is not None
 
+        started = bool(game_state and game_state["started"])
+
         # -- Game Status --
-        label_game_status = self.query_exactly_one(
-            "#sidebar-info-status",
-            Label,
+        label_game_status = self.__label_status
+        label_game_status.set_class(started, self.__CLASS_GAME_STATUS_STARTED)
+        label_game_status.set_class(
+            bool(game_state) and not started,
+            self.__CLASS_GAME_STATUS_PENDING,
         )
         if game_state:
-            if game_state["started"]:
-                game_status_display = "Started"
-                label_game_status.add_class(self.__CLASS_GAME_STATUS_STARTED)
-                label_game_status.remove_class(self.__CLASS_GAME_STATUS_PENDING)
-            else:
-                game_status_display = "Pending"
-                label_game_status.remove_class(self.__CLASS_GAME_STATUS_STARTED)
-                label_game_status.add_class(self.__CLASS_GAME_STATUS_PENDING)
+            game_status_display = "Started" if started else "Pending"
         else:
             game_status_display = "..."
-            label_game_status.remove_class(
-                self.__CLASS_GAME_STATUS_STARTED,
-                self.__CLASS_GAME_STATUS_PENDING,
-            )
-        label_game_status.update(game_status_display)
+        self.__update_label(label_game_status, game_status_display)
 
         # -- Player Capacity --
-        label_player_capacity = self.query_exactly_one(
-            "#sidebar-info-capacity",
-            Label,
-        )
         if game_state:
             player_count = len(game_state["players"])
             player_capacity = game_state["rules"]["player_capacity"]
-            label_player_capacity.update(f"{player_count}/{player_capacity}")
+            player_capacity_display = f"{player_count}/{player_capacity}"
         else:
-            label_player_capacity.update("-/-")
+            player_capacity_display = "-/-"
+        self.__update_label(self.__label_capacity, player_capacity_display)
 
         # -- Direction --
-        label_direction = self.query_exactly_one(
-            "#sidebar-info-direction",
-            Label,
-        )
-        if game_state and game_state["started"]:
-            direction = f"{game_state['direction']:+d}"
-            label_direction.update(direction)
+        if game_state and started:
+            direction_display = f"{game_state['direction']:+d}"
         else:
-            label_direction.update("N/A")
+            direction_display = "N/A"
+        self.__update_label(self.__label_direction, direction_display)
 
         # -- Current Player --
-        label_current_player = self.query_exactly_one(
-            "#sidebar-info-current-player",
-            Label,
-        )
+        label_current_player = self.__label_current_player
         current_player_name = "N/A"
-        if game_state and game_state["started"]:
+        if game_state and started:
             current_player_index = game_state["current_player_index"]
             players = game_state["players"]
             if 0 <= current_player_index < len(players):
@@ -247,61 +254,45 @@ class Sidebar(VerticalScroll):
                     "Invalid value for `current_player_index`:",
                     current_player_index,
                 )
-            if current_player_name == app.client.player_name:
-                label_current_player.add_class(self.__CLASS_CURRENT_PLAYER_ACTIVE)
-                label_current_player.remove_class(self.__CLASS_CURRENT_PLAYER_WAITING)
-            else:
-                label_current_player.remove_class(self.__CLASS_CURRENT_PLAYER_ACTIVE)
-                label_current_player.add_class(self.__CLASS_CURRENT_PLAYER_WAITING)
-        else:
-            label_current_player.remove_class(
-                self.__CLASS_CURRENT_PLAYER_ACTIVE,
-                self.__CLASS_CURRENT_PLAYER_WAITING,
-            )
-        label_current_player.update(current_player_name)
-
-        # -- Pile Size --
-        label_draw_pile_size = self.query_exactly_one(
-            f"#sidebar-info-pile-size-draw",
-            Label,
+        is_current_player = current_player_name == app.client.player_name
+        label_current_player.set_class(
+            started and is_current_player,
+            self.__CLASS_CURRENT_PLAYER_ACTIVE,
         )
-        label_discard_pile_size = self.query_exactly_one(
-            f"#sidebar-info-pile-size-discard",
-            Label,
+        label_current_player.set_class(
+            started and not is_current_player,
+            self.__CLASS_CURRENT_PLAYER_WAITING,
         )
-        if game_state and game_state["started"]:
-            label_draw_pile_size.update(str(game_state["draw_pile_size"]))
-            label_discard_pile_size.update(str(game_state["discard_pile_size"]))
+        self.__update_label(label_current_player, current_player_name)
+
+        # -- Pile Size --
+        if game_state and started:
+            self.__update_label(
+                self.__label_draw_pile_size,
+                str(game_state["draw_pile_size"]),
+            )
+            self.__update_label(
+                self.__label_discard_pile_size,
+                str(game_state["discard_pile_size"]),
+            )
         else:
-            label_draw_pile_size.update("-")
-            label_discard_pile_size.update("-")
+            self.__update_label(self.__label_draw_pile_size, "-")
+            self.__update_label(self.__label_discard_pile_size, "-")
 
         # -- Draw/Skip Counters --
-        label_draw_count = self.query_exactly_one(
-            f"#sidebar-info-draw-counter",
-            Label,
-        )
-        label_skip_count = self.query_exactly_one(
-            f"#sidebar-info-skip-counter",
-            Label,
-        )
-        if game_state and game_state["started"]:
-            label_draw_count.update(str(game_state["draw_counter"]))
-            label_skip_count.update(str(game_state["skip_counter"]))
+        if game_state and started:
+            self.__update_label(
+                self.__label_draw_counter,
+                str(game_state["draw_counter"]),
+            )
+            self.__update_label(
+                self.__label_skip_counter,
+                str(game_state["skip_counter"]),
+            )
         else:
-            label_draw_count.update("-")
-            label_skip_count.update("-")
+            self.__update_label(self.__label_draw_counter, "-")
+            self.__update_label(self.__label_skip_counter, "-")
 
-        # -- Lead Color --
-        widget_lead_color = self.query_exactly_one(
-            f"#sidebar-info-lead-color",
-            CardColorLabel,
-        )
-        widget_lead_color.data = game_state and game_state["lead_color"]
-
-        # -- Lead Card --
-        widget_lead_card = self.query_exactly_one(
-            f"#sidebar-info-lead-card",
-            CardLabel,
-        )
-        widget_lead_card.data = game_state and game_state["lead_card"]
+        # -- Lead Color & Card -- (unchanged values are ignored by reactives)
+        self.__widget_lead_color.data = game_state and game_state["lead_color"]
+        self.__widget_lead_card.data = game_state and game_state["lead_card"]
@@ -1,6 +1,5 @@
 from typing import cast
 
-from textual import work
 from textual.app import ComposeResult
 from textual.containers import HorizontalScroll
 from textual.reactive import reactive
@@ -10,7 +9,7 @@ from textual.widgets import Button, Footer, Header
 from tuno.client.components.CardsScreen import CardsScreen
 from tuno.client.components.Players import Players
 from tuno.client.components.RulesScreen import RulesScreen
-from tuno.client.utils.LoadingContext import LoadingContext
+from tuno.client.utils.LoadingCallback import LoadingCallback
 from tuno.shared.deck import Deck
 from tuno.shared.sse_events import GameStateEvent
 
@@ -27,7 +26,7 @@ class InGameScreen(Screen[object]):
     ]
 
     game_state: reactive[GameStateEvent.DataType | None] = reactive(None)
-    cards: reactive[Deck] = reactive([])
+    cards: reactive[Deck] = reactive([], always_update=True)
 
     def compose(self) -> ComposeResult:
 
@@ -61,6 +60,12 @@ class InGameScreen(Screen[object]):
         yield Footer()
 
     def watch_game_state(self, game_state: GameStateEvent.DataType | None) -> None:
+        self.update_sub_title()
+
+    def watch_cards(self, cards: Deck) -> None:
+        self.update_sub_title()
+
+    def update_sub_title(self) -> None:
 
         from tuno.client.UnoApp import UnoApp
 
@@ -70,6 +75,9 @@ class InGameScreen(Screen[object]):
         client = app.client
         assert client is not None
         self.sub_title = client.get_connection_display()
+        pending_play = client.pending_play
+        if (pending_play is not None) and not pending_play.confirmed:
+            self.sub_title += " (playing...)"
 
     def action_play(self) -> None:
         self.app.push_screen(CardsScreen())
@@ -77,7 +85,6 @@ class InGameScreen(Screen[object]):
     def action_show_rules(self) -> None:
         self.app.push_screen(RulesScreen(readonly=True))
 
-    @work(thread=True)
     def action_stop_game(self) -> None:
 
         from tuno.client.UnoApp import UnoApp
@@ -88,5 +95,4 @@ class InGameScreen(Screen[object]):
         client = app.client
         assert client is not None
 
-        with LoadingContext("Stopping game...", app=app):
-            client.stop_game()
+        client.stop_game(on_done=LoadingCallback("Stopping game...", app=app))
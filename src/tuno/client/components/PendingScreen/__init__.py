@@ -1,6 +1,5 @@
 from typing import cast
 
-from textual import work
 from textual.app import ComposeResult
 from textual.containers import HorizontalScroll
 from textual.reactive import reactive
@@ -9,7 +8,7 @@ from textual.widgets import Button, Footer, Header
 
 from tuno.client.components.Players import Players
 from tuno.client.components.RulesScreen import RulesScreen
-from tuno.client.utils.LoadingContext import LoadingContext
+from tuno.client.utils.LoadingCallback import LoadingCallback
 from tuno.shared.sse_events import GameStateEvent
 
 
@@ -61,7 +60,6 @@ class PendingScreen(Screen[object]):
     def action_show_rules(self) -> None:
         self.app.push_screen(RulesScreen(readonly=False))
 
-    @work(thread=True)
     def action_start_game(self) -> None:
 
         from tuno.client.UnoApp import UnoApp
@@ -72,5 +70,4 @@ class PendingScreen(Screen[object]):
         client = app.client
         assert client is not None
 
-        with LoadingContext("Starting game...", app=app):
-            client.start_game()
+        client.start_game(on_done=LoadingCallback("Starting game...", app=app))
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Final, cast
+from typing import Final
 
 from textual.app import ComposeResult
 from textual.containers import Horizontal, VerticalScroll
@@ -59,85 +59,89 @@ class PlayerCard(Widget):
     active: reactive[bool] = reactive(False)
     data: reactive[GameStateEvent.PlayerDataType | None] = reactive(None)
 
-    def compose(self) -> ComposeResult:
-
-        label_connected = Label("●", classes="player-card-connected")
-        label_connected.tooltip = "Connection: N/A"
-
-        label_name = Label("???", classes="player-card-name")
-        label_name.tooltip = "Player name"
+    __label_connected: Label
+    __label_name: Label
+    __label_card_count_value: Label
+
+    def __init__(self, data: GameStateEvent.PlayerDataType | None = None) -> None:
+        super().__init__()
+        self.__label_connected = Label("●", classes="player-card-connected")
+        self.__label_connected.tooltip = "Connection: N/A"
+        self.__label_name = Label("???", classes="player-card-name")
+        self.__label_name.tooltip = "Player name"
+        self.__label_card_count_value = Label(
+            "...",
+            classes="player-card-count-value",
+        )
+        self.set_reactive(PlayerCard.data, data)
 
-        yield label_connected
-        yield label_name
+    def compose(self) -> ComposeResult:
+        yield self.__label_connected
+        yield self.__label_name
         yield Horizontal(
             Label(
                 "Cards: ",
                 classes="player-card-count-label",
             ),
-            Label(
-                "...",
-                classes="player-card-count-value",
-            ),
+            self.__label_card_count_value,
             classes="player-card-count",
         )
 
+    def on_mount(self) -> None:
+        self.__update_labels(None, self.data, force=True)
+
     def watch_active(self, active: bool) -> None:
-        if active:
-            self.add_class(self.__CLASS_PLAYER_ACTIVE)
-        else:
-            self.remove_class(self.__CLASS_PLAYER_ACTIVE)
+        self.set_class(active, self.__CLASS_PLAYER_ACTIVE)
 
-    def watch_data(self, data: GameStateEvent.PlayerDataType | None) -> None:
+    def watch_data(
+        self,
+        old_data: GameStateEvent.PlayerDataType | None,
+        data: GameStateEvent.PlayerDataType | None,
+    ) -> None:
+        self.__update_labels(old_data, data)
 
-        label_name = self.query_exactly_one(
-            ".player-card-name",
-            Label,
-        )
-        if data:
-            label_name.update(data["name"])
-            label_name.tooltip = f"Player name: {data["name"]}"
-            if data["connected"]:
-                label_name.add_class(self.__CLASS_PLAYER_CONNECTED)
-                label_name.remove_class(self.__CLASS_PLAYER_DISCONNECTED)
+    def __update_labels(
+        self,
+        old_data: GameStateEvent.PlayerDataType | None,
+        data: GameStateEvent.PlayerDataType | None,
+        *,
+        force: bool = False,
+    ) -> None:
+        """Update the labels of the changed fields (or all if `force`)."""
+
+        label_name = self.__label_name
+        label_connected = self.__label_connected
+
+        name = data["name"] if data else None
+        if force or name != (old_data["name"] if old_data else None):
+            if name is not None:
+                label_name.update(name)
+                label_name.tooltip = f"Player name: {name}"
+            else:
+                label_name.update("???")
+                label_name.tooltip = "Player name"
+
+        connected = data["connected"] if data else None
+        if force or connected != (old_data["connected"] if old_data else None):
+            if connected is not None:
+                for label in (label_name, label_connected):
+                    label.set_class(connected, self.__CLASS_PLAYER_CONNECTED)
+                    label.set_class(not connected, self.__CLASS_PLAYER_DISCONNECTED)
+                label_connected.tooltip = "Connected" if connected else "Disconnected"
             else:
                 label_name.remove_class(self.__CLASS_PLAYER_CONNECTED)
                 label_name.add_class(self.__CLASS_PLAYER_DISCONNECTED)
-        else:
-            label_name.update("???")
-            label_name.remove_class(self.__CLASS_PLAYER_CONNECTED)
-            label_name.add_class(self.__CLASS_PLAYER_DISCONNECTED)
-            label_name.tooltip = "Player name"
-
-        label_connected = self.query_exactly_one(
-            ".player-card-connected",
-            Label,
-        )
-        if data:
-            if data["connected"]:
-                label_connected.tooltip = "Connected"
-                label_connected.add_class(self.__CLASS_PLAYER_CONNECTED)
-                label_connected.remove_class(self.__CLASS_PLAYER_DISCONNECTED)
-            else:
-                label_connected.tooltip = "Disconnected"
-                label_connected.remove_class(self.__CLASS_PLAYER_CONNECTED)
-                label_connected.add_class(self.__CLASS_PLAYER_DISCONNECTED)
-        else:
-            label_connected.tooltip = "Connection: N/A"
-            label_connected.remove_class(
-                self.__CLASS_PLAYER_CONNECTED,
-                self.__CLASS_PLAYER_DISCONNECTED,
-            )
+                label_connected.remove_class(
+                    self.__CLASS_PLAYER_CONNECTED,
+                    self.__CLASS_PLAYER_DISCONNECTED,
+                )
+                label_connected.tooltip = "Connection: N/A"
 
-        label_card_count_value = self.query_exactly_one(
-            ".player-card-count-value",
-            Label,
-        )
-        card_count_display = "N/A"
-        if data:
-            card_count = data["card_count"]
-            if card_count >= 0:
-                card_count_display = str(card_count)
-        label_card_count_value.update(card_count_display)
+        card_count = data["card_count"] if data else -1
+        if force or card_count != (old_data["card_count"] if old_data else -1):
+            self.__label_card_count_value.update(
+                str(card_count) if card_count >= 0 else "N/A"
+            )
 
 
 class Players(VerticalScroll):
@@ -159,47 +163,55 @@ class Players(VerticalScroll):
 
     game_state: reactive[GameStateEvent.DataType | None] = reactive(None)
 
+    __cards: dict[str, PlayerCard]  # by player name
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__cards = {}
+
     async def watch_game_state(
         self,
         game_state: GameStateEvent.DataType | None,
     ) -> None:
 
         if not game_state:
-            self.remove_children()
+            self.__cards.clear()
+            await self.remove_children()
             self.loading = True
             return
 
         self.loading = False
 
-        async with self.batch():
+        players = game_state["players"]
+        player_names = {player_data["name"] for player_data in players}
+        cards = self.__cards
 
-            children = self.children
-            assert all(isinstance(child, PlayerCard) for child in children)
-            if TYPE_CHECKING:
-                children = cast(list[PlayerCard], children)
+        async with self.batch():
 
-            players = game_state["players"]
-            current_child_count = len(children)
-            for i, player_data in enumerate(players[:current_child_count]):
-                children[i].data = player_data
-                children[i].active = game_state["started"] and (
+            # -- Leave --
+            left_cards = [
+                cards.pop(name) for name in list(cards) if name not in player_names
+            ]
+            if left_cards:
+                await self.remove_children(left_cards)
+
+            # -- Join --
+            new_cards: list[PlayerCard] = []
+            for player_data in players:
+                name = player_data["name"]
+                if name not in cards:
+                    card = cards[name] = PlayerCard(player_data)
+                    new_cards.append(card)
+                else:
+                    cards[name].data = player_data
+            if new_cards:
+                await self.mount(*new_cards)
+
+            # -- Reorder --
+            for i, player_data in enumerate(players):
+                card = cards[player_data["name"]]
+                if self.children[i] is not card:
+                    self.move_child(card, before=i)
+                card.active = game_state["started"] and (
                     i == game_state["current_player_index"]
                 )
-
-            player_count = len(players)
-            if player_count > current_child_count:
-                new_players = players[current_child_count:]
-                new_children: list[PlayerCard] = []
-                for player_data in new_players:
-                    new_children.append(PlayerCard())
-                await self.mount(*new_children)
-                for j, (child, data) in enumerate(
-                    zip(new_children, new_players, strict=True)
-                ):
-                    child.data = data
-                    i = current_child_count + j
-                    child.active = game_state["started"] and (
-                        i == game_state["current_player_index"]
-                    )
-            elif player_count < current_child_count:
-                self.remove_children(children[player_count:])
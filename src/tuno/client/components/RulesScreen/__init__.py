@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Final, cast
 
-from textual import on, work
+from textual import on
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Right, Vertical, VerticalScroll
 from textual.events import DescendantBlur, DescendantFocus
@@ -12,7 +12,7 @@ from textual.validation import Function as FunctionValidator
 from textual.widget import Widget
 from textual.widgets import Button, Footer, Header, Input, Label, Switch
 
-from tuno.client.utils.LoadingContext import LoadingContext
+from tuno.client.utils.LoadingCallback import LoadingCallback
 from tuno.shared.rules import RuleValidationException, rule_metadata_map
 
 
@@ -250,7 +250,6 @@ class RulesScreen(ModalScreen[object]):
     ) -> None:
         self.query_exactly_one("#rules-submit", Button).disabled = not message.all_valid
 
-    @work(thread=True)
     def action_submit(self) -> None:
 
         if self.readonly:
@@ -282,10 +281,14 @@ class RulesScreen(ModalScreen[object]):
             )
             return
 
-        with LoadingContext("Updating rules...", app=app):
-            client.update_rules(modified_rules)
-
-        app.call_from_thread(self.dismiss)
+        client.update_rules(
+            modified_rules,
+            on_done=LoadingCallback(
+                "Updating rules...",
+                app=app,
+                then=lambda succeeded: self.dismiss(),
+            ),
+        )
 
     def action_reset(self) -> None:
 
@@ -1,9 +1,16 @@
 from datetime import timedelta
 from typing import Final
 
+from tuno.shared.event_encoding import COMPACT_EVENT_ENCODING, EventEncoding
+
 # -- Connection Config --
 SSE_MAX_RETRIES: Final = 2
+SSE_EVENT_ENCODING: Final[EventEncoding] = COMPACT_EVENT_ENCODING
 SSE_TIMEOUT = timedelta(seconds=10)
+ACTION_MAX_RETRIES: Final = 2  # on connection failures only
+ACTION_BACKOFF_FACTOR: Final = 0.2  # seconds, doubled per retry
+ACTION_CONNECT_TIMEOUT = timedelta(seconds=3)
+ACTION_READ_TIMEOUT = timedelta(seconds=10)
 
 # -- Notification Config --
 NOTIFICATION_TIMEOUT_DEFAULT = timedelta(seconds=3)
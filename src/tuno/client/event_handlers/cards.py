@@ -9,6 +9,4 @@ if TYPE_CHECKING:
 def handler(parsed_data: Deck, app: "UnoApp") -> None:
 
     assert app.client is not None
-    app.client.cards = parsed_data
-
-    app.post_message(app.CardsUpdate(parsed_data))
+    app.client.update_cards(parsed_data)
@@ -9,6 +9,4 @@ if TYPE_CHECKING:
 def handler(parsed_data: GameStateEvent.DataType, app: "UnoApp") -> None:
 
     assert app.client is not None
-    app.client.game_state = parsed_data
-
-    app.post_message(app.GameStateUpdate(parsed_data))
+    app.client.update_game_state(parsed_data)
@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from textual import log
+
+from tuno.shared.game_state_patch import apply_game_state_patch
+from tuno.shared.sse_events import GameStatePatchEvent
+
+if TYPE_CHECKING:
+    from tuno.client.UnoApp import UnoApp
+
+
+def handler(parsed_data: GameStatePatchEvent.DataType, app: "UnoApp") -> None:
+
+    assert app.client is not None
+    game_state = app.client.game_state
+
+    if (game_state is None) or (game_state["version"] != parsed_data["base_version"]):
+        # The server sends a full game state whenever there is a gap,
+        # so just wait for it.
+        log.warning(
+            "Ignored game state patch "
+            f"(base_version: {parsed_data['base_version']})."
+        )
+        return
+
+    app.client.update_game_state(apply_game_state_patch(game_state, parsed_data))
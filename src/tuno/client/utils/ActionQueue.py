@@ -0,0 +1,154 @@
+from collections.abc import Callable, Mapping
+from contextlib import AbstractContextManager
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from typing import NamedTuple
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from tuno.client.config import (
+    ACTION_BACKOFF_FACTOR,
+    ACTION_CONNECT_TIMEOUT,
+    ACTION_MAX_RETRIES,
+    ACTION_READ_TIMEOUT,
+)
+
+type ActionCallback = Callable[[bool], object]
+type ErrorContextFactory = Callable[[str], AbstractContextManager[object]]
+
+
+class ApiAction(NamedTuple):
+    method: str
+    url: str
+    error_title: str
+    params: Mapping[str, str | None] | None = None
+    json: object = None
+    on_done: ActionCallback | None = None
+
+
+def create_session() -> Session:
+    """Create a session keeping one connection alive to the server.
+
+    Only connection failures are retried (with backoff), as requests
+    are not sent then; other failures are reported, as the actions
+    may have been done already.
+    """
+    retry = Retry(
+        total=ACTION_MAX_RETRIES,
+        connect=ACTION_MAX_RETRIES,
+        read=0,
+        redirect=0,
+        status=0,
+        other=0,
+        backoff_factor=ACTION_BACKOFF_FACTOR,
+        raise_on_status=False,
+    )
+    # one server and one sender, so one connection in one pool
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry)
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ActionQueue:
+    """Send API actions one by one on a background thread, in the order
+    they're submitted, over a keep-alive session. Submitting doesn't
+    block; `on_done` of each action is called on the sending thread
+    with whether the action succeeded, after failures are reported
+    by the error context. (Actions submitted after `close()` are not
+    sent, and their `on_done` is called as failed on the submitting
+    thread.)
+    """
+
+    session: Session
+
+    __error_context: ErrorContextFactory
+    __queue: "SimpleQueue[ApiAction | None]"
+    __thread: Thread | None
+    __thread_lock: Lock  # guards starting the only sending thread
+    __closed: bool
+
+    def __init__(
+        self,
+        *,
+        error_context: ErrorContextFactory,
+        session: Session | None = None,
+    ) -> None:
+        self.session = session or create_session()
+        self.__error_context = error_context
+        self.__queue = SimpleQueue()
+        self.__thread = None
+        self.__thread_lock = Lock()
+        self.__closed = False
+
+    def submit(self, action: ApiAction) -> None:
+        with self.__thread_lock:
+            if not self.__closed:
+                self.__queue.put(action)
+                if self.__thread is None or not self.__thread.is_alive():
+                    self.__thread = Thread(target=self.__run, daemon=True)
+                    self.__thread.start()
+                return
+        if action.on_done is not None:
+            action.on_done(False)
+
+    def clear(self) -> int:
+        """Discard the actions not sent yet and return their count.
+        (Their `on_done` is called as failed on the calling thread.)"""
+        count = 0
+        while True:
+            try:
+                action = self.__queue.get_nowait()
+            except Empty:
+                return count
+            if action is None:
+                self.__queue.put(None)  # keep the stop mark
+                return count
+            count += 1
+            if action.on_done is not None:
+                action.on_done(False)
+
+    def close(self) -> None:
+        """Stop after the actions submitted so far, and close the session
+        then. (Later actions are rejected.)"""
+        with self.__thread_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            if self.__thread is not None and self.__thread.is_alive():
+                self.__queue.put(None)
+                return
+        self.session.close()
+
+    def __send(self, action: ApiAction) -> bool:
+        succeeded = False
+        try:
+            with self.__error_context(action.error_title):
+                response = self.session.request(
+                    action.method,
+                    action.url,
+                    params=action.params,
+                    json=action.json,
+                    timeout=(
+                        ACTION_CONNECT_TIMEOUT.total_seconds(),
+                        ACTION_READ_TIMEOUT.total_seconds(),
+                    ),
+                )
+                response.raise_for_status()
+                succeeded = True
+        except Exception:
+            pass  # reported by the error context; keep sending later actions
+        return succeeded
+
+    def __run(self) -> None:
+        while True:
+            action = self.__queue.get()
+            if action is None:
+                self.session.close()
+                return
+            succeeded = self.__send(action)
+            if action.on_done is not None:
+                action.on_done(succeeded)
@@ -0,0 +1,41 @@
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from tuno.client.components.LoadingScreen import LoadingScreen
+
+if TYPE_CHECKING:
+    from tuno.client.UnoApp import UnoApp
+
+
+class LoadingCallback:
+    """Show a loading screen until a queued action is done.
+
+    Create it on the UI thread and pass it as `on_done` of the action;
+    the screen is dismissed and `then` is called with whether the action
+    succeeded, both on the UI thread. (It can be called on any thread,
+    e.g. the UI thread if the action is rejected at once.)
+    """
+
+    app: "UnoApp"
+    loading_screen: LoadingScreen
+    then: Callable[[bool], object] | None
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        app: "UnoApp",
+        then: Callable[[bool], object] | None = None,
+    ) -> None:
+        self.app = app
+        self.loading_screen = LoadingScreen(message)
+        self.then = then
+        app.push_screen(self.loading_screen)
+
+    def __call__(self, succeeded: bool) -> None:
+        self.app.call_later(self.__done, succeeded)  # thread-safe
+
+    def __done(self, succeeded: bool) -> None:
+        self.loading_screen.dismiss()
+        if self.then is not None:
+            self.then(succeeded)
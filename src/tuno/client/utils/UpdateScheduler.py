@@ -0,0 +1,88 @@
+from collections import Counter
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from textual.constants import MAX_FPS
+from textual.message import Message
+
+from tuno.shared.ThreadLockContext import ThreadLockContext
+
+if TYPE_CHECKING:
+    from tuno.client.UnoApp import UnoApp
+
+
+class UpdateScheduler:
+    """Coalesce UI updates arriving in bursts (e.g. the events of a game
+    start or chained draws): only the latest message of each type is kept,
+    and the kept messages are posted to the app at most once per frame.
+
+    Messages can be posted from any thread.
+    """
+
+    app: "UnoApp"
+    frame_interval: float  # seconds
+    posted_counts: Counter[str]  # by message type
+    coalesced_counts: Counter[str]  # dropped for later ones of the same type
+
+    __lock: Lock
+    __pending_messages: dict[type[Message], Message]
+    __pending_coalesced_counts: Counter[str]
+    __flush_scheduled: bool
+    __last_flush_time: float
+
+    def __init__(self, app: "UnoApp", *, frame_interval: float = 1 / MAX_FPS) -> None:
+        self.app = app
+        self.frame_interval = frame_interval
+        self.posted_counts = Counter()
+        self.coalesced_counts = Counter()
+        self.__lock = Lock()
+        self.__pending_messages = {}
+        self.__pending_coalesced_counts = Counter()
+        self.__flush_scheduled = False
+        self.__last_flush_time = 0.0
+
+    def post(self, message: Message) -> None:
+
+        message_type = type(message)
+
+        with ThreadLockContext(self.__lock):
+            if message_type in self.__pending_messages:
+                self.__pending_coalesced_counts[message_type.__name__] += 1
+            self.__pending_messages[message_type] = message
+            if self.__flush_scheduled:
+                return
+            self.__flush_scheduled = True
+
+        self.app.call_later(self.__schedule_flush)  # thread-safe
+
+    def __schedule_flush(self) -> None:
+        delay = self.__last_flush_time + self.frame_interval - monotonic()
+        if delay > 0:
+            self.app.set_timer(delay, self.__flush)
+        else:
+            self.__flush()
+
+    def __flush(self) -> None:
+
+        with ThreadLockContext(self.__lock):
+            messages = self.__pending_messages
+            coalesced_counts = self.__pending_coalesced_counts
+            self.__pending_messages = {}
+            self.__pending_coalesced_counts = Counter()
+            self.__flush_scheduled = False
+
+        self.__last_flush_time = monotonic()
+
+        for message in messages.values():
+            self.posted_counts[type(message).__name__] += 1
+            self.app.post_message(message)
+
+        if coalesced_counts:
+            self.coalesced_counts.update(coalesced_counts)
+            self.app.log.debug(
+                "Coalesced UI updates:",
+                dropped=dict(coalesced_counts),
+                total_posted=dict(self.posted_counts),
+                total_dropped=dict(self.coalesced_counts),
+            )
@@ -0,0 +1,67 @@
+from statistics import quantiles
+from typing import Any
+
+
+def get_percentiles(samples: list[float]) -> dict[str, float]:
+    """Get p50/p90/p99/max of samples in milliseconds."""
+    if len(samples) < 2:
+        return {
+            key: round(sum(samples) * 1000, 1) for key in ("p50", "p90", "p99", "max")
+        }
+    percentiles = quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(percentiles[49] * 1000, 1),
+        "p90": round(percentiles[89] * 1000, 1),
+        "p99": round(percentiles[98] * 1000, 1),
+        "max": round(max(samples) * 1000, 1),
+    }
+
+
+class LoadTestStats:
+    """Counters and samples collected by synthetic players.
+
+    Samples of the current report interval are kept separately, so that
+    each interval can be reported on its own."""
+
+    connected_count: int
+    connect_durations: list[float]  # from connecting to initial game state
+    connection_drop_count: int
+    late_heartbeat_count: int
+    play_count: int
+    play_error_count: int
+    play_latencies: list[float]  # from play request to game state update
+    interval_play_latencies: list[float]
+    game_count: int  # finished games
+
+    def __init__(self) -> None:
+        self.connected_count = 0
+        self.connect_durations = []
+        self.connection_drop_count = 0
+        self.late_heartbeat_count = 0
+        self.play_count = 0
+        self.play_error_count = 0
+        self.play_latencies = []
+        self.interval_play_latencies = []
+        self.game_count = 0
+
+    def add_play_latency(self, latency: float) -> None:
+        self.play_latencies.append(latency)
+        self.interval_play_latencies.append(latency)
+
+    def pop_interval_play_latencies(self) -> list[float]:
+        latencies = self.interval_play_latencies
+        self.interval_play_latencies = []
+        return latencies
+
+    def to_json(self, *, elapsed_seconds: float) -> dict[str, Any]:
+        return {
+            "connected": self.connected_count,
+            "connect_latency_ms": get_percentiles(self.connect_durations),
+            "connection_drops": self.connection_drop_count,
+            "late_heartbeats": self.late_heartbeat_count,
+            "plays": self.play_count,
+            "plays_per_second": round(self.play_count / elapsed_seconds, 1),
+            "play_errors": self.play_error_count,
+            "play_latency_ms": get_percentiles(self.play_latencies),
+            "games": self.game_count,
+        }
@@ -0,0 +1,44 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from psutil import Process
+
+
+class ResourceMonitor:
+    """Sample CPU usage and RSS of a (local) server process.
+    (Requires `psutil`, which comes with the "loadtest" extra.)"""
+
+    samples: list[tuple[float, float, int]]  # (elapsed seconds, cpu %, rss)
+
+    __process: "Process"
+
+    def __init__(self, pid: int) -> None:
+
+        import psutil
+
+        self.samples = []
+        self.__process = psutil.Process(pid)
+        self.__process.cpu_percent(None)  # start measuring
+
+    def sample(self, elapsed_seconds: float) -> tuple[float, int]:
+        """Get CPU usage since last sample (in percent of one core)
+        and current RSS (in bytes)."""
+        with self.__process.oneshot():
+            cpu_percent = self.__process.cpu_percent(None)
+            rss = self.__process.memory_info().rss
+        self.samples.append((elapsed_seconds, cpu_percent, rss))
+        return cpu_percent, rss
+
+    def to_json(self) -> dict[str, Any]:
+        cpu_percents = [cpu_percent for _, cpu_percent, _ in self.samples]
+        rss_values = [rss for _, _, rss in self.samples]
+        return {
+            "server_cpu_percent": {
+                "mean": round(sum(cpu_percents) / max(len(cpu_percents), 1), 1),
+                "max": max(cpu_percents, default=0),
+            },
+            "server_rss_mb": {
+                "last": round(rss_values[-1] / 2**20, 1) if rss_values else None,
+                "max": round(max(rss_values, default=0) / 2**20, 1),
+            },
+        }
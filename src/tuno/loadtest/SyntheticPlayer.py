@@ -0,0 +1,301 @@
+import asyncio
+import json
+from collections.abc import Coroutine
+from random import Random
+from time import perf_counter
+from typing import Any
+from urllib.parse import quote
+
+from tuno.server.config import HEARTBEAT_GAP
+from tuno.shared.card_codes import CARDS, encode_card, get_card_mask, iter_card_mask
+from tuno.shared.check_play import playable_mask
+from tuno.shared.deck import Deck, basic_card_colors
+from tuno.shared.game_state_patch import apply_game_state_patch
+from tuno.shared.sse_events import GameStateEvent
+
+from .http_client import EventStream, send_request
+from .LoadTestStats import LoadTestStats
+
+# a heartbeat (or any message) arriving later than this is counted late
+LATE_HEARTBEAT_SECONDS = HEARTBEAT_GAP.total_seconds() * 1.5
+RECONNECT_DELAY_SECONDS = 1.0
+RESTART_DELAY_SECONDS = 0.5
+
+
+class SyntheticPlayer:
+    """A player which subscribes like `UnoClient.subscribe()` does and
+    plays like a bot through the HTTP API.
+
+    The first player of each room (the leader) starts the game once the
+    room is full, and restarts it whenever it ends.
+    """
+
+    name: str
+    room_id: str
+    room_size: int
+    is_leader: bool
+    connected: bool
+
+    __host: str
+    __port: int
+    __think_seconds: float
+    __random: Random
+    __stats: LoadTestStats
+    __game_state: GameStateEvent.DataType | None
+    __cards: Deck
+    __pending_play_version: int | None  # state version when play was sent
+    __pending_play_timestamp: float
+    __busy: bool  # whether a request is in flight
+    __acted_version: int | None  # game state version last acted on
+    __force_pass: bool
+    __action_tasks: set[asyncio.Task[None]]
+    __stopped: bool
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        room_id: str,
+        room_size: int,
+        is_leader: bool,
+        host: str,
+        port: int,
+        think_seconds: float,
+        seed: str,
+        stats: LoadTestStats,
+    ) -> None:
+        self.name = name
+        self.room_id = room_id
+        self.room_size = room_size
+        self.is_leader = is_leader
+        self.connected = False
+        self.__host = host
+        self.__port = port
+        self.__think_seconds = think_seconds
+        self.__random = Random(f"{seed}/{name}")
+        self.__stats = stats
+        self.__game_state = None
+        self.__cards = []
+        self.__pending_play_version = None
+        self.__pending_play_timestamp = 0
+        self.__busy = False
+        self.__acted_version = None
+        self.__force_pass = False
+        self.__action_tasks = set()
+        self.__stopped = False
+
+    def __get_api_path(self, api_path: str) -> str:
+        return f"/api/rooms/{self.room_id}{api_path}"
+
+    async def run(self) -> None:
+        """Keep subscribing until cancelled."""
+        try:
+            await self.__subscribe()
+        finally:
+            self.__stopped = True
+            for task in self.__action_tasks:
+                task.cancel()
+
+    async def __subscribe(self) -> None:
+
+        stats = self.__stats
+
+        while True:
+
+            timestamp_begin = perf_counter()
+            try:
+                stream = await EventStream.open(
+                    self.__get_api_path(f"/player/{self.name}"),
+                    host=self.__host,
+                    port=self.__port,
+                )
+            except (OSError, asyncio.IncompleteReadError):
+                stats.connection_drop_count += 1
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                continue
+
+            try:
+                await self.__receive(stream, timestamp_begin)
+            except (OSError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                stream.close()
+                if self.connected:
+                    self.connected = False
+                    stats.connected_count -= 1
+
+            stats.connection_drop_count += 1
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def __receive(self, stream: EventStream, timestamp_begin: float) -> None:
+
+        stats = self.__stats
+        last_message_timestamp = perf_counter()
+
+        while True:
+
+            messages = await stream.read_messages()
+
+            timestamp = perf_counter()
+            if timestamp - last_message_timestamp > LATE_HEARTBEAT_SECONDS:
+                stats.late_heartbeat_count += 1
+            last_message_timestamp = timestamp
+
+            for message in messages:
+
+                event_type = ""
+                event_data: Any = None
+                for line in message.decode().split("\n"):
+                    if line.startswith("event: "):
+                        event_type = line[7:]
+                    elif line.startswith("data: "):
+                        event_data = json.loads(line[6:])
+
+                if event_type in ("end_of_connection", "subscription_change"):
+                    raise ConnectionError(event_type)
+
+                if event_type == "cards":
+                    self.__cards = event_data
+                elif event_type == "game_state":
+                    if not self.connected:
+                        self.connected = True
+                        stats.connected_count += 1
+                        stats.connect_durations.append(timestamp - timestamp_begin)
+                    self.__update_game_state(event_data)
+                elif event_type == "game_state_patch":
+                    game_state = self.__game_state
+                    if game_state and (
+                        event_data["base_version"] == game_state["version"]
+                    ):
+                        self.__update_game_state(
+                            apply_game_state_patch(game_state, event_data)
+                        )
+
+    def __update_game_state(self, game_state: GameStateEvent.DataType) -> None:
+
+        stats = self.__stats
+        previous_game_state = self.__game_state
+        self.__game_state = game_state
+
+        pending_play_version = self.__pending_play_version
+        if (pending_play_version is not None) and (
+            game_state["version"] > pending_play_version
+        ):
+            self.__pending_play_version = None
+            stats.add_play_latency(perf_counter() - self.__pending_play_timestamp)
+
+        if (
+            self.is_leader
+            and previous_game_state
+            and previous_game_state["started"]
+            and not game_state["started"]
+        ):
+            stats.game_count += 1
+
+        self.__act()
+
+    def __act(self) -> None:
+        """Play or start the game if needed, once per game state version."""
+
+        game_state = self.__game_state
+        if self.__stopped or self.__busy or (game_state is None):
+            return
+        if game_state["version"] == self.__acted_version:
+            return
+
+        if game_state["started"]:
+            players = game_state["players"]
+            current_player = players[game_state["current_player_index"]]
+            if current_player["name"] == self.name:
+                self.__acted_version = game_state["version"]
+                self.__start_action(self.__play(game_state))
+
+        elif self.is_leader and (len(game_state["players"]) >= self.room_size):
+            self.__acted_version = game_state["version"]
+            self.__start_action(self.__start_game())
+
+    def __start_action(self, action: Coroutine[None, None, None]) -> None:
+        self.__busy = True
+        task = asyncio.create_task(action)
+        self.__action_tasks.add(task)
+        task.add_done_callback(self.__action_tasks.discard)
+
+    async def __start_game(self) -> None:
+        try:
+            await asyncio.sleep(RESTART_DELAY_SECONDS)
+            await send_request(
+                "PUT",
+                self.__get_api_path(f"/game/start?player_name={self.name}"),
+                host=self.__host,
+                port=self.__port,
+            )
+        except OSError:
+            pass
+        finally:
+            self.__busy = False
+            self.__act()
+
+    def __choose_play(self, game_state: GameStateEvent.DataType) -> tuple[Deck, str]:
+        """Choose a card to play like a bot, and return
+        the cards with the color query (if any)."""
+
+        lead_card = game_state["lead_card"]
+        lead_color = game_state["lead_color"]
+        if self.__force_pass or not (lead_card and lead_color):
+            return [], ""
+
+        playable_cards = list(
+            iter_card_mask(
+                playable_mask(
+                    get_card_mask(map(encode_card, self.__cards)),
+                    encode_card(lead_card),
+                    lead_color,
+                    game_state["skip_counter"],
+                )
+            )
+        )
+        if not playable_cards:
+            return [], ""
+
+        card = CARDS[self.__random.choice(playable_cards)]
+        if card["type"] != "wild":
+            return [card], ""
+        return [card], f"?color={quote(self.__random.choice(basic_card_colors))}"
+
+    async def __play(self, game_state: GameStateEvent.DataType) -> None:
+
+        stats = self.__stats
+        succeeded = False
+
+        try:
+
+            await asyncio.sleep(self.__think_seconds)
+
+            cards, color_query = self.__choose_play(game_state)
+            self.__force_pass = False
+
+            self.__pending_play_version = game_state["version"]
+            self.__pending_play_timestamp = perf_counter()
+            status, _ = await send_request(
+                "POST",
+                self.__get_api_path(f"/player/{self.name}/play{color_query}"),
+                host=self.__host,
+                port=self.__port,
+                body=json.dumps([card["id"] for card in cards]).encode(),
+            )
+
+            stats.play_count += 1
+            succeeded = status == 200
+
+        except OSError:
+            pass
+
+        finally:
+            if not succeeded:
+                stats.play_error_count += 1
+                self.__pending_play_version = None
+                # the chosen card may be outdated, so pass instead
+                self.__force_pass = True
+                self.__acted_version = None
+            self.__busy = False
+            self.__act()
@@ -0,0 +1,99 @@
+import click
+
+from tuno.shared.constraints import MAX_PLAYER_CAPACITY, MIN_PLAYER_CAPACITY
+
+
+@click.command("loadtest")
+@click.option(
+    "-t",
+    "--target",
+    default=None,
+    help="Address of the server to test, e.g. localhost:5000. "
+    "(A local server is started if not given.)",
+)
+@click.option(
+    "--async",
+    "use_async",
+    is_flag=True,
+    help="Start the local server with the async backend.",
+)
+@click.option(
+    "-n",
+    "--players",
+    "player_count",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Number of synthetic players",
+)
+@click.option(
+    "--room-size",
+    type=click.IntRange(min=MIN_PLAYER_CAPACITY, max=MAX_PLAYER_CAPACITY),
+    default=4,
+    show_default=True,
+    help="Number of players per room",
+)
+@click.option(
+    "-d",
+    "--duration",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60,
+    show_default=True,
+    help="Duration of the test in seconds (after all players connect)",
+)
+@click.option(
+    "--think-time",
+    type=click.FloatRange(min=0),
+    default=0.1,
+    show_default=True,
+    help="Seconds before each play",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=5,
+    show_default=True,
+    help="Seconds between progress reports",
+)
+@click.option(
+    "--seed",
+    default="tuno",
+    show_default=True,
+    help="Seed of the players' choices",
+)
+def start_loadtest(
+    target: str | None,
+    use_async: bool,
+    player_count: int,
+    room_size: int,
+    duration: float,
+    think_time: float,
+    interval: float,
+    seed: str,
+) -> None:
+    """Load test a server with synthetic players.
+
+    Players subscribe through SSE and play like bots through the HTTP API,
+    in rooms of `--room-size` players. Progress is printed as JSON lines
+    every `--interval` seconds, followed by a summary line including the
+    connect rate, play-to-game-state latencies, late heartbeats and, for
+    local servers, server CPU/RSS. (Server stats require the "loadtest"
+    extra: pipx install "tuno[loadtest]")
+    """
+
+    import asyncio
+
+    from .run_loadtest import run_loadtest
+
+    asyncio.run(
+        run_loadtest(
+            target=target,
+            use_async=use_async,
+            player_count=player_count,
+            room_size=room_size,
+            duration_seconds=duration,
+            think_seconds=think_time,
+            interval_seconds=interval,
+            seed=seed,
+        )
+    )
@@ -0,0 +1,129 @@
+"""A minimal asyncio HTTP/1.1 client, which is enough for talking to the
+game server and keeps thousands of synthetic players on a single thread."""
+
+import asyncio
+
+HEADER_END = b"\r\n\r\n"
+MESSAGE_END = b"\n\n"
+
+
+def format_request(
+    method: str,
+    path: str,
+    *,
+    host: str,
+    port: int,
+    headers: dict[str, str],
+    body: bytes = b"",
+) -> bytes:
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}:{port}"]
+    lines.extend(f"{key}: {value}" for key, value in headers.items())
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+async def send_request(
+    method: str,
+    path: str,
+    *,
+    host: str,
+    port: int,
+    body: bytes = b"",
+) -> tuple[int, bytes]:
+    """Send a request on a new connection and return the status code
+    and the response body."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            format_request(
+                method,
+                path,
+                host=host,
+                port=port,
+                headers={"Connection": "close", "Content-Type": "application/json"},
+                body=body,
+            )
+        )
+        response = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, response_body = response.partition(HEADER_END)
+    status_line = head.split(b"\r\n", 1)[0]
+    return int(status_line.split()[1]), response_body
+
+
+class EventStream:
+    """An SSE response stream, which yields raw messages (including
+    comments, i.e. heartbeats)."""
+
+    __reader: asyncio.StreamReader
+    __writer: asyncio.StreamWriter
+    __chunked: bool
+    __buffer: bytes
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        chunked: bool,
+    ) -> None:
+        self.__reader = reader
+        self.__writer = writer
+        self.__chunked = chunked
+        self.__buffer = b""
+
+    @classmethod
+    async def open(cls, path: str, *, host: str, port: int) -> "EventStream":
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(
+            format_request(
+                "GET",
+                path,
+                host=host,
+                port=port,
+                headers={"Accept": "text/event-stream"},
+            )
+        )
+
+        head = await reader.readuntil(HEADER_END)
+        if not head.startswith(b"HTTP/1.1 200"):
+            writer.close()
+            raise ConnectionError(head.split(b"\r\n", 1)[0].decode())
+
+        return cls(
+            reader,
+            writer,
+            chunked=(b"transfer-encoding: chunked" in head.lower()),
+        )
+
+    def close(self) -> None:
+        self.__writer.close()
+
+    async def __read(self) -> bytes:
+
+        reader = self.__reader
+
+        if self.__chunked:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            data = (await reader.readexactly(size + 2))[:-2] if size else b""
+        else:
+            data = await reader.read(65536)
+
+        if not data:
+            raise ConnectionError("Stream ended.")
+
+        return data
+
+    async def read_messages(self) -> list[bytes]:
+        """Wait for and return complete messages."""
+        while True:
+            *messages, self.__buffer = (self.__buffer + await self.__read()).split(
+                MESSAGE_END
+            )
+            if messages:
+                return messages
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+from time import perf_counter
+from typing import Any
+
+import click
+
+from .LoadTestStats import LoadTestStats, get_percentiles
+from .ResourceMonitor import ResourceMonitor
+from .SyntheticPlayer import SyntheticPlayer
+
+LOCAL_HOST = "127.0.0.1"
+SERVER_START_TIMEOUT_SECONDS = 10
+CONNECT_TIMEOUT_SECONDS = 120
+MAX_PENDING_CONNECTIONS = 100  # so that the listen backlog won't overflow
+
+
+def get_free_port() -> int:
+    with socket.socket() as server_socket:
+        server_socket.bind((LOCAL_HOST, 0))
+        port: int = server_socket.getsockname()[1]
+        return port
+
+
+async def wait_for_server(host: str, port: int) -> None:
+    deadline = perf_counter() + SERVER_START_TIMEOUT_SECONDS
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if perf_counter() > deadline:
+                raise click.ClickException("The server did not start in time.")
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+
+def echo_json(data: dict[str, Any]) -> None:
+    click.echo(json.dumps(data))
+
+
+async def run_loadtest(
+    *,
+    target: str | None,
+    use_async: bool,
+    player_count: int,
+    room_size: int,
+    duration_seconds: float,
+    think_seconds: float,
+    interval_seconds: float,
+    seed: str,
+) -> None:
+
+    server: subprocess.Popen[bytes] | None = None
+    monitor: ResourceMonitor | None = None
+
+    if target is None:
+        host = LOCAL_HOST
+        port = get_free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "tuno", "server", "-l", "ERROR"]
+            + ["--host", host, "-p", str(port), "-c", str(room_size)]
+            + (["--async"] if use_async else []),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        host, _, port_string = target.rpartition(":")
+        port = int(port_string)
+
+    stats = LoadTestStats()
+    tasks: list[asyncio.Task[None]] = []
+
+    try:
+
+        await wait_for_server(host, port)
+
+        if server:
+            try:
+                monitor = ResourceMonitor(server.pid)
+            except ImportError:
+                click.echo(
+                    'Install the "loadtest" extra for server CPU/RSS stats.',
+                    err=True,
+                )
+
+        # -- connect players --
+        players: list[SyntheticPlayer] = []
+        for i in range(player_count):
+            room_index, index_in_room = divmod(i, room_size)
+            players.append(
+                SyntheticPlayer(
+                    name=f"p{i}",
+                    room_id=f"loadtest{room_index}",
+                    room_size=min(room_size, player_count - room_index * room_size),
+                    is_leader=(index_in_room == 0),
+                    host=host,
+                    port=port,
+                    think_seconds=think_seconds,
+                    seed=seed,
+                    stats=stats,
+                )
+            )
+
+        timestamp_begin = perf_counter()
+        deadline = timestamp_begin + CONNECT_TIMEOUT_SECONDS
+        for player in players:
+            while len(tasks) - stats.connected_count >= MAX_PENDING_CONNECTIONS:
+                await asyncio.sleep(0.01)
+            tasks.append(asyncio.create_task(player.run()))
+        while stats.connected_count < player_count:
+            if perf_counter() > deadline:
+                click.echo("Some players failed to connect in time.", err=True)
+                break
+            await asyncio.sleep(0.01)
+
+        connect_seconds = perf_counter() - timestamp_begin
+        connect_report = {
+            "connect_seconds": round(connect_seconds, 3),
+            "connect_rate": round(stats.connected_count / connect_seconds, 1),
+        }
+        echo_json({"connected": stats.connected_count, **connect_report})
+
+        # -- play --
+        timestamp_begin = perf_counter()
+        last_play_count = 0
+        elapsed_seconds = 0.0
+        while elapsed_seconds < duration_seconds:
+
+            await asyncio.sleep(
+                min(interval_seconds, duration_seconds - elapsed_seconds)
+            )
+            elapsed_seconds = perf_counter() - timestamp_begin
+
+            report: dict[str, Any] = {
+                "elapsed_seconds": round(elapsed_seconds, 1),
+                "connected": stats.connected_count,
+                "plays": stats.play_count - last_play_count,
+                "play_latency_ms": get_percentiles(stats.pop_interval_play_latencies()),
+                "late_heartbeats": stats.late_heartbeat_count,
+                "connection_drops": stats.connection_drop_count,
+            }
+            last_play_count = stats.play_count
+            if monitor:
+                cpu_percent, rss = monitor.sample(elapsed_seconds)
+                report["server_cpu_percent"] = cpu_percent
+                report["server_rss_mb"] = round(rss / 2**20, 1)
+            echo_json(report)
+
+        summary = {
+            "summary": True,
+            "players": player_count,
+            "room_size": room_size,
+            "duration_seconds": round(elapsed_seconds, 1),
+            **connect_report,
+            **stats.to_json(elapsed_seconds=elapsed_seconds),
+        }
+        if monitor:
+            summary.update(monitor.to_json())
+        echo_json(summary)
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if server:
+            server.terminate()
+            server.wait()
@@ -8,7 +8,14 @@ from tuno.shared.constraints import (
     MIN_PLAYER_CAPACITY,
 )
 
-from .config import DEFAULT_HOST, DEFAULT_PORT, ENV_KEY_LOG_LEVEL
+from .config import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    ENV_KEY_JOURNAL_DIR,
+    ENV_KEY_LOG_FILE,
+    ENV_KEY_LOG_LEVEL,
+    GRACEFUL_SHUTDOWN_TIMEOUT,
+)
 
 
 def create_app(*, log_level: LogLevel | None = None) -> Flask:
@@ -22,15 +29,20 @@ def create_app(*, log_level: LogLevel | None = None) -> Flask:
     if log_level:
         Logger.level = log_level
 
-    from .models.Game import game
+    from .models.GameRegistry import game_registry
     from .routes import load_routes
 
-    game.watcher_thread.start()
+    game_registry.start()
 
     app = Flask(__name__)
 
     blueprint = load_routes()
-    app.register_blueprint(blueprint, url_prefix="/api")
+    app.register_blueprint(blueprint, url_prefix="/api")  # default room
+    app.register_blueprint(
+        blueprint,
+        url_prefix="/api/rooms/<room_id>",
+        name="rooms",
+    )
 
     return app
 
@@ -72,23 +84,89 @@ def create_app(*, log_level: LogLevel | None = None) -> Flask:
     show_choices=True,
     help="Log level",
 )
+@click.option(
+    "--log-file",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar=ENV_KEY_LOG_FILE,
+    show_envvar=True,
+    help="Also append logs to this file as JSON lines",
+)
+@click.option(
+    "--journal",
+    "journal_dir",
+    type=click.Path(file_okay=False, writable=True),
+    envvar=ENV_KEY_JOURNAL_DIR,
+    show_envvar=True,
+    help="Persist games in this directory and recover them on startup",
+)
+@click.option(
+    "--async",
+    "use_async",
+    is_flag=True,
+    help="Use the asyncio backend, which scales to many more subscribers. "
+    '(Requires the "async" extra: pipx install "tuno[async]")',
+)
+@click.option(
+    "--profile-locks",
+    is_flag=True,
+    help="Record contention per lock site and detect lock-order inversions. "
+    "(Hotspots are logged on exit and exposed at /api/metrics.)",
+)
 def start_server(
     host: str,
     port: int,
     capacity: int,
     log_level: str,
+    log_file: str | None,
+    journal_dir: str | None,
+    use_async: bool,
+    profile_locks: bool,
 ) -> None:
     """Start game server."""
 
-    from .models.Game import game
+    if log_file:
+        Logger.writer.open_json_file(log_file)
+
+    if profile_locks:
+        # before any lock is created
+        from .utils.enable_lock_profiling import enable_lock_profiling
+
+        Logger.level = LogLevel[log_level]
+        enable_lock_profiling()
 
-    game.update_rules(
+    from .models.GameRegistry import game_registry
+
+    game_registry.update_initial_rules(
         {
             "player_capacity": capacity,
         },
-        operator_name="server setup",
-        operator_is_player=False,
     )
 
+    if journal_dir:
+        Logger.level = LogLevel[log_level]
+        game_registry.enable_journal(journal_dir)
+
     app = create_app(log_level=LogLevel[log_level])
-    app.run(host=host, port=port)
+
+    if use_async:
+
+        try:
+            import uvicorn
+        except ImportError:
+            raise click.UsageError(
+                'The async backend requires the "async" extra to be installed.'
+            )
+
+        from .asgi import create_asgi_app
+
+        uvicorn.run(
+            create_asgi_app(app),
+            host=host,
+            port=port,
+            log_level=("warning" if Logger.level > LogLevel.INFO else "info"),
+            # subscriptions never end by themselves
+            timeout_graceful_shutdown=round(GRACEFUL_SHUTDOWN_TIMEOUT.total_seconds()),
+        )
+
+    else:
+        app.run(host=host, port=port)
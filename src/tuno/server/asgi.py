@@ -0,0 +1,415 @@
+import asyncio
+from collections.abc import Awaitable, Callable, MutableMapping
+from functools import partial
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import parse_qsl, urlencode
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_etags
+
+from tuno.server.config import (
+    DEFAULT_ROOM_ID,
+    SUBSCRIPTION_SLOW_WRITE_THRESHOLD,
+    WSGI_WORKER_COUNT,
+)
+from tuno.server.exceptions import ApiException
+from tuno.server.metrics import SSE_SLOW_WRITES
+from tuno.server.utils.checkers import (
+    check_event_encoding,
+    check_player_name,
+    check_room_id,
+)
+from tuno.server.utils.conditional_requests import (
+    get_cards_etag,
+    get_game_state_etag,
+    parse_wait_seconds,
+)
+from tuno.server.utils.Logger import Logger
+from tuno.server.utils.StreamCompressor import (
+    ContentEncoding,
+    negotiate_content_encoding,
+)
+from tuno.server.utils.Subscription import HEARTBEAT, Subscription
+from tuno.shared.event_encoding import DEFAULT_EVENT_ENCODING
+from tuno.shared.ThreadLockContext import ThreadLockContext
+
+if TYPE_CHECKING:
+    from tuno.server.models.Game import Game
+
+type Scope = MutableMapping[str, Any]
+type Message = MutableMapping[str, Any]
+type Receive = Callable[[], Awaitable[Message]]
+type Send = Callable[[Message], Awaitable[None]]
+type AsgiApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+SUBSCRIPTION_ENDPOINT = "player_subscription"
+CONDITIONAL_ENDPOINTS = frozenset(("get_game_state", "get_player_cards"))
+
+logger = Logger(__name__)
+
+
+class WakeupBatcher:
+    """Wake up coroutines from other threads in batches.
+
+    A broadcast wakes up every subscriber of a game at once, so the
+    wake-ups are collected and handed over to the event loop together,
+    instead of interrupting the event loop once per subscriber.
+    """
+
+    event_loop: asyncio.AbstractEventLoop
+
+    __lock: Lock
+    __pending_events: list[asyncio.Event]
+
+    def __init__(self, event_loop: asyncio.AbstractEventLoop) -> None:
+        self.event_loop = event_loop
+        self.__lock = Lock()
+        self.__pending_events = []
+
+    def wake(self, event: asyncio.Event) -> None:
+        """Set the event in the event loop. (Thread-safe.)"""
+        with ThreadLockContext(self.__lock):
+            self.__pending_events.append(event)
+            if len(self.__pending_events) > 1:
+                return  # flush already scheduled
+        if not self.event_loop.is_closed():
+            self.event_loop.call_soon_threadsafe(self.__flush)
+
+    def __flush(self) -> None:
+        with ThreadLockContext(self.__lock):
+            events = self.__pending_events
+            self.__pending_events = []
+        for event in events:
+            event.set()
+
+
+def create_asgi_app(flask_app: Flask) -> AsgiApp:
+    """Wrap the Flask app into an ASGI app for the async backend.
+
+    Subscriptions are served by coroutines, so that idle subscribers don't
+    occupy any thread, and so are the waits of long-polling conditional
+    requests. Other requests are short and thus simply forwarded to the
+    Flask app running in a thread pool.
+    """
+
+    from a2wsgi import WSGIMiddleware
+
+    wsgi_app = cast(
+        AsgiApp,
+        WSGIMiddleware(
+            flask_app,  # type: ignore[arg-type]
+            workers=WSGI_WORKER_COUNT,
+        ),
+    )
+    url_adapter = flask_app.url_map.bind("")
+    wakeup_batcher: WakeupBatcher | None = None
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+
+        nonlocal wakeup_batcher
+        if wakeup_batcher is None:
+            wakeup_batcher = WakeupBatcher(asyncio.get_running_loop())
+
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if (scope["type"] == "http") and (scope["method"] == "GET"):
+            try:
+                endpoint, view_args = url_adapter.match(scope["path"], "GET")
+            except HTTPException:
+                pass  # let Flask respond
+            else:
+                endpoint_name = endpoint.rsplit(".", 1)[-1]
+                if endpoint_name == SUBSCRIPTION_ENDPOINT:
+                    await serve_subscription(
+                        room_id=view_args.get("room_id"),
+                        player_name=view_args["player_name"],
+                        last_event_id=get_header(scope, b"last-event-id"),
+                        content_encoding=negotiate_content_encoding(
+                            get_header(scope, b"accept-encoding")
+                        ),
+                        event_encoding=dict(
+                            parse_qsl(scope["query_string"].decode("latin-1"))
+                        ).get("encoding", DEFAULT_EVENT_ENCODING),
+                        wakeup_batcher=wakeup_batcher,
+                        receive=receive,
+                        send=send,
+                    )
+                    return
+                if endpoint_name in CONDITIONAL_ENDPOINTS:
+                    scope = await wait_for_change(
+                        scope,
+                        room_id=view_args.get("room_id"),
+                        player_name=view_args.get("player_name"),
+                        wakeup_batcher=wakeup_batcher,
+                    )
+
+        await wsgi_app(scope, receive, send)
+
+    return app
+
+
+def get_header(scope: Scope, name: bytes) -> str | None:
+    """Get the first value of the header (`name` in lower case)."""
+    headers: list[tuple[bytes, bytes]] = scope["headers"]
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def subscribe(
+    room_id: str | None,
+    player_name: str,
+    *,
+    last_event_id: str | None,
+    content_encoding: ContentEncoding | None,
+    event_encoding: str,
+) -> tuple[Subscription, bytes]:
+    """Create a subscription and get initial states to be sent.
+    (Blocking, so it should be run in a thread.)"""
+
+    from tuno.server.models.GameRegistry import game_registry
+
+    if room_id is not None:
+        check_room_id(room_id)
+    check_player_name(player_name)
+    checked_event_encoding = check_event_encoding(event_encoding)
+
+    game = game_registry.get_game(room_id or DEFAULT_ROOM_ID)
+    player = game.get_player(player_name, allow_creation=True)
+    subscription = Subscription(
+        game,
+        player,
+        last_event_id=last_event_id,
+        content_encoding=content_encoding,
+        event_encoding=checked_event_encoding,
+    )
+
+    return subscription, subscription.get_initial_states()
+
+
+def get_etag_getter(
+    room_id: str | None,
+    player_name: str | None,
+) -> tuple["Game", Callable[[], str]]:
+    """Get the game and the ETag getter of a conditional request.
+    (Blocking, so it should be run in a thread.)"""
+
+    from tuno.server.models.GameRegistry import game_registry
+
+    if room_id is not None:
+        check_room_id(room_id)
+
+    game = game_registry.find_game(room_id or DEFAULT_ROOM_ID)
+    if player_name is None:
+        return game, partial(get_game_state_etag, game)
+
+    check_player_name(player_name)
+    player = game.get_player(player_name)
+    return game, partial(get_cards_etag, game, player)
+
+
+async def wait_for_change(
+    scope: Scope,
+    *,
+    room_id: str | None,
+    player_name: str | None,
+    wakeup_batcher: WakeupBatcher,
+) -> Scope:
+    """Wait for the long-poll of a conditional request, if any, and return
+    the scope without `wait`, which is then answered by Flask right away.
+    (Invalid requests are left to Flask to report errors.)"""
+
+    query = parse_qsl(scope["query_string"].decode("latin-1"))
+    if not any(key == "wait" for key, _ in query):
+        return scope
+    if_none_match = get_header(scope, b"if-none-match") or ""
+
+    try:
+        wait_seconds = parse_wait_seconds(dict(query)["wait"])
+        game, get_etag = await asyncio.to_thread(get_etag_getter, room_id, player_name)
+    except ApiException:
+        return scope
+
+    etags = parse_etags(if_none_match)
+    if etags.contains(get_etag()):
+
+        wake_event = asyncio.Event()
+
+        def waker() -> None:  # called in producer threads
+            if not wake_event.is_set():
+                wakeup_batcher.wake(wake_event)
+
+        game.changes.add_waker(waker)
+        try:
+            deadline = monotonic() + wait_seconds
+            while True:
+                wake_event.clear()  # before checking, to not miss any change
+                remaining_seconds = deadline - monotonic()
+                if (remaining_seconds <= 0) or not etags.contains(get_etag()):
+                    break
+                try:
+                    await asyncio.wait_for(wake_event.wait(), remaining_seconds)
+                except TimeoutError:
+                    break
+        finally:
+            game.changes.remove_waker(waker)
+
+    query_string = urlencode([(key, value) for key, value in query if key != "wait"])
+    return {**scope, "query_string": query_string.encode("latin-1")}
+
+
+async def serve_subscription(
+    *,
+    room_id: str | None,
+    player_name: str,
+    last_event_id: str | None,
+    content_encoding: ContentEncoding | None,
+    event_encoding: str,
+    wakeup_batcher: WakeupBatcher,
+    receive: Receive,
+    send: Send,
+) -> None:
+
+    SLOW_WRITE_THRESHOLD_SECONDS = SUBSCRIPTION_SLOW_WRITE_THRESHOLD.total_seconds()
+
+    try:
+        subscription, initial_states = await asyncio.to_thread(
+            subscribe,
+            room_id,
+            player_name,
+            last_event_id=last_event_id,
+            content_encoding=content_encoding,
+            event_encoding=event_encoding,
+        )
+    except ApiException as exception:
+        logger.warn(f"ApiException({exception.http_code}): {exception.message}")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": exception.http_code,
+                "headers": [(b"content-type", b"text/html; charset=utf-8")],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": exception.message.encode(),
+            }
+        )
+        return
+
+    player = subscription.player
+    message_queue = player.message_queue
+
+    wake_event = asyncio.Event()
+
+    def waker() -> None:  # called in producer threads
+        if not wake_event.is_set():
+            wakeup_batcher.wake(wake_event)
+
+    disconnected = False
+
+    async def watch_disconnection() -> None:
+        nonlocal disconnected
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected = True
+        wake_event.set()
+
+    async def write(chunk: bytes, *, more_body: bool = True) -> None:
+        with subscription.message_context(chunk, final=not more_body) as data:
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": data,
+                    "more_body": more_body,
+                }
+            )
+
+    headers = [
+        (b"content-type", b"text/event-stream; charset=utf-8"),
+        (b"vary", b"Accept-Encoding"),
+    ]
+    if content_encoding is not None:
+        headers.append((b"content-encoding", content_encoding.encode()))
+
+    message_queue.add_waker(waker)
+    disconnection_watcher = asyncio.create_task(watch_disconnection())
+
+    try:
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": headers,
+            }
+        )
+
+        # send first heartbeat
+        await write(HEARTBEAT)
+        logger.info(f"Connected with {subscription!r}.")
+
+        # send initial states
+        await write(initial_states)
+        logger.debug(lambda: f"Sent initial states to {subscription!r}.")
+
+        # message loop: sleep until new messages arrive or
+        # a heartbeat is due, then send all pending messages at once
+        while True:
+
+            if disconnected:
+                return
+
+            wake_event.clear()
+            events = message_queue.drain(0, is_active=lambda: subscription.active)
+
+            if not subscription.active:
+                break
+
+            if not events:
+                try:
+                    await asyncio.wait_for(
+                        wake_event.wait(),
+                        subscription.get_heartbeat_timeout(),
+                    )
+                except TimeoutError:
+                    await write(HEARTBEAT)
+                continue
+
+            chunk, end_of_connection = subscription.encode_events(events)
+
+            timestamp_begin = monotonic()
+            await write(chunk, more_body=not end_of_connection)
+            write_duration = monotonic() - timestamp_begin
+            if write_duration >= SLOW_WRITE_THRESHOLD_SECONDS:
+                SSE_SLOW_WRITES.inc()
+                logger.warn(
+                    f"Slow write to {subscription!r}: "
+                    f"{len(events)} event(s) took {write_duration:.3f}s."
+                )
+
+            if end_of_connection:
+                return
+
+        await write(subscription.get_final_message(), more_body=False)
+        logger.info(f"Subscription stopped for {subscription!r}.")
+
+    except OSError:
+        pass  # disconnected while writing
+
+    finally:
+        message_queue.remove_waker(waker)
+        disconnection_watcher.cancel()
+        await asyncio.to_thread(subscription.close)
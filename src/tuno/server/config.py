@@ -4,21 +4,40 @@ from typing import Final
 # -- Server Config --
 DEFAULT_HOST: Final = "0.0.0.0"
 DEFAULT_PORT: Final = 5000
+WSGI_WORKER_COUNT: Final = 16  # threads serving non-subscription requests (async)
+GRACEFUL_SHUTDOWN_TIMEOUT = timedelta(seconds=1)  # before closing subscriptions
+
+# -- Profiling Config --
+LOCK_PROFILE_TOP_N: Final = 20  # lock sites reported by `--profile-locks`
 
 # -- Environment Config --
 ENV_KEY_LOG_LEVEL: str = "TUNO_LOG_LEVEL"
+ENV_KEY_LOG_FILE: str = "TUNO_LOG_FILE"
+ENV_KEY_JOURNAL_DIR: str = "TUNO_JOURNAL_DIR"
 
 # -- Connection Config --
 SUBSCRIPTION_TOKEN_BYTES: Final = 4  # each byte becomes 2 hex digits
-SUBSCRIPTION_LOOP_INTERVAL = timedelta(milliseconds=200)
-SUBSCRIPTION_LOOP_SLOW_THRESHOLD: Final = 3
-MAX_MESSAGES_PER_LOOP: Final = 5
+SUBSCRIPTION_SLOW_WRITE_THRESHOLD = timedelta(seconds=1)
 HEARTBEAT_GAP = timedelta(seconds=2)
 PLAYER_TIMEOUT = timedelta(seconds=5)
+LONG_POLL_MAX_WAIT = timedelta(seconds=30)  # of conditional REST requests
+SSE_COMPRESSION_LEVEL: Final = 6  # of zlib, if negotiated by `Accept-Encoding`
+SSE_COMPRESSION_WINDOW_BITS: Final = 12  # a 4 KiB window
+SSE_COMPRESSION_MEMORY_LEVEL: Final = 5
 
 # -- Game Config --
-GAME_WATCHER_INTERVAL = timedelta(seconds=1)
-GAME_WATCHER_SKIP_THRESHOLD: Final = 3
+GAME_STATE_KEYFRAME_INTERVAL: Final = 32  # send full state every N versions
+GAME_DELIVERY_BACKLOG_LIMIT: Final = 64  # events committed but not delivered
+GAME_EVENT_LOG_SIZE: Final = 128  # recent events kept for resumed subscriptions
+
+# -- Room Config --
+DEFAULT_ROOM_ID: Final = "default"
+MAX_ROOM_COUNT: Final = 1000
+ROOM_IDLE_TIMEOUT = timedelta(minutes=5)
+ROOM_EVICTION_INTERVAL = timedelta(seconds=30)
+
+# -- Journal Config --
+JOURNAL_SNAPSHOT_INTERVAL = timedelta(minutes=1)  # if anything is journaled
 
 # -- Player Config --
-PLAYER_MESSAGE_QUEUE_SIZE: Final = 20
+PLAYER_MESSAGE_QUEUE_SIZE: Final = 20  # pending notifications before resync
@@ -2,6 +2,7 @@ from collections.abc import Iterable
 
 from tuno.shared.constraints import MIN_PLAYER_CAPACITY
 from tuno.shared.deck import BasicCardColor, Card
+from tuno.shared.event_encoding import EVENT_ENCODINGS
 
 
 class ApiException(Exception):
@@ -31,6 +32,47 @@ class InvalidPlayerNameException(ApiException):
         )
 
 
+class InvalidRoomIdException(ApiException):
+    def __init__(self, room_id: str) -> None:
+        super().__init__(
+            400,
+            f"Invalid room id: {room_id}",
+        )
+
+
+class InvalidWaitException(ApiException):
+    def __init__(self, wait: str) -> None:
+        super().__init__(
+            400,
+            f"Invalid wait (expected non-negative seconds): {wait}",
+        )
+
+
+class InvalidEventEncodingException(ApiException):
+    def __init__(self, encoding: str) -> None:
+        super().__init__(
+            400,
+            f"Invalid event encoding (expected one of "
+            f"{', '.join(EVENT_ENCODINGS)}): {encoding}",
+        )
+
+
+class TooManyRoomsException(ApiException):
+    def __init__(self, room_id: str) -> None:
+        super().__init__(
+            503,
+            f"Cannot create room {room_id}: too many rooms on this server.",
+        )
+
+
+class RoomNotFoundException(ApiException):
+    def __init__(self, room_id: str) -> None:
+        super().__init__(
+            404,
+            f"Room not found: {room_id}",
+        )
+
+
 class PlayerNotFoundException(ApiException):
     def __init__(self, player_name: str) -> None:
         super().__init__(
@@ -0,0 +1,315 @@
+"""Server metrics exposed in the Prometheus text format.
+
+Metrics are kept in plain counters and fixed-bucket histograms, so that
+recording is cheap enough to be always on. (Recording takes the metric
+locks directly instead of through `ThreadLockContext`, which costs more
+than the recording itself.) Gauges that can be derived
+from the games (e.g. queue depths) are computed on scrape instead.
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from threading import Lock
+from typing import TYPE_CHECKING, Final
+
+from tuno.server.config import LOCK_PROFILE_TOP_N
+from tuno.shared.ThreadLockContext import ThreadLockContext, get_lock_profiler
+
+if TYPE_CHECKING:
+    from tuno.server.models.GameRegistry import GameRegistry
+
+type Labels = tuple[str, ...]
+
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.00001,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_labels(label_names: Sequence[str], label_values: Labels) -> str:
+    if not label_names:
+        return ""
+    pairs = (
+        f'{name}="{escape_label_value(value)}"'
+        for name, value in zip(label_names, label_values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_header(name: str, metric_type: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+class Counter:
+
+    name: str
+    help_text: str
+    value: float
+
+    __lock: Lock
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        self.__lock = Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self.__lock:
+            self.value += amount
+
+    def render(self) -> list[str]:
+        return format_header(self.name, "counter", self.help_text) + [
+            f"{self.name} {self.value}"
+        ]
+
+
+class Histogram:
+    """A histogram with fixed buckets, optionally split by labels."""
+
+    name: str
+    help_text: str
+    buckets: tuple[float, ...]
+    label_names: tuple[str, ...]
+
+    __series: dict[Labels, list[float]]  # bucket counts + [sum, count]
+    __lock: Lock
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self.__series = {}
+        self.__lock = Lock()
+
+    def observe(self, value: float, label_values: Labels = ()) -> None:
+        bucket_index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(label_values)
+            if series is None:
+                series = self.__series[label_values] = [0] * (len(self.buckets) + 3)
+            series[bucket_index] += 1  # the last bucket is +Inf
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+
+        name = self.name
+        lines = format_header(name, "histogram", self.help_text)
+
+        with ThreadLockContext(self.__lock):
+            series_items = [
+                (labels, series.copy()) for labels, series in self.__series.items()
+            ]
+
+        for label_values, series in series_items:
+            labels = format_labels(self.label_names, label_values)
+            labels_prefix = labels[:-1] + "," if labels else "{"
+            cumulative_count = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative_count += count
+                lines.append(
+                    f'{name}_bucket{labels_prefix}le="{bound}"}} {cumulative_count:g}'
+                )
+            lines.append(f"{name}_sum{labels} {series[-2]}")
+            lines.append(f"{name}_count{labels} {series[-1]:g}")
+
+        return lines
+
+
+# -- games --
+GAME_LOCK_WAIT = Histogram(
+    "tuno_game_lock_wait_seconds",
+    "Time spent waiting for game locks.",
+)
+GAME_LOCK_HOLD = Histogram(
+    "tuno_game_lock_hold_seconds",
+    "Time game locks were held for.",
+)
+BROADCAST_DURATION = Histogram(
+    "tuno_broadcast_duration_seconds",
+    "Time spent fanning out an event to the players of a game.",
+)
+SCHEDULER_LAG = Histogram(
+    "tuno_scheduler_lag_seconds",
+    "Delay of scheduled tasks (bot plays, connection checks...) "
+    "past their deadlines.",
+)
+SCHEDULER_TASK_DURATION = Histogram(
+    "tuno_scheduler_task_duration_seconds",
+    "Time spent running scheduled tasks.",
+)
+
+# -- subscriptions --
+SSE_FRAMES_SENT = Counter(
+    "tuno_sse_frames_sent_total",
+    "Chunks written to subscribers (including heartbeats).",
+)
+SSE_BYTES_SENT = Counter(
+    "tuno_sse_bytes_sent_total",
+    "Bytes written to subscribers.",
+)
+SSE_HEARTBEATS_SENT = Counter(
+    "tuno_sse_heartbeats_sent_total",
+    "Heartbeats written to subscribers.",
+)
+SSE_SLOW_WRITES = Counter(
+    "tuno_sse_slow_writes_total",
+    "Writes to subscribers exceeding SUBSCRIPTION_SLOW_WRITE_THRESHOLD.",
+)
+MESSAGE_QUEUE_COALESCED = Counter(
+    "tuno_message_queue_coalesced_total",
+    "Queued events superseded by newer ones of the same kind.",
+)
+MESSAGE_QUEUE_DROPPED = Counter(
+    "tuno_message_queue_dropped_total",
+    "Queued events dropped because the message queue was full.",
+)
+SUBSCRIPTION_RESUMES = Counter(
+    "tuno_subscription_resumes_total",
+    "Subscriptions resumed with missed events (by `Last-Event-ID`).",
+)
+SUBSCRIPTION_RESYNCS = Counter(
+    "tuno_subscription_resyncs_total",
+    "Full states sent to subscribers whose message queues overflowed.",
+)
+
+# -- requests --
+REQUEST_DURATION = Histogram(
+    "tuno_request_duration_seconds",
+    "Time spent handling API requests (until the response is ready).",
+    label_names=("method", "route"),
+)
+
+METRICS: Final[tuple[Counter | Histogram, ...]] = (
+    GAME_LOCK_WAIT,
+    GAME_LOCK_HOLD,
+    BROADCAST_DURATION,
+    SCHEDULER_LAG,
+    SCHEDULER_TASK_DURATION,
+    SSE_FRAMES_SENT,
+    SSE_BYTES_SENT,
+    SSE_HEARTBEATS_SENT,
+    SSE_SLOW_WRITES,
+    MESSAGE_QUEUE_COALESCED,
+    MESSAGE_QUEUE_DROPPED,
+    SUBSCRIPTION_RESUMES,
+    SUBSCRIPTION_RESYNCS,
+    REQUEST_DURATION,
+)
+
+
+def render_game_gauges(game_registry: "GameRegistry") -> Iterable[str]:
+
+    games = game_registry.get_games()
+
+    yield from format_header("tuno_rooms", "gauge", "Rooms hosted.")
+    yield f"tuno_rooms {len(games)}"
+
+    subscription_lines: list[str] = []
+    queue_depth_lines: list[str] = []
+    for game in games:
+        room_labels = format_labels(("room",), (game.tag,))
+        subscription_count = 0
+        for player in game.get_players():
+            if player.is_bot:
+                continue
+            if player.subscription_token:
+                subscription_count += 1
+            player_labels = format_labels(("room", "player"), (game.tag, player.name))
+            queue_depth_lines.append(
+                f"tuno_message_queue_depth{player_labels} {len(player.message_queue)}"
+            )
+        subscription_lines.append(
+            f"tuno_active_subscriptions{room_labels} {subscription_count}"
+        )
+
+    yield from format_header(
+        "tuno_active_subscriptions",
+        "gauge",
+        "Active subscriptions per room.",
+    )
+    yield from subscription_lines
+    yield from format_header(
+        "tuno_message_queue_depth",
+        "gauge",
+        "Events waiting in the message queue of each player.",
+    )
+    yield from queue_depth_lines
+
+
+def render_lock_profile() -> Iterable[str]:
+    """Render the hotspots recorded in the lock profiling mode."""
+
+    profiler = get_lock_profiler()
+    if profiler is None:
+        return
+
+    hotspots = profiler.get_hotspots(LOCK_PROFILE_TOP_N)
+    label_names = ("lock", "site")
+    for name, metric_type, help_text, attribute in (
+        (
+            "tuno_lock_site_acquisitions_total",
+            "counter",
+            "Acquisitions per lock site (top contended sites only).",
+            "acquisition_count",
+        ),
+        (
+            "tuno_lock_site_contended_total",
+            "counter",
+            "Acquisitions which had to wait per lock site.",
+            "contended_count",
+        ),
+        (
+            "tuno_lock_site_wait_seconds_total",
+            "counter",
+            "Time spent waiting per lock site.",
+            "wait_seconds_total",
+        ),
+        (
+            "tuno_lock_site_hold_seconds_total",
+            "counter",
+            "Time locks were held per lock site.",
+            "hold_seconds_total",
+        ),
+    ):
+        yield from format_header(name, metric_type, help_text)
+        for stats in hotspots:
+            labels = format_labels(label_names, (stats.lock_name, stats.site))
+            yield f"{name}{labels} {getattr(stats, attribute)}"
+
+    yield from format_header(
+        "tuno_lock_order_inversions",
+        "gauge",
+        "Pairs of locks found acquired in both orders.",
+    )
+    yield f"tuno_lock_order_inversions {len(profiler.get_inversions())}"
+
+
+def render_metrics(game_registry: "GameRegistry") -> str:
+    lines = list(render_game_gauges(game_registry))
+    lines.extend(render_lock_profile())
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
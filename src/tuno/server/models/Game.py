@@ -1,12 +1,18 @@
-from collections.abc import Mapping, Sequence
-from random import shuffle
-from threading import RLock, Thread
-from time import monotonic
-from typing import Literal, assert_never
+from collections import deque
+from collections.abc import Callable, Generator, Mapping, Sequence
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from random import Random, getrandbits
+from secrets import token_hex
+from threading import Lock, get_ident
+from time import monotonic, perf_counter
+from typing import Any, Literal, NamedTuple, cast
 
 from tuno.server.config import (
-    GAME_WATCHER_INTERVAL,
-    GAME_WATCHER_SKIP_THRESHOLD,
+    GAME_DELIVERY_BACKLOG_LIMIT,
+    GAME_EVENT_LOG_SIZE,
+    GAME_STATE_KEYFRAME_INTERVAL,
     PLAYER_TIMEOUT,
 )
 from tuno.server.exceptions import (
@@ -20,60 +26,170 @@ from tuno.server.exceptions import (
     PlayerNotFoundException,
     RuleUpdateOnStartedGameException,
 )
+from tuno.server.metrics import BROADCAST_DURATION, GAME_LOCK_HOLD, GAME_LOCK_WAIT
+from tuno.server.utils.ChangeNotifier import ChangeNotifier
 from tuno.server.utils.create_deck import create_deck
 from tuno.server.utils.format_optional_operator import format_optional_operator
+from tuno.server.utils.Journal import (
+    GameSnapshot,
+    Journal,
+    JournalAction,
+    JournalEntry,
+    PlayerSnapshot,
+)
 from tuno.server.utils.Logger import Logger
+from tuno.server.utils.MeteredRLock import MeteredRLock
+from tuno.server.utils.reshuffle_pile import reshuffle_pile
+from tuno.shared.card_codes import CARD_TYPES, CARDS, format_card_codes
+from tuno.shared.card_play_effects import CARD_PLAY_EFFECTS
 from tuno.shared.check_play import check_play
 from tuno.shared.constraints import MIN_PLAYER_CAPACITY
-from tuno.shared.deck import BasicCardColor, Card, Deck, format_card
-from tuno.shared.loop import loop
+from tuno.shared.deck import BasicCardColor
+from tuno.shared.game_state_patch import diff_game_state
 from tuno.shared.rules import GameRules, check_rule_update, create_game_rules
+from tuno.shared.Scheduler import ScheduledTask, Scheduler
 from tuno.shared.sse_events import (
     EndOfConnectionEvent,
     GameStateEvent,
+    GameStatePatchEvent,
     NotificationEvent,
     ServerSentEvent,
 )
-from tuno.shared.ThreadLockContext import ThreadLockContext
+from tuno.shared.ThreadLockContext import ThreadLockContext, name_lock
 
 from .Player import Player
 
+type Delivery = tuple[
+    ServerSentEvent | Callable[[], ServerSentEvent], tuple[Player, ...]
+]
+type LoggedEvent = tuple[int, int, ServerSentEvent, tuple[Player, ...]]
+# (seq, state version delivered up to seq, event, recipients)
 
-class Game:
 
-    tag: str = "default"  # TODO: maybe multiple games in one server someday
-    lock: RLock
-    watcher_thread: Thread
+class EventStreamStart(NamedTuple):
+    """Where a subscription starts in the event stream of a game."""
+
+    last_event_id: str  # of the last event delivered, or "" if none
+    missed_events: list[ServerSentEvent] | None  # None if not resumable
+    state_version: int  # that the subscriber had before the missed events
+
 
-    __players: list[Player]
+class Game:
+    """A game (room) and its players.
+
+    Mutations run in transactions holding the game lock, which publish
+    an immutable game state snapshot and record events to be sent. The
+    events are serialized and put into message queues only after the
+    lock is released, so that fan-out doesn't block other requests.
+    Readers take the players and the latest state without locking, and
+    may wait for changes of published states with `changes`.
+
+    Delivered events are numbered in the order of delivery, which is also
+    their order in every message queue, and the recent ones are kept in an
+    event log, so that a subscriber reconnecting with the id of the last
+    event it received can be sent only the events it missed.
+
+    If a journal is attached, each committed transaction appends the
+    action it started with (e.g. a play), so that the game can be rebuilt
+    by replaying the actions on top of a snapshot. Replays are
+    deterministic, as shuffles are seeded by the seed of each start.
+    """
+
+    tag: str
+    epoch: str  # distinguishes state versions of recreated games
+    lock: MeteredRLock
+    changes: ChangeNotifier  # notified after transactions publishing states
+    journal: Journal | None
+
+    __players: tuple[Player, ...]  # replaced on change, so readers need no lock
     __started: bool
     __rules: GameRules
-    __draw_pile: Deck
-    __discard_pile: Deck
+    __draw_pile: bytearray  # card codes, top at the end
+    __discard_pile: bytearray
     __current_player_index: int
     __direction: Literal[-1, 1]
-    __lead_card: Card | None
+    __lead_card: int | None  # card code
     __lead_color: BasicCardColor | None
     __draw_counter: int
     __skip_counter: int
+    __turn_count: int
+    __reshuffle_count: int
+    __winner_index: int
+    __state_version: int
+    __last_game_state_event: GameStateEvent | None
+    __cards_version: int  # shared by players, so kept unique within the game
+    __scheduler: Scheduler | None  # None for headless games
+    __bot_play_task: ScheduledTask | None
+    __bot_play_turn: tuple[int, Player] | None  # (turn_count, bot)
+    __last_active_timestamp: float
+    __transaction_depth: int  # only changed with the lock held
+    __transaction_owner: int  # thread id, or 0 if not in a transaction
+    __outbox: list[Delivery]  # events sent in the current transaction
+    __deliveries: deque[Delivery]  # events committed, in order
+    __delivery_lock: Lock
+    __event_seq: int  # of the last event delivered
+    __event_log: deque[LoggedEvent]  # recent events delivered, in order
+    __delivered_state_version: int
+    __changed: bool  # whether the current transaction published states
+    __seed: int  # of the last start
+    __journal_entry: tuple[JournalAction, dict[str, Any]] | None  # to commit
+    __journal_seq: int  # of the last action journaled or replayed
     __logger: Logger
 
-    def __init__(self) -> None:
-
-        self.__players = []
+    def __init__(
+        self,
+        tag: str,
+        *,
+        scheduler: Scheduler | None,
+        journal: Journal | None = None,
+    ) -> None:
+        """Create a game whose bots and connection checks are scheduled
+        by `scheduler`. If `scheduler` is `None`, the game is headless:
+        game states are not broadcast, and bots only play when
+        `play_as_bot()` is called. (Used for simulations.)"""
+
+        self.tag = tag
+        self.epoch = token_hex(4)
+        self.__players = ()
         self.__started = False
         self.__rules = create_game_rules()
-        self.__draw_pile = []
-        self.__discard_pile = []
+        self.__draw_pile = bytearray()
+        self.__discard_pile = bytearray()
         self.__current_player_index = -1
         self.__direction = 1
         self.__lead_card = None
         self.__lead_color = None
         self.__draw_counter = 0
         self.__skip_counter = 0
-        self.lock = RLock()
+        self.__turn_count = 0
+        self.__reshuffle_count = 0
+        self.__winner_index = -1
+        self.__state_version = 0
+        self.__last_game_state_event = None
+        self.__cards_version = 0
+        self.__scheduler = scheduler
+        self.__bot_play_task = None
+        self.__bot_play_turn = None
+        self.lock = name_lock(
+            MeteredRLock(wait_histogram=GAME_LOCK_WAIT, hold_histogram=GAME_LOCK_HOLD),
+            "game",
+        )
+        self.__last_active_timestamp = monotonic()
+        self.__transaction_depth = 0
+        self.__transaction_owner = 0
+        self.__outbox = []
+        self.__deliveries = deque()
+        self.__delivery_lock = Lock()
+        self.__event_seq = 0
+        self.__event_log = deque(maxlen=GAME_EVENT_LOG_SIZE)
+        self.__delivered_state_version = 0
+        self.changes = ChangeNotifier()
+        self.__changed = False
+        self.journal = journal
+        self.__seed = 0
+        self.__journal_entry = None
+        self.__journal_seq = 0
         self.__logger = Logger(f"{__name__}#{self.tag}")
-        self.watcher_thread = Thread(target=self.watcher_loop, daemon=True)
 
         self.__logger.debug(f"game#{self.tag} created")
 
@@ -81,17 +197,218 @@ class Game:
     def started(self) -> bool:
         return self.__started
 
+    @property
+    def turn_count(self) -> int:
+        """Number of turns played since the game was created."""
+        return self.__turn_count
+
+    @property
+    def reshuffle_count(self) -> int:
+        """Number of reshuffles of the discard pile since the last start."""
+        return self.__reshuffle_count
+
+    @property
+    def winner_index(self) -> int:
+        """Index of the player who won the last game, or -1 if the last
+        game was not won by anyone (e.g. stopped due to lack of cards)."""
+        return self.__winner_index
+
+    def touch(self) -> None:
+        """Mark the game as recently accessed so that it won't be evicted.
+        (Lock-free, see `GameRegistry.get_game()`.)"""
+        self.__last_active_timestamp = monotonic()
+
+    def is_idle(self, idle_timeout_seconds: float) -> bool:
+        """Check whether the game has no connected human player and has not
+        been accessed (or disconnected from a player) for at least
+        `idle_timeout_seconds`. (Started games are idle once abandoned,
+        as their players are kept after disconnecting.)"""
+        return (
+            monotonic() - self.__last_active_timestamp >= idle_timeout_seconds
+        ) and not any(
+            player.connected for player in self.__players if not player.is_bot
+        )
+
+    @contextmanager
+    def __transaction(self) -> Generator[None]:
+        """Hold the game lock for a mutation. Events sent during it are
+        committed when the outermost transaction ends, and delivered
+        once the lock is released, as are notifications of changes."""
+        outermost = False
+        changed = False
+        try:
+            # name the caller of the transaction as the lock site
+            with ThreadLockContext(self.lock, caller_depth=2):
+                self.__transaction_depth += 1
+                outermost = self.__transaction_depth == 1
+                if outermost:
+                    self.__transaction_owner = get_ident()
+                failed = False
+                try:
+                    yield
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    self.__transaction_depth -= 1
+                    if outermost:
+                        self.__transaction_owner = 0
+                        if self.__outbox:
+                            self.__deliveries.extend(self.__outbox)
+                            self.__outbox = []
+                        changed = self.__changed
+                        self.__changed = False
+                        self.__commit_journal_entry(failed=failed)
+        finally:
+            if outermost and self.__deliveries:
+                self.__deliver()
+            if changed:
+                self.changes.notify()
+
+    def __record(self, action: JournalAction, args: dict[str, Any]) -> None:
+        """Record the action of the current transaction to be journaled,
+        unless an outer action is recorded (e.g. a play stopping the game)."""
+        if (self.journal is not None) and (self.__journal_entry is None):
+            self.__journal_entry = (action, args)
+
+    def __commit_journal_entry(self, *, failed: bool) -> None:
+        """Append the recorded action to the journal, which only queues it
+        to be written in the background. (Actions that failed are dropped.)"""
+        journal_entry = self.__journal_entry
+        if journal_entry is None:
+            return
+        self.__journal_entry = None
+        if (not failed) and (self.journal is not None):
+            seq = self.journal.append(self.tag, *journal_entry)
+            if seq is not None:  # not dropped by a failed journal
+                self.__journal_seq = seq
+
+    def __deliver(self) -> None:
+        """Serialize committed events and put them into message queues,
+        in the order of commits. Only one thread delivers at a time, and
+        events committed meanwhile are left to it, unless the backlog is
+        too long, in which case this waits for its turn to slow down
+        mutations. (Message queues never block.)"""
+
+        deliveries = self.__deliveries
+
+        while deliveries:  # re-check after release to not miss any
+
+            if not self.__delivery_lock.acquire(blocking=False):
+                if len(deliveries) < GAME_DELIVERY_BACKLOG_LIMIT:
+                    return
+                self.__delivery_lock.acquire()
+
+            try:
+                while deliveries:
+                    event, recipients = deliveries.popleft()
+                    timestamp_begin = perf_counter()
+                    if callable(event):
+                        event = event()  # deferred creation
+                    self.__log_event(event, recipients)
+                    event.encode()  # serialize once for all recipients
+                    for player in recipients:
+                        player.message_queue.put(event)
+                    BROADCAST_DURATION.observe(perf_counter() - timestamp_begin)
+            finally:
+                self.__delivery_lock.release()
+
+    def __log_event(
+        self,
+        event: ServerSentEvent,
+        recipients: tuple[Player, ...],
+    ) -> None:
+        """Number the event being delivered and keep it in the event log.
+        (Called with the delivery lock held.)"""
+        seq = self.__event_seq = self.__event_seq + 1
+        event.assign_id(f"{self.epoch}-{seq}")
+        if isinstance(event, (GameStateEvent, GameStatePatchEvent)):
+            self.__delivered_state_version = event.data["version"]
+        self.__event_log.append(
+            (seq, self.__delivered_state_version, event, recipients)
+        )
+
+    def open_event_stream(
+        self,
+        player: Player,
+        last_event_id: str | None,
+    ) -> EventStreamStart:
+        """Start a subscription of the player from the end of the event
+        stream, discarding the events queued for the player. If the events
+        after `last_event_id` are still in the event log, the ones sent to
+        the player are returned to be replayed; otherwise, the subscriber
+        should be sent full states instead."""
+
+        with ThreadLockContext(self.__delivery_lock):
+
+            player.message_queue.clear()  # all in the event log
+            event_log = self.__event_log
+            if not event_log:
+                return EventStreamStart("", None, 0)
+            last_seq = event_log[-1][0]
+            stream_start = EventStreamStart(f"{self.epoch}-{last_seq}", None, 0)
+
+            if not last_event_id:
+                return stream_start
+            epoch, _, seq_text = last_event_id.partition("-")
+            if (epoch != self.epoch) or not seq_text.isdecimal():
+                return stream_start  # e.g. from a recreated game
+            seq = int(seq_text)
+            first_seq = event_log[0][0]
+            if not (first_seq <= seq <= last_seq):
+                return stream_start  # aged out
+            _, state_version, _, _ = event_log[seq - first_seq]
+
+            return stream_start._replace(
+                missed_events=[
+                    event
+                    for _, _, event, recipients in islice(
+                        event_log, seq - first_seq + 1, None
+                    )
+                    if player in recipients
+                ],
+                state_version=state_version,
+            )
+
+    def __send(
+        self,
+        event: ServerSentEvent | Callable[[], ServerSentEvent],
+        recipients: tuple[Player, ...],
+    ) -> None:
+        """Send the event to the recipients after the current transaction."""
+        assert self.__transaction_depth > 0
+        if recipients:
+            self.__outbox.append((event, recipients))
+
+    def __send_to_player(self, player: Player, event: ServerSentEvent) -> None:
+        if not player.is_bot:
+            self.__send(event, (player,))
+
+    def __send_cards(self, player: Player) -> None:
+        """Publish the cards of the player as a new version and send them
+        to the player. (Skipped for bots.)"""
+        if player.is_bot:
+            return  # skip building the event
+        self.__cards_version += 1
+        event = player.get_cards_event()
+        player.latest_cards = (self.__cards_version, event)
+        self.__changed = True
+        self.__send(event, (player,))
+
     def broadcast(self, event: ServerSentEvent) -> None:
-        with ThreadLockContext(self.lock):
-            for player in self.__players:
-                if not player.is_bot:
-                    player.message_queue.put(event)
+        recipients = tuple(player for player in self.__players if not player.is_bot)
+        if self.__transaction_owner == get_ident():
+            self.__send(event, recipients)  # in order with the transaction
+        elif recipients:  # no lock is needed outside of transactions
+            self.__deliveries.append((event, recipients))
+            self.__deliver()
 
     def get_game_state_event(self) -> GameStateEvent:
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
             started = self.__started
             return GameStateEvent(
                 GameStateEvent.DataType(
+                    version=self.__state_version,
                     started=started,
                     rules=self.__rules,
                     draw_pile_size=(len(self.__draw_pile) if started else -1),
@@ -108,13 +425,60 @@ class Game:
                     ],
                     current_player_index=self.__current_player_index,
                     direction=self.__direction,
-                    lead_card=self.__lead_card,
+                    lead_card=(
+                        None if self.__lead_card is None else CARDS[self.__lead_card]
+                    ),
                     lead_color=self.__lead_color,
                     draw_counter=self.__draw_counter,
                     skip_counter=self.__skip_counter,
                 )
             )
 
+    def get_latest_game_state_event(self) -> GameStateEvent:
+        """Get the latest broadcast game state, which is consistent with
+        the patches broadcast afterwards. (The game lock is not required
+        unless nothing has been broadcast yet.)"""
+        event = self.__last_game_state_event
+        if event is None:
+            return self.get_game_state_event()
+        return event
+
+    @property
+    def latest_state_version(self) -> int:
+        """Version of the latest broadcast game state, or 0 if nothing has
+        been broadcast yet. (Lock-free.)"""
+        event = self.__last_game_state_event
+        return 0 if event is None else event.data["version"]
+
+    def broadcast_game_state(self) -> None:
+        """Bump state version and broadcast the latest game state, as a patch
+        against the previously broadcast state or as a periodic keyframe."""
+        with self.__transaction():
+
+            if self.__scheduler is None:
+                return  # headless
+
+            self.__state_version += 1
+            event = self.get_game_state_event()
+
+            last_event = self.__last_game_state_event
+            self.__last_game_state_event = event  # published to readers
+            self.__changed = True
+
+            recipients = tuple(player for player in self.__players if not player.is_bot)
+            if (last_event is None) or (
+                self.__state_version % GAME_STATE_KEYFRAME_INTERVAL == 0
+            ):
+                self.__send(event, recipients)
+            else:
+                # diffed out of the lock, as both states are immutable
+                self.__send(
+                    partial(create_game_state_patch_event, last_event, event),
+                    recipients,
+                )
+
+            self.__schedule_bot_play()
+
     def update_rules(
         self,
         modified_rules: Mapping[str, object],
@@ -123,15 +487,25 @@ class Game:
         operator_is_player: bool,
     ) -> None:
 
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
+
+            self.__record(
+                "rules",
+                {
+                    "rules": dict(modified_rules),
+                    "operator_name": operator_name,
+                    "operator_is_player": operator_is_player,
+                },
+            )
 
             if self.started:
-                debug_message = format_optional_operator(
-                    "Rejected rule update",
-                    operator_name,
-                    is_player=operator_is_player,
+                self.__logger.debug(
+                    lambda: format_optional_operator(
+                        "Rejected rule update",
+                        operator_name,
+                        is_player=operator_is_player,
+                    )
                 )
-                self.__logger.debug(debug_message)
                 raise RuleUpdateOnStartedGameException()
 
             rules = self.__rules.copy()
@@ -158,27 +532,40 @@ class Game:
             if "player_capacity" in modified_rules:
                 new_capacity = self.__rules["player_capacity"]
                 if len(self.__players) > new_capacity:
-                    while len(self.__players) > new_capacity:
-                        excess_player = self.__players.pop()
-                        excess_player.message_queue.put(
+                    excess_players = self.__players[new_capacity:]
+                    self.__players = self.__players[:new_capacity]
+                    for excess_player in reversed(excess_players):
+                        self.__send_to_player(
+                            excess_player,
                             EndOfConnectionEvent(
                                 "Sorry, you are kicked out due to "
                                 "a recent rule change."
-                            )
+                            ),
                         )
                         excess_player.connected = False
-                    self.broadcast(self.get_game_state_event())
+                    self.broadcast_game_state()
+
+    def __find_player(self, player_name: str) -> Player | None:
+        for player in self.__players:
+            if player.name == player_name:
+                return player
+        return None
 
     def get_player(
         self,
         player_name: str,
         allow_creation: bool = False,
     ) -> Player:
-        with ThreadLockContext(self.lock):
 
-            for player in self.__players:
-                if player.name == player_name:
-                    return player
+        player = self.__find_player(player_name)  # lock-free
+        if player:
+            return player
+
+        with self.__transaction():
+
+            player = self.__find_player(player_name)  # added meanwhile?
+            if player:
+                return player
 
             else:
 
@@ -191,12 +578,18 @@ class Game:
                     self.__logger.warn(exception.message)
                     raise exception
 
+                self.__record("join", {"player_name": player_name})
                 new_player = Player(player_name, is_bot=False)
-                self.__players.append(new_player)
-                self.broadcast(self.get_game_state_event())
+                self.__players = (*self.__players, new_player)
+                self.broadcast_game_state()
 
                 return new_player
 
+    def get_players(self) -> list[Player]:
+        """Get a snapshot of the players. (Lock-free, so it may be
+        slightly out of date.)"""
+        return list(self.__players)
+
     def kick_out_player(
         self,
         *,
@@ -205,20 +598,32 @@ class Game:
         operator_is_player: bool,
     ) -> None:
 
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
+
+            self.__record(
+                "kick",
+                {
+                    "target_name": target_name,
+                    "operator_name": operator_name,
+                    "operator_is_player": operator_is_player,
+                },
+            )
 
             target_player = self.get_player(target_name)
             target_player.connected = False
-            target_player.message_queue.put(
+            self.__send_to_player(
+                target_player,
                 EndOfConnectionEvent(
                     format_optional_operator(
                         "Sorry, you are kicked out",
                         operator_name,
                         is_player=operator_is_player,
                     )
-                )
+                ),
+            )
+            self.__players = tuple(
+                player for player in self.__players if player is not target_player
             )
-            self.__players.remove(target_player)
 
             if self.started:
                 self.__discard_pile.extend(target_player.cards)
@@ -234,19 +639,20 @@ class Game:
 
     def set_lead_card_info(
         self,
-        lead_card: Card,
+        lead_card: int,
         *,
         lead_color: BasicCardColor | None = None,
     ) -> None:
-        with ThreadLockContext(self.lock):
-            if lead_card["type"] == "wild":
+        with self.__transaction():
+            lead_card_dict = CARDS[lead_card]
+            if lead_card_dict["type"] == "wild":
                 if lead_color is None:
-                    raise InvalidLeadCardInfoException(lead_card, lead_color)
+                    raise InvalidLeadCardInfoException(lead_card_dict, lead_color)
                 self.__lead_color = lead_color
             else:
                 if lead_color is not None:
-                    raise InvalidLeadCardInfoException(lead_card, lead_color)
-                self.__lead_color = lead_card["color"]
+                    raise InvalidLeadCardInfoException(lead_card_dict, lead_color)
+                self.__lead_color = lead_card_dict["color"]
             self.__lead_card = lead_card
 
     def draw_cards(
@@ -255,24 +661,36 @@ class Game:
         *,
         player: Player | None,
         allow_shuffle: bool = False,
-    ) -> Deck | None:
+    ) -> bytearray | None:
+        """Draw cards from the top of the draw pile and return their codes.
+        (The game is stopped and `None` is returned if there are not enough
+        cards to draw.)"""
 
-        drawn_cards: Deck = []
+        drawn_cards = bytearray()
 
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
 
-            for _ in range(count):
+            while len(drawn_cards) < count:
 
                 if not len(self.__draw_pile):
 
                     if allow_shuffle:
-                        self.__draw_pile = self.__discard_pile
-                        self.__discard_pile = []
+                        self.__draw_pile, self.__discard_pile = (
+                            self.__discard_pile,
+                            self.__draw_pile,
+                        )
                         self.__logger.debug("Shuffled piles for card drawing.")
-                        shuffle(self.__draw_pile)
+                        reshuffle_pile(
+                            self.__draw_pile,
+                            seed=self.__seed,
+                            reshuffle_count=self.__reshuffle_count,
+                        )
+                        if len(self.__draw_pile):
+                            self.__reshuffle_count += 1
 
                     if not len(self.__draw_pile):
-                        self.__draw_pile.extend(reversed(drawn_cards))
+                        drawn_cards.reverse()
+                        self.__draw_pile.extend(drawn_cards)
                         self.broadcast(
                             NotificationEvent(
                                 NotificationEvent.DataType(
@@ -288,23 +706,33 @@ class Game:
                         )
                         return None
 
-                drawn_card = self.__draw_pile.pop()
-                drawn_cards.append(drawn_card)
+                # take as many cards as possible from the top at once
+                draw_pile = self.__draw_pile
+                split_index = max(len(draw_pile) - (count - len(drawn_cards)), 0)
+                drawn_cards.extend(reversed(draw_pile[split_index:]))
+                del draw_pile[split_index:]
 
             if player:
                 with ThreadLockContext(player.lock):
                     player.cards.extend(drawn_cards)
-                    player.message_queue.put(player.get_cards_event())
+                    self.__send_cards(player)
                 self.__logger.debug(
-                    f"Cards drawn by player#{player.name}: {drawn_cards!r}"
+                    lambda: f"Cards drawn by player#{player.name}: "
+                    + format_card_codes(drawn_cards)
                 )
 
-            self.broadcast(self.get_game_state_event())
+            self.broadcast_game_state()
 
         return drawn_cards
 
-    def start(self, player_name: str) -> None:
-        with ThreadLockContext(self.lock):
+    def start(self, player_name: str, *, seed: int | None = None) -> None:
+        """Start the game, shuffling with random numbers seeded by `seed`
+        (random if not given) until the next start."""
+        with self.__transaction():
+
+            if seed is None:
+                seed = getrandbits(64)
+            self.__record("start", {"player_name": player_name, "seed": seed})
 
             if self.__started:
                 raise GameAlreadyStartedException()
@@ -314,20 +742,28 @@ class Game:
             if len(self.__players) + rules["bot_count"] < MIN_PLAYER_CAPACITY:
                 raise NotEnoughPlayersException()
 
+            self.__seed = seed
+            random = Random(seed)
+
             # -- reset card piles --
             self.__draw_pile = create_deck()
-            self.__discard_pile = []
-            shuffle(self.__draw_pile)
+            self.__discard_pile = bytearray()
+            random.shuffle(self.__draw_pile)
+            self.__reshuffle_count = 0
+            self.__winner_index = -1
 
             # -- add bots --
+            players = list(self.__players)
             for i in range(rules["bot_count"]):
                 bot_name = f"bot#{i + 1}"
-                self.__players.append(Player(bot_name, is_bot=True))
+                players.append(Player(bot_name, is_bot=True))
 
             # -- shuffle players if needed --
             if self.__rules["shuffle_players"]:
                 self.__logger.debug("Shuffled players.")
-                shuffle(self.__players)
+                random.shuffle(players)
+
+            self.__players = tuple(players)
 
             # -- dispatch initial cards --
             initial_hand_size = self.__rules["initial_hand_size"]
@@ -336,11 +772,11 @@ class Game:
             for player in self.__players:
                 if not self.draw_cards(initial_hand_size, player=player):
                     return
-                player.message_queue.put(player.get_cards_event())
+                self.__send_cards(player)
 
             # -- set lead card --
-            lead_card: Card | None = None
-            while (lead_card is None) or (lead_card["type"] != "number"):
+            lead_card: int | None = None
+            while (lead_card is None) or (CARD_TYPES[lead_card] != "number"):
                 lead_card_drawn = self.draw_cards(1, player=None)
                 if not lead_card_drawn:
                     return
@@ -368,7 +804,7 @@ class Game:
                 )
             )
 
-            self.broadcast(self.get_game_state_event())
+            self.broadcast_game_state()
 
     def play(
         self,
@@ -376,15 +812,26 @@ class Game:
         card_ids: Sequence[str],
         play_color: BasicCardColor | None,
     ) -> None:
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
+
+            self.__record(
+                "play",
+                {
+                    "player_name": player_name,
+                    "card_ids": list(card_ids),
+                    "color": play_color,
+                },
+            )
+
+            if not self.__started:
+                raise GameNotStartedException()
 
             player = self.get_player(player_name)
             expected_player = self.__players[self.__current_player_index]
             if player != expected_player:
                 raise NotCurrentPlayerException(expected_player.name)
 
-            player_cards_backup = player.cards.copy()
-            cards_out = player.give_out_cards(card_ids)
+            cards_out = player.find_cards(card_ids)
             n_cards_out = len(cards_out)
 
             lead_color = self.__lead_color
@@ -393,69 +840,51 @@ class Game:
 
             if n_cards_out > 0:
 
-                try:
-                    if not (lead_color and lead_card):
-                        raise InvalidLeadCardInfoException(lead_card, lead_color)
-                    check_play(
-                        cards_out,
-                        play_color,
-                        lead_color=lead_color,
-                        lead_card=lead_card,
-                        skip_counter=self.__skip_counter,
-                        rules=rules,
+                if (lead_color is None) or (lead_card is None):
+                    raise InvalidLeadCardInfoException(
+                        None if lead_card is None else CARDS[lead_card],
+                        lead_color,
                     )
-                    self.set_lead_card_info(cards_out[-1], lead_color=play_color)
-                except:
-                    player.cards = player_cards_backup
-                    raise
-                else:
+                check_play(
+                    cards_out,
+                    play_color,
+                    lead_color=lead_color,
+                    lead_card=lead_card,
+                    skip_counter=self.__skip_counter,
+                    rules=rules,
+                )
+                self.set_lead_card_info(cards_out[-1], lead_color=play_color)
+                # removed only once the play is valid, so that a rejected
+                # play leaves the hand as it was
+                player.give_out_cards(cards_out)
 
-                    play_color_message = (
-                        f" (change color to {play_color})" if play_color else ""
-                    )
-                    self.__logger.info(
-                        f"Player#{player.name} played: {cards_out!r}"
-                        + play_color_message
-                    )
-                    self.broadcast(
-                        NotificationEvent(
-                            NotificationEvent.DataType(
-                                title=f"{player.name}'s Play",
-                                message=(
-                                    ", ".join(map(format_card, cards_out))
-                                    + play_color_message
-                                ),
-                            )
+                play_color_message = (
+                    f" (change color to {play_color})" if play_color else ""
+                )
+                self.__logger.info(
+                    f"Player#{player.name} played: "
+                    + format_card_codes(cards_out)
+                    + play_color_message
+                )
+                self.broadcast(
+                    NotificationEvent(
+                        NotificationEvent.DataType(
+                            title=f"{player.name}'s Play",
+                            message=(format_card_codes(cards_out) + play_color_message),
                         )
                     )
+                )
 
-                    assert n_cards_out > 0
-
-                    for card in cards_out:
-                        if card["type"] == "number":
-                            continue
-                        elif card["type"] == "function":
-                            if card["effect"] == "+2":
-                                self.__draw_counter += 2
-                                self.__skip_counter += 1
-                            elif card["effect"] == "skip":
-                                self.__skip_counter += 1
-                            elif card["effect"] == "reverse":
-                                self.__direction = -self.__direction
-                            else:
-                                assert_never(card["effect"])
-                        elif card["type"] == "wild":
-                            if card["effect"] == "+4":
-                                self.__draw_counter += 4
-                                self.__skip_counter += 1
-                            elif card["effect"] == "color":
-                                pass
-                            else:
-                                assert_never(card["effect"])
-                        else:
-                            assert_never(card["type"])
+                assert n_cards_out > 0
+
+                for code in cards_out:
+                    draw_penalty, skip, reverse = CARD_PLAY_EFFECTS[code]
+                    self.__draw_counter += draw_penalty
+                    self.__skip_counter += skip
+                    if reverse:
+                        self.__direction = -self.__direction
 
-                    self.__discard_pile.extend(cards_out)
+                self.__discard_pile.extend(cards_out)
 
             else:  # n_cards_out == 0
                 self.__logger.info(f"Player#{player.name} passed.")
@@ -473,7 +902,7 @@ class Game:
                 if (
                     (not rules["any_last_play"])
                     and (n_cards_out == 1)
-                    and (cards_out[0]["type"] != "number")
+                    and (CARD_TYPES[cards_out[0]] != "number")
                 ):
                     self.draw_cards(1, player=player, allow_shuffle=True)
                 else:
@@ -485,6 +914,7 @@ class Game:
                             )
                         )
                     )
+                    self.__winner_index = self.__players.index(player)
                     return self.stop(operator_name=None, operator_is_player=False)
 
             player_count = len(self.__players)
@@ -506,9 +936,10 @@ class Game:
                 + self.__direction * (self.__skip_counter + 1)
             ) % player_count
             self.__skip_counter = 0
+            self.__turn_count += 1
 
-            player.message_queue.put(player.get_cards_event())
-            self.broadcast(self.get_game_state_event())
+            self.__send_cards(player)
+            self.broadcast_game_state()
 
     def stop(
         self,
@@ -516,7 +947,15 @@ class Game:
         operator_is_player: bool,
         state_check_required: bool = True,
     ) -> None:
-        with ThreadLockContext(self.lock):
+        with self.__transaction():
+
+            self.__record(
+                "stop",
+                {
+                    "operator_name": operator_name,
+                    "operator_is_player": operator_is_player,
+                },
+            )
 
             if state_check_required:
                 if not self.__started:
@@ -526,11 +965,11 @@ class Game:
             self.__lead_color = None
             self.__lead_card = None
 
-            for player in self.__players.copy():
-                if player.is_bot:
-                    self.__players.remove(player)
-                else:
-                    player.last_result = len(player.cards)
+            self.__players = tuple(
+                player for player in self.__players if not player.is_bot
+            )
+            for player in self.__players:
+                player.last_result = len(player.cards)
 
             message = format_optional_operator(
                 "Game stopped",
@@ -547,81 +986,281 @@ class Game:
                 )
             )
 
-            self.broadcast(self.get_game_state_event())
+            self.broadcast_game_state()
 
-    def watcher_loop(self) -> None:
+    def __schedule_bot_play(self) -> None:
+        """Schedule the play of current player if it's a bot's turn,
+        or cancel the scheduled bot play if the turn is over."""
+        with self.__transaction():
 
-        def on_slow(continuous_slow_count: int) -> None:
-            if continuous_slow_count >= GAME_WATCHER_SKIP_THRESHOLD:
-                self.__logger.warn(
-                    "The watcher loop seems to be slow. "
-                    f"(continuous_slow_count: {continuous_slow_count})"
+            bot_play_turn: tuple[int, Player] | None = None
+            if self.__started:
+                current_player = self.__players[self.__current_player_index]
+                if current_player.is_bot:
+                    bot_play_turn = (self.__turn_count, current_player)
+
+            if bot_play_turn == self.__bot_play_turn:
+                return
+
+            if self.__bot_play_task:
+                self.__bot_play_task.cancel()
+                self.__bot_play_task = None
+            self.__bot_play_turn = bot_play_turn
+
+            if bot_play_turn:
+                assert self.__scheduler is not None
+                self.__bot_play_task = self.__scheduler.schedule(
+                    self.__rules["bot_play_delay"],
+                    partial(self.__play_as_bot, bot_play_turn),
                 )
 
-        for _ in loop(GAME_WATCHER_INTERVAL, allow_skip=True, on_slow=on_slow):
-            with ThreadLockContext(self.lock):
+    def __play_as_bot(self, bot_play_turn: tuple[int, Player]) -> None:
+        with self.__transaction():
 
-                now = monotonic()
-                rules = self.__rules
+            if bot_play_turn != self.__bot_play_turn:
+                return  # outdated
 
-                player_timeout_seconds = PLAYER_TIMEOUT.total_seconds()
-                state_changed = False
+            _, bot = bot_play_turn
+            self.__make_bot_play(bot)
 
-                for player_index, player in enumerate(self.__players.copy()):
-                    with ThreadLockContext(player.lock):
+    def play_as_bot(self) -> None:
+        """Let the current player play as a bot right away.
+        (Used to drive headless games.)"""
+        with self.__transaction():
 
-                        if player.is_bot:
+            if not self.__started:
+                raise GameNotStartedException()
 
-                            player.connected = True
+            self.__make_bot_play(self.__players[self.__current_player_index])
 
-                            bot_play_timer = player.bot_play_timer
-                            assert bot_play_timer
-
-                            if player_index != self.__current_player_index:
-                                bot_play_timer.started = False
-                            else:
-                                if bot_play_timer.started:
-                                    if bot_play_timer.time_up:
-                                        assert self.__lead_color
-                                        assert self.__lead_card
-                                        play = player.bot_play(
-                                            lead_color=self.__lead_color,
-                                            lead_card=self.__lead_card,
-                                            skip_counter=self.__skip_counter,
-                                            rules=rules,
-                                        )
-                                        self.play(player.name, *play)
-                                        bot_play_timer.started = False
-                                else:
-                                    bot_play_timer.timeout = rules["bot_play_delay"]
-                                    bot_play_timer.started = True
+    def __make_bot_play(self, player: Player) -> None:
+        with self.__transaction():
+            assert self.__lead_color
+            assert self.__lead_card is not None
+            play = player.bot_play(
+                lead_color=self.__lead_color,
+                lead_card=self.__lead_card,
+                skip_counter=self.__skip_counter,
+                rules=self.__rules,
+            )
+            self.play(player.name, *play)
+
+    def schedule_connection_check(self, player: Player) -> None:
+        """Schedule a connection check of the player as soon as possible.
+        (This doesn't block on the game lock, so it's safe to call in any
+        context, e.g. when the subscription token of the player changes.)"""
+        assert self.__scheduler is not None
+        self.__scheduler.schedule(0, partial(self.check_connection, player))
+
+    def watch_pending_write(self, player: Player) -> None:
+        """Make sure that the connection of the player is checked once its
+        pending write lasts for `PLAYER_TIMEOUT`. (Non-blocking, too.)"""
+        assert self.__scheduler is not None
+        watchdog = player.connection_watchdog
+        if (watchdog is None) or watchdog.done:
+            player.connection_watchdog = self.__scheduler.schedule(
+                PLAYER_TIMEOUT.total_seconds(),
+                partial(self.__check_pending_write, player),
+            )
+
+    def __check_pending_write(self, player: Player) -> None:
+        assert self.__scheduler is not None
+        remaining_seconds = self.check_connection(player)
+        if remaining_seconds is not None:  # check again when it may time out
+            player.connection_watchdog = self.__scheduler.schedule(
+                remaining_seconds,
+                partial(self.__check_pending_write, player),
+            )
+
+    def await_reconnections(self) -> None:
+        """Give the human players of a recovered game `PLAYER_TIMEOUT` to
+        subscribe again, as to a stalled subscriber, after which the ones
+        who haven't are disconnected (and removed if the game is stopped),
+        so that abandoned rooms become idle."""
+        assert self.__scheduler is not None
+        with self.__transaction():
+            human_players = [player for player in self.__players if not player.is_bot]
+            for player in human_players:
+                with ThreadLockContext(player.lock):
+                    player.connected = True
+                self.__scheduler.schedule(
+                    PLAYER_TIMEOUT.total_seconds(),
+                    partial(self.check_connection, player),
+                )
+            if human_players:
+                self.broadcast_game_state()
+
+    def check_connection(self, player: Player) -> float | None:
+        """Update the connection status of the player, which is considered
+        disconnected if it has no subscription or a pending write to it
+        has lasted for `PLAYER_TIMEOUT`.
+
+        Returns:
+            remaining_seconds (float | None): Seconds until current pending
+                write times out, or `None` if there's no pending write.
+        """
 
+        remaining_seconds: float | None = None
+
+        with self.__transaction():
+
+            if player not in self.__players:
+                return None
+
+            with ThreadLockContext(player.lock):
+
+                previous_connected_status = player.connected
+
+                player.connected = False
+                if player.subscription_token:
+                    last_pending_timestamp = player.last_pending_timestamp
+                    if last_pending_timestamp:
+                        remaining_seconds = PLAYER_TIMEOUT.total_seconds() - (
+                            monotonic() - last_pending_timestamp
+                        )
+                        if remaining_seconds > 0:
+                            player.connected = True
                         else:
+                            remaining_seconds = None
+                    else:
+                        player.connected = True
+
+                if player.connected != previous_connected_status:
+                    if not player.connected:
+                        self.__logger.info(f"Disconnected from player#{player.name}.")
+                        self.touch()  # idle from now on if it's the last one
+                        player.subscription_token = ""
+                        player.message_queue.wake()
+                        if not self.__started:
+                            self.__remove_player(player.name)
+                    self.broadcast_game_state()
+
+        return remaining_seconds
+
+    def __remove_player(self, player_name: str) -> None:
+        """Remove the player who left the stopped game."""
+        with self.__transaction():
+            self.__record("leave", {"player_name": player_name})
+            self.__players = tuple(
+                player for player in self.__players if player.name != player_name
+            )
+
+    def replay(self, entry: JournalEntry) -> None:
+        """Redo a journaled action of this game, which leads to the same
+        state given the same actions before it. (Replayed actions are not
+        journaled again, so the journal should be attached afterwards.)"""
+
+        assert self.journal is None
+        action = entry["action"]
+        args = entry["args"]
+
+        if action == "join":
+            self.get_player(args["player_name"], allow_creation=True)
+        elif action == "rules":
+            self.update_rules(
+                args["rules"],
+                operator_name=args["operator_name"],
+                operator_is_player=args["operator_is_player"],
+            )
+        elif action == "start":
+            self.start(args["player_name"], seed=args["seed"])
+        elif action == "play":
+            self.play(args["player_name"], args["card_ids"], args["color"])
+        elif action == "kick":
+            self.kick_out_player(
+                target_name=args["target_name"],
+                operator_name=args["operator_name"],
+                operator_is_player=args["operator_is_player"],
+            )
+        elif action == "stop":
+            self.stop(
+                operator_name=args["operator_name"],
+                operator_is_player=args["operator_is_player"],
+            )
+        elif action == "leave":
+            with self.__transaction():
+                self.__remove_player(args["player_name"])
+                self.broadcast_game_state()
+        else:
+            raise ValueError(f"Unexpected journal action of a game: {action}")
+
+        self.__journal_seq = entry["seq"]
+
+    @property
+    def journal_seq(self) -> int:
+        """Sequence number of the last action journaled or replayed."""
+        return self.__journal_seq
 
-                            previous_connected_status = player.connected
-
-                            player.connected = False
-                            if player.subscription_token:
-                                if player.last_pending_timestamp:
-                                    pending_time = now - player.last_pending_timestamp
-                                    if pending_time < player_timeout_seconds:
-                                        player.connected = True
-                                else:
-                                    player.connected = True
-
-                            if player.connected != previous_connected_status:
-                                state_changed = True
-                                if not player.connected:
-                                    self.__logger.info(
-                                        f"Disconnected from player#{player.name}. "
-                                        f"(subscription_token: {player.subscription_token})"
-                                    )
-                                    player.subscription_token = ""
-                                    if not self.__started:
-                                        self.__players.remove(player)
-
-                if state_changed:
-                    self.broadcast(self.get_game_state_event())
-
-
-game = Game()
+    def get_snapshot(self) -> GameSnapshot:
+        with self.__transaction():
+            started = self.__started
+            return GameSnapshot(
+                seq=self.__journal_seq,
+                started=started,
+                rules=self.__rules,  # replaced rather than mutated on update
+                players=[
+                    PlayerSnapshot(
+                        name=player.name,
+                        is_bot=player.is_bot,
+                        cards=bytes(player.cards).hex(),
+                        last_result=player.last_result,
+                    )
+                    for player in self.__players
+                ],
+                draw_pile=self.__draw_pile.hex(),
+                discard_pile=self.__discard_pile.hex(),
+                current_player_index=self.__current_player_index,
+                direction=self.__direction,
+                lead_card=self.__lead_card,
+                lead_color=self.__lead_color,
+                draw_counter=self.__draw_counter,
+                skip_counter=self.__skip_counter,
+                turn_count=self.__turn_count,
+                reshuffle_count=self.__reshuffle_count,
+                winner_index=self.__winner_index,
+                state_version=self.__state_version,
+                seed=self.__seed,
+            )
+
+    def restore_snapshot(self, snapshot: GameSnapshot) -> None:
+        """Restore the state of a newly created game from its snapshot.
+        (Human players are disconnected until they subscribe again, see
+        `await_reconnections()`.)"""
+        with self.__transaction():
+
+            players: list[Player] = []
+            for player_snapshot in snapshot["players"]:
+                player = Player(
+                    player_snapshot["name"], is_bot=player_snapshot["is_bot"]
+                )
+                player.cards.extend(bytes.fromhex(player_snapshot["cards"]))
+                player.last_result = player_snapshot["last_result"]
+                players.append(player)
+            self.__players = tuple(players)
+
+            self.__started = snapshot["started"]
+            self.__rules = snapshot["rules"]
+            self.__draw_pile = bytearray.fromhex(snapshot["draw_pile"])
+            self.__discard_pile = bytearray.fromhex(snapshot["discard_pile"])
+            self.__current_player_index = snapshot["current_player_index"]
+            self.__direction = -1 if snapshot["direction"] < 0 else 1
+            self.__lead_card = snapshot["lead_card"]
+            self.__lead_color = cast(BasicCardColor | None, snapshot["lead_color"])
+            self.__draw_counter = snapshot["draw_counter"]
+            self.__skip_counter = snapshot["skip_counter"]
+            self.__turn_count = snapshot["turn_count"]
+            self.__reshuffle_count = snapshot["reshuffle_count"]
+            self.__winner_index = snapshot["winner_index"]
+            self.__state_version = snapshot["state_version"]
+            self.__seed = snapshot["seed"]
+            self.__journal_seq = snapshot["seq"]
+
+            if self.__scheduler is not None:
+                self.__schedule_bot_play()
+
+
+def create_game_state_patch_event(
+    last_event: GameStateEvent,
+    event: GameStateEvent,
+) -> GameStatePatchEvent:
+    return GameStatePatchEvent(diff_game_state(last_event.data, event.data))
@@ -0,0 +1,260 @@
+import atexit
+from collections.abc import Mapping
+from pathlib import Path
+from threading import RLock
+from time import perf_counter
+from traceback import format_exception
+
+from tuno.server.config import (
+    JOURNAL_SNAPSHOT_INTERVAL,
+    MAX_ROOM_COUNT,
+    ROOM_EVICTION_INTERVAL,
+    ROOM_IDLE_TIMEOUT,
+)
+from tuno.server.exceptions import (
+    ApiException,
+    RoomNotFoundException,
+    TooManyRoomsException,
+)
+from tuno.server.metrics import SCHEDULER_LAG, SCHEDULER_TASK_DURATION
+from tuno.server.utils.Journal import GameSnapshot, Journal
+from tuno.server.utils.Logger import Logger
+from tuno.shared.rules import check_rule_update
+from tuno.shared.Scheduler import Scheduler
+from tuno.shared.ThreadLockContext import ThreadLockContext, name_lock
+
+from .Game import Game
+
+
+class GameRegistry:
+    """A registry of games (rooms) hosted in one server.
+
+    Games are created lazily on first access and evicted after being idle
+    for a while. Timed jobs of all games (e.g. bot plays and connection
+    checks) are run by a shared scheduler, and the registry lock is only
+    taken when a game is created or evicted. Games can be persisted in
+    a journal (see `enable_journal()`).
+    """
+
+    lock: RLock
+    scheduler: Scheduler
+    initial_rules: dict[str, object]
+    journal: Journal | None
+
+    __games: dict[str, Game]
+    __logger: Logger
+
+    def __init__(self) -> None:
+        self.lock = name_lock(RLock(), "registry")
+        self.initial_rules = {}
+        self.journal = None
+        self.__games = {}
+        self.__logger = Logger(__name__)
+        self.scheduler = Scheduler(
+            name="game-scheduler",
+            on_error=self.__on_scheduler_error,
+            on_task_done=self.__on_scheduler_task_done,
+        )
+
+    @property
+    def game_count(self) -> int:
+        return len(self.__games)
+
+    def get_games(self) -> list[Game]:
+        """Get a snapshot of the games hosted."""
+        return list(self.__games.values())
+
+    def update_initial_rules(self, modified_rules: Mapping[str, object]) -> None:
+        """Update rules applied to every newly created game."""
+        for key, value in modified_rules.items():
+            check_rule_update(key, value)
+        with ThreadLockContext(self.lock):
+            self.initial_rules = {**self.initial_rules, **modified_rules}
+
+    def get_game(self, room_id: str) -> Game:
+
+        while True:
+
+            game = self.__games.get(room_id)
+
+            if game is None:
+                with ThreadLockContext(self.lock):
+
+                    game = self.__games.get(room_id)
+
+                    if game is None:
+
+                        if len(self.__games) >= MAX_ROOM_COUNT:
+                            exception = TooManyRoomsException(room_id)
+                            self.__logger.warn(exception.message)
+                            raise exception
+
+                        game = Game(
+                            room_id,
+                            scheduler=self.scheduler,
+                            journal=self.journal,
+                        )
+                        if self.initial_rules:
+                            game.update_rules(
+                                self.initial_rules,
+                                operator_name="server setup",
+                                operator_is_player=False,
+                            )
+                        self.__games[room_id] = game
+                        self.__logger.info(f"Room#{room_id} created.")
+
+            # Once the game is touched and still registered, it won't be
+            # evicted soon, as eviction re-checks it after unregistering.
+            # (So requests don't wait for the game lock here.)
+            game.touch()
+            if self.__games.get(room_id) is game:
+                return game
+
+    def find_game(self, room_id: str) -> Game:
+        """Get an existing game for reading, without creating it or marking
+        it as accessed, so that reads never keep rooms from being evicted.
+        (Raises `RoomNotFoundException`.)"""
+        game = self.__games.get(room_id)
+        if game is None:
+            raise RoomNotFoundException(room_id)
+        return game
+
+    def evict_idle_games(self) -> None:
+
+        idle_timeout_seconds = ROOM_IDLE_TIMEOUT.total_seconds()
+
+        for room_id, game in list(self.__games.items()):
+            if not game.is_idle(idle_timeout_seconds):  # lock-free pre-check
+                continue
+            with ThreadLockContext(self.lock):
+                if self.__games.get(room_id) is not game:
+                    continue  # evicted meanwhile
+                del self.__games[room_id]
+                if not game.is_idle(idle_timeout_seconds):  # touched meanwhile
+                    self.__games[room_id] = game
+                    continue
+                if game.started:  # abandoned by its players
+                    game.stop(operator_name=None, operator_is_player=False)
+                if self.journal is not None:
+                    self.journal.append(room_id, "evict", {})
+            self.__logger.info(f"Room#{room_id} evicted due to inactivity.")
+
+    def enable_journal(self, directory: str | Path) -> None:
+        """Recover the games persisted in the journal in `directory`, and
+        journal the actions of all games from now on. (Should be called
+        before any game is created.)"""
+
+        journal = Journal(directory)
+
+        with ThreadLockContext(self.lock):
+
+            assert self.journal is None and not self.__games
+
+            timestamp_begin = perf_counter()
+            snapshot, entries = journal.load()
+            timestamp_loaded = perf_counter()
+
+            if snapshot is not None:
+                for room_id, game_snapshot in snapshot["games"].items():
+                    restored_game = Game(room_id, scheduler=self.scheduler)
+                    restored_game.restore_snapshot(game_snapshot)
+                    self.__games[room_id] = restored_game
+
+            replay_count = 0
+            for entry in entries:
+                room_id = entry["room"]
+                game = self.__games.get(room_id)
+                if (game is not None) and (entry["seq"] <= game.journal_seq):
+                    continue  # included in the snapshot
+                if entry["action"] == "evict":
+                    self.__games.pop(room_id, None)
+                    continue
+                if game is None:
+                    game = self.__games[room_id] = Game(
+                        room_id,
+                        scheduler=self.scheduler,
+                    )
+                try:
+                    game.replay(entry)
+                except ApiException as exception:
+                    self.__logger.warn(
+                        f"Failed to replay entry#{entry['seq']} of room#{room_id}: "
+                        + exception.message
+                    )
+                replay_count += 1
+
+            timestamp_replayed = perf_counter()
+            self.__logger.info(
+                f"Recovered {len(self.__games)} room(s) from {directory} "
+                f"({'with' if snapshot else 'without'} snapshot, "
+                f"{replay_count} entries replayed) in "
+                f"{timestamp_replayed - timestamp_begin:.3f}s "
+                f"(loading: {timestamp_loaded - timestamp_begin:.3f}s)."
+            )
+
+            journal.start()
+            atexit.register(journal.close)
+            self.journal = journal
+            for game in self.__games.values():
+                game.journal = journal
+                game.await_reconnections()
+
+        self.take_snapshot()  # so that replayed entries are compacted
+
+    def take_snapshot(self) -> None:
+        """Snapshot all games into the journal, which is then compacted.
+        (Games are snapshotted by the journal writer, so this only queues
+        the work and doesn't wait for game locks.)"""
+        journal = self.journal
+        if (journal is None) or journal.failed:
+            return
+        journal.rotate()  # entries from now on may not be in the snapshot
+        journal.write_snapshot(self.__get_game_snapshots)
+
+    def __get_game_snapshots(self) -> dict[str, GameSnapshot]:
+        return {game.tag: game.get_snapshot() for game in self.get_games()}
+
+    def start(self) -> None:
+        """Start the scheduler and periodical eviction of idle games
+        (and snapshots of the journal, if enabled)."""
+        self.scheduler.start()
+        self.__schedule_eviction()
+        if self.journal is not None:
+            self.__schedule_snapshot(self.journal.last_seq)
+
+    def __schedule_eviction(self) -> None:
+
+        def evict() -> None:
+            self.evict_idle_games()
+            self.__schedule_eviction()
+
+        self.scheduler.schedule(ROOM_EVICTION_INTERVAL.total_seconds(), evict)
+
+    def __schedule_snapshot(self, last_snapshot_seq: int) -> None:
+
+        def take_snapshot() -> None:
+            assert self.journal is not None
+            last_seq = self.journal.last_seq
+            if last_seq != last_snapshot_seq:
+                self.take_snapshot()
+            self.__schedule_snapshot(last_seq)
+
+        self.scheduler.schedule(
+            JOURNAL_SNAPSHOT_INTERVAL.total_seconds(), take_snapshot
+        )
+
+    def __on_scheduler_error(self, exception: Exception) -> None:
+        self.__logger.error(
+            "Error in scheduled task:\n" + "".join(format_exception(exception))
+        )
+
+    def __on_scheduler_task_done(
+        self,
+        lag_seconds: float,
+        duration_seconds: float,
+    ) -> None:
+        SCHEDULER_LAG.observe(lag_seconds)
+        SCHEDULER_TASK_DURATION.observe(duration_seconds)
+
+
+game_registry = GameRegistry()
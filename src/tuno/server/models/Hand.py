@@ -0,0 +1,86 @@
+from collections.abc import Iterable, Iterator
+
+from tuno.shared.card_codes import CARD_COUNT, CARDS
+from tuno.shared.deck import Deck
+
+NOT_IN_HAND = 0xFF  # position of codes not in hand (and code of holes)
+HOLE = bytes([NOT_IN_HAND])
+
+
+class Hand:
+    """Cards held by a player, stored as card codes in the order they
+    were drawn.
+
+    Codes are kept in a bytearray, along with the position of each code,
+    so that cards are looked up and removed in O(1). (A removed card
+    leaves a hole, and holes are dropped once they outnumber the cards.)
+    """
+
+    mask: int  # bitmask of card codes in hand (see `get_card_mask()`)
+
+    __codes: bytearray  # with holes
+    __positions: bytearray  # card code -> position in `__codes`
+    __hole_count: int
+
+    def __init__(self) -> None:
+        self.mask = 0
+        self.__codes = bytearray()
+        self.__positions = bytearray([NOT_IN_HAND]) * CARD_COUNT
+        self.__hole_count = 0
+
+    def __len__(self) -> int:
+        return len(self.__codes) - self.__hole_count
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__get_codes())
+
+    def __contains__(self, code: int) -> bool:
+        return self.__positions[code] != NOT_IN_HAND
+
+    def add(self, code: int) -> None:
+        assert self.__positions[code] == NOT_IN_HAND
+        self.__positions[code] = len(self.__codes)
+        self.__codes.append(code)
+        self.mask |= 1 << code
+
+    def extend(self, codes: Iterable[int]) -> None:
+        for code in codes:
+            self.add(code)
+
+    def remove(self, code: int) -> None:
+        """Remove the card. (Raises `KeyError` if it is not in hand.)"""
+
+        positions = self.__positions
+
+        position = positions[code]
+        if position == NOT_IN_HAND:
+            raise KeyError(code)
+
+        self.__codes[position] = NOT_IN_HAND
+        positions[code] = NOT_IN_HAND
+        self.mask &= ~(1 << code)
+
+        self.__hole_count += 1
+        if self.__hole_count > len(self):
+            self.__compact()
+
+    def clear(self) -> None:
+        for code in self.__get_codes():
+            self.__positions[code] = NOT_IN_HAND
+        self.__codes.clear()
+        self.__hole_count = 0
+        self.mask = 0
+
+    def to_deck(self) -> Deck:
+        return [CARDS[code] for code in self.__get_codes()]
+
+    def __get_codes(self) -> bytes:
+        codes = bytes(self.__codes)
+        return codes.replace(HOLE, b"") if self.__hole_count else codes
+
+    def __compact(self) -> None:
+        codes = self.__codes = bytearray(self.__get_codes())
+        positions = self.__positions
+        for position, code in enumerate(codes):
+            positions[code] = position
+        self.__hole_count = 0
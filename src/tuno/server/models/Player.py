@@ -1,6 +1,6 @@
 from collections.abc import Generator, Iterable, Sequence
 from contextlib import contextmanager
-from queue import Queue
+from operator import attrgetter
 from random import choice
 from threading import RLock
 from time import monotonic
@@ -8,26 +8,44 @@ from time import monotonic
 from tuno.server.config import PLAYER_MESSAGE_QUEUE_SIZE
 from tuno.server.exceptions import CardIdsNotFoundException
 from tuno.server.utils.Logger import Logger
-from tuno.shared.check_play import InvalidPlayException, check_play
-from tuno.shared.constraints import DEFAULT_BOT_PLAY_DELAY_SECONDS
-from tuno.shared.deck import BasicCardColor, Card, Deck, basic_card_colors
-from tuno.shared.LazyTimer import LazyTimer
+from tuno.server.utils.MessageQueue import MessageQueue
+from tuno.shared.card_codes import (
+    CARD_CODES_BY_ID,
+    CARD_IDS,
+    CARD_TYPES,
+    iter_card_mask,
+)
+from tuno.shared.check_play import playable_mask
+from tuno.shared.deck import BasicCardColor, basic_card_colors
+from tuno.shared.game_state_patch import (
+    apply_game_state_patch,
+    compose_game_state_patches,
+)
 from tuno.shared.rules import GameRules
-from tuno.shared.sse_events import CardsEvent, ServerSentEvent
-from tuno.shared.ThreadLockContext import ThreadLockContext
+from tuno.shared.Scheduler import ScheduledTask
+from tuno.shared.sse_events import (
+    CardsEvent,
+    GameStateEvent,
+    GameStatePatchEvent,
+    ServerSentEvent,
+)
+from tuno.shared.ThreadLockContext import ThreadLockContext, name_lock
+
+from .Hand import Hand
 
 
 class Player:
 
     is_bot: bool
     name: str
-    cards: Deck
+    cards: Hand
     last_result: int
-    message_queue: Queue[ServerSentEvent]
+    message_queue: MessageQueue[ServerSentEvent]
     lock: RLock
-    connected: bool  # set by game watcher
+    connected: bool  # updated by connection checks
     subscription_token: str
-    bot_play_timer: LazyTimer | None
+    connection_watchdog: ScheduledTask | None
+    latest_cards: tuple[int, CardsEvent] | None  # (version, event) published
     __logger: Logger
     __last_pending_timestamp: float | None
     __last_sent_timestamp: float | None
@@ -36,15 +54,18 @@ class Player:
 
         self.is_bot = is_bot
         self.name = name
-        self.cards = []
+        self.cards = Hand()
         self.last_result = -1
-        self.message_queue = Queue(PLAYER_MESSAGE_QUEUE_SIZE)
-        self.lock = RLock()
-        self.connected = False
-        self.subscription_token = ""
-        self.bot_play_timer = (
-            LazyTimer(DEFAULT_BOT_PLAY_DELAY_SECONDS) if is_bot else None
+        self.message_queue = MessageQueue(
+            PLAYER_MESSAGE_QUEUE_SIZE,
+            get_key=attrgetter("coalescing_key"),
+            merge=merge_events,
         )
+        self.lock = name_lock(RLock(), "player")
+        self.connected = is_bot
+        self.subscription_token = ""
+        self.connection_watchdog = None
+        self.latest_cards = None
         self.__logger = Logger(f"{__name__}#{name}")
         self.__last_pending_timestamp = None
         self.__last_sent_timestamp = None
@@ -61,71 +82,104 @@ class Player:
 
     @contextmanager
     def message_context(self) -> Generator[None]:
-        with ThreadLockContext(self.lock):
-            self.__last_pending_timestamp = monotonic()
-            yield
-            self.__last_pending_timestamp = None
-            self.__last_sent_timestamp = monotonic()
+        # The player lock is intentionally not held here, otherwise
+        # producers would be blocked by slow network writes.
+        self.__last_pending_timestamp = monotonic()
+        yield
+        self.__last_pending_timestamp = None
+        self.__last_sent_timestamp = monotonic()
 
     def get_cards_event(self) -> CardsEvent:
-        return CardsEvent(self.cards)
-
-    def give_out_cards(self, card_ids: Sequence[str]) -> Deck:
+        return CardsEvent(self.cards.to_deck())
 
-        if len(card_ids) == 0:
-            return []
+    def get_latest_cards_event(self) -> CardsEvent:
+        """Get the cards last published by the game, or the current cards
+        if nothing has been published yet."""
+        latest_cards = self.latest_cards
+        if latest_cards is None:
+            return self.get_cards_event()
+        return latest_cards[1]
 
-        cards_ids_remaining = set(card_ids)
-        cards_left: Deck = []
-        cards_out: Deck = []
+    def find_cards(self, card_ids: Sequence[str]) -> bytearray:
+        """Get the codes of the cards in hand, without removing them.
+        (Raises `CardIdsNotFoundException` if any of them is not found.)"""
 
         with ThreadLockContext(self.lock):
 
-            for card in self.cards:
-                if card["id"] in cards_ids_remaining:
-                    cards_ids_remaining.remove(card["id"])
-                    cards_out.append(card)
+            cards_out = bytearray()
+            cards_ids_not_found: list[str] = []
+            for card_id in dict.fromkeys(card_ids):
+                code = CARD_CODES_BY_ID.get(card_id)
+                if (code is not None) and (code in self.cards):
+                    cards_out.append(code)
                 else:
-                    cards_left.append(card)
-
-            if len(cards_ids_remaining) > 0:
-                raise CardIdsNotFoundException(cards_ids_remaining)
+                    cards_ids_not_found.append(card_id)
 
-            self.cards = cards_left
+            if len(cards_ids_not_found) > 0:
+                raise CardIdsNotFoundException(cards_ids_not_found)
 
         return cards_out
 
+    def give_out_cards(self, codes: Iterable[int]) -> None:
+        """Remove the cards (found by `find_cards()`) from hand."""
+        with ThreadLockContext(self.lock):
+            for code in codes:
+                self.cards.remove(code)
+
     def bot_play(
         self,
         *,
         lead_color: BasicCardColor,
-        lead_card: Card,
+        lead_card: int,
         skip_counter: int,
         rules: GameRules,
     ) -> tuple[list[str], BasicCardColor | None]:
         with ThreadLockContext(self.lock):
 
+            playable_cards = playable_mask(
+                self.cards.mask,
+                lead_card,
+                lead_color,
+                skip_counter,
+            )
+
             candidates: list[tuple[list[str], BasicCardColor | None]] = []
-            for card in self.cards:
-                colors: Iterable[BasicCardColor | None] = (
-                    basic_card_colors if card["type"] == "wild" else [None]
-                )
-                for color in colors:
-                    try:
-                        check_play(
-                            [card],
-                            color,
-                            lead_color=lead_color,
-                            lead_card=lead_card,
-                            skip_counter=skip_counter,
-                            rules=rules,
-                        )
-                    except InvalidPlayException:
-                        continue
-                    else:
-                        candidates.append(([card["id"]], color))
+            for card in iter_card_mask(playable_cards):
+                card_ids = [CARD_IDS[card]]
+                if CARD_TYPES[card] == "wild":
+                    candidates.extend((card_ids, color) for color in basic_card_colors)
+                else:
+                    candidates.append((card_ids, None))
 
             if len(candidates) == 0:
                 return ([], None)  # pass
             else:
                 return choice(candidates)
+
+
+def merge_events(
+    pending_event: ServerSentEvent,
+    event: ServerSentEvent,
+) -> ServerSentEvent:
+    """Merge a queued event with the event superseding it (see
+    `ServerSentEvent.coalescing_key`), keeping chains of game state
+    patches applicable by subscribers. (The merged event takes the id
+    of the latter one, as it covers the stream up to there.)"""
+    merged_event: ServerSentEvent
+    if isinstance(event, GameStatePatchEvent) and (
+        event.data["base_version"] == pending_event.data["version"]
+    ):
+        if isinstance(pending_event, GameStatePatchEvent):
+            merged_event = GameStatePatchEvent(
+                compose_game_state_patches(pending_event.data, event.data)
+            )
+        elif isinstance(pending_event, GameStateEvent):
+            merged_event = GameStateEvent(
+                apply_game_state_patch(pending_event.data, event.data)
+            )
+        else:
+            return event
+        if event.id is not None:
+            merged_event.assign_id(event.id)
+        return merged_event
+    return event
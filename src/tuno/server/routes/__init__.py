@@ -1,10 +1,15 @@
 from importlib import import_module
 from pathlib import Path
+from time import perf_counter
+from typing import Any
 
-from flask import Blueprint
+from flask import Blueprint, Response, g, request
 
 from tuno.server.exceptions import ApiException
+from tuno.server.metrics import REQUEST_DURATION
+from tuno.server.utils.checkers import check_room_id
 from tuno.server.utils.Logger import Logger
+from tuno.shared.ThreadLockContext import LockTimeoutError
 
 __logger = Logger(__name__)
 __routes_dir = Path(__file__).parent
@@ -52,9 +57,35 @@ def load_routes() -> Blueprint:
 
     blueprint = __load_routes("backend", __routes_dir)
 
+    @blueprint.url_value_preprocessor
+    def pull_room_id(endpoint: str | None, values: dict[str, Any] | None) -> None:
+        if values and "room_id" in values:
+            room_id = values.pop("room_id")
+            check_room_id(room_id)
+            g.room_id = room_id
+
+    @blueprint.before_request
+    def start_request_timer() -> None:
+        g.request_timestamp = perf_counter()
+
+    @blueprint.after_request
+    def observe_request_duration(response: Response) -> Response:
+        if "request_timestamp" in g:
+            route = request.url_rule.rule if request.url_rule else "unknown"
+            REQUEST_DURATION.observe(
+                perf_counter() - g.request_timestamp,
+                (request.method, route),
+            )
+        return response
+
     @blueprint.errorhandler(ApiException)
     def handle_api_exception(exception: ApiException) -> tuple[str, int]:
         __logger.warn(f"ApiException({exception.http_code}): {exception.message}")
         return exception.message, exception.http_code
 
+    @blueprint.errorhandler(LockTimeoutError)
+    def handle_lock_timeout(exception: LockTimeoutError) -> tuple[str, int]:
+        __logger.error(f"LockTimeoutError: {exception}")
+        return "The server is busy. Please try again later.", 503
+
     return blueprint
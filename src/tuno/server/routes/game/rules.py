@@ -5,6 +5,7 @@ from flask.typing import ResponseReturnValue
 
 from tuno.server.exceptions import InvalidRequestBodyException
 from tuno.server.utils.checkers import check_player_name
+from tuno.server.utils.get_current_game import get_current_game
 from tuno.server.utils.Logger import Logger
 
 logger = Logger(__name__)
@@ -27,7 +28,7 @@ def setup(blueprint: Blueprint) -> None:
                 f"expected a dict of modified rules, got {modified_rules!r}"
             )
 
-        from tuno.server.models.Game import game
+        game = get_current_game()
 
         game.update_rules(
             cast(dict[str, object], modified_rules),
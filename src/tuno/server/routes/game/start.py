@@ -2,6 +2,7 @@ from flask import Blueprint, request
 from flask.typing import ResponseReturnValue
 
 from tuno.server.utils.checkers import check_player_name
+from tuno.server.utils.get_current_game import get_current_game
 from tuno.server.utils.Logger import Logger
 
 logger = Logger(__name__)
@@ -18,7 +19,7 @@ def setup(blueprint: Blueprint) -> None:
         else:
             player_name = "(anonymous)"
 
-        from tuno.server.models.Game import game
+        game = get_current_game()
 
         game.start(player_name)
 
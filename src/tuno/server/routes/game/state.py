@@ -0,0 +1,25 @@
+from functools import partial
+
+from flask import Blueprint
+from flask.typing import ResponseReturnValue
+
+from tuno.server.utils.conditional_requests import (
+    get_game_state_etag,
+    get_game_state_snapshot,
+    respond_conditionally,
+)
+from tuno.server.utils.get_current_game import find_current_game
+
+
+def setup(blueprint: Blueprint) -> None:
+
+    @blueprint.get("/state")
+    def get_game_state() -> ResponseReturnValue:
+
+        game = find_current_game()
+
+        return respond_conditionally(
+            game,
+            partial(get_game_state_etag, game),
+            partial(get_game_state_snapshot, game),
+        )
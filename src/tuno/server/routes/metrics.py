@@ -0,0 +1,16 @@
+from flask import Blueprint
+from flask.typing import ResponseReturnValue
+
+from tuno.server.metrics import render_metrics
+from tuno.server.models.GameRegistry import game_registry
+
+
+def setup(blueprint: Blueprint) -> None:
+
+    @blueprint.get("/metrics")
+    def metrics() -> ResponseReturnValue:
+        return (
+            render_metrics(game_registry),
+            200,
+            {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
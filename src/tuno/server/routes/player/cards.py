@@ -0,0 +1,29 @@
+from functools import partial
+
+from flask import Blueprint
+from flask.typing import ResponseReturnValue
+
+from tuno.server.utils.checkers import check_player_name
+from tuno.server.utils.conditional_requests import (
+    get_cards_etag,
+    get_cards_snapshot,
+    respond_conditionally,
+)
+from tuno.server.utils.get_current_game import find_current_game
+
+
+def setup(blueprint: Blueprint) -> None:
+
+    @blueprint.get("/<player_name>/cards")
+    def get_player_cards(player_name: str) -> ResponseReturnValue:
+
+        check_player_name(player_name)
+
+        game = find_current_game()
+        player = game.get_player(player_name)
+
+        return respond_conditionally(
+            game,
+            partial(get_cards_etag, game, player),
+            partial(get_cards_snapshot, game, player),
+        )
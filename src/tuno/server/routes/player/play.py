@@ -5,6 +5,7 @@ from flask.typing import ResponseReturnValue
 
 from tuno.server.exceptions import InvalidRequestBodyException
 from tuno.server.utils.checkers import check_player_name
+from tuno.server.utils.get_current_game import get_current_game
 from tuno.server.utils.Logger import Logger
 from tuno.shared.deck import BasicCardColor, basic_card_colors
 
@@ -36,7 +37,7 @@ def setup(blueprint: Blueprint) -> None:
         if TYPE_CHECKING:
             play_color = cast(BasicCardColor, play_color)
 
-        from tuno.server.models.Game import game
+        game = get_current_game()
 
         game.play(player_name, card_ids, play_color)
 
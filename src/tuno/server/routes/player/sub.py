@@ -1,143 +1,107 @@
 from collections.abc import Generator
-from queue import Empty
-from secrets import token_hex
 from time import monotonic
 
-from flask import Blueprint, Response
+from flask import Blueprint, Response, request
 from flask.typing import ResponseReturnValue
 
-from tuno.server.config import (
-    HEARTBEAT_GAP,
-    MAX_MESSAGES_PER_LOOP,
-    SUBSCRIPTION_LOOP_INTERVAL,
-    SUBSCRIPTION_LOOP_SLOW_THRESHOLD,
-    SUBSCRIPTION_TOKEN_BYTES,
-)
-from tuno.server.utils.checkers import check_player_name
+from tuno.server.config import SUBSCRIPTION_SLOW_WRITE_THRESHOLD
+from tuno.server.metrics import SSE_SLOW_WRITES
+from tuno.server.utils.checkers import check_event_encoding, check_player_name
+from tuno.server.utils.get_current_game import get_current_game
 from tuno.server.utils.Logger import Logger
-from tuno.shared.loop import loop
-from tuno.shared.sse_events import (
-    EndOfConnectionEvent,
-    GameStateEvent,
-    SubscriptionChangeEvent,
-)
-from tuno.shared.ThreadLockContext import ThreadLockContext
+from tuno.server.utils.StreamCompressor import negotiate_content_encoding
+from tuno.server.utils.Subscription import HEARTBEAT, Subscription
+from tuno.shared.event_encoding import DEFAULT_EVENT_ENCODING
 
 logger = Logger(__name__)
 
 
 def setup(blueprint: Blueprint) -> None:
 
-    HEARTBEAT_GAP_SECONDS = HEARTBEAT_GAP.total_seconds()
+    SLOW_WRITE_THRESHOLD_SECONDS = SUBSCRIPTION_SLOW_WRITE_THRESHOLD.total_seconds()
 
     @blueprint.get("/<player_name>")
     def player_subscription(player_name: str) -> ResponseReturnValue:
 
         check_player_name(player_name)
+        event_encoding = check_event_encoding(
+            request.args.get("encoding", DEFAULT_EVENT_ENCODING)
+        )
 
-        from tuno.server.models.Game import game
+        game = get_current_game()
 
         player = game.get_player(player_name, allow_creation=True)
-        subscription_token = token_hex(SUBSCRIPTION_TOKEN_BYTES)
-        player.subscription_token = subscription_token
-
-        def event_generator() -> Generator[str]:
+        content_encoding = negotiate_content_encoding(
+            request.headers.get("Accept-Encoding")
+        )
+        subscription = Subscription(
+            game,
+            player,
+            last_event_id=request.headers.get("Last-Event-ID"),
+            content_encoding=content_encoding,
+            event_encoding=event_encoding,
+        )
+
+        def event_generator() -> Generator[bytes]:
 
             # send first heartbeat
-            with player.message_context():
-                yield f":\n\n"
-            logger.info(
-                f"Connected with player#{player_name}. "
-                f"(subscription_token: {subscription_token})"
-            )
+            with subscription.message_context(HEARTBEAT) as data:
+                yield data
+            logger.info(f"Connected with {subscription!r}.")
 
             # send initial states
-            with player.message_context():
-                yield game.get_game_state_event().to_sse()
-                yield player.get_cards_event().to_sse()
-            logger.debug(
-                f"Sent initial states to player#{player_name}. "
-                f"(subscription_token: {subscription_token})"
-            )
-
-            # slow iteration detection
-            def on_slow(continuous_slow_count: int) -> None:
-                if continuous_slow_count >= SUBSCRIPTION_LOOP_SLOW_THRESHOLD:
+            initial_states = subscription.get_initial_states()
+            with subscription.message_context(initial_states) as data:
+                yield data
+            logger.debug(lambda: f"Sent initial states to {subscription!r}.")
+
+            # message loop: sleep until new messages arrive or
+            # a heartbeat is due, then send all pending messages at once
+            while True:
+
+                events = player.message_queue.drain(
+                    subscription.get_heartbeat_timeout(),
+                    is_active=lambda: subscription.active,
+                )
+
+                if not subscription.active:
+                    break
+
+                if not events:
+                    with subscription.message_context(HEARTBEAT) as data:
+                        yield data
+                    continue
+
+                chunk, end_of_connection = subscription.encode_events(events)
+
+                timestamp_begin = monotonic()
+                with subscription.message_context(
+                    chunk,
+                    final=end_of_connection,
+                ) as data:
+                    yield data
+                write_duration = monotonic() - timestamp_begin
+                if write_duration >= SLOW_WRITE_THRESHOLD_SECONDS:
+                    SSE_SLOW_WRITES.inc()
                     logger.warn(
-                        "The subscription loop seems to be slow. "
-                        f"(subscription_token: {subscription_token}; "
-                        f"continuous_slow_count: {continuous_slow_count})"
+                        f"Slow write to {subscription!r}: "
+                        f"{len(events)} event(s) took {write_duration:.3f}s."
                     )
 
-            # message loop
-            for _ in loop(SUBSCRIPTION_LOOP_INTERVAL, on_slow=on_slow):
-                with ThreadLockContext(player.lock):
-
-                    for _ in range(MAX_MESSAGES_PER_LOOP):
-
-                        if player.subscription_token != subscription_token:
-                            break
-
-                        try:
-                            event = player.message_queue.get_nowait()
-                        except Empty:
-                            break
-                        else:
-
-                            with player.message_context():
-                                yield event.to_sse()
-                            player.message_queue.task_done()
-                            logger.debug(
-                                f"Event sent to player#{player_name} "
-                                f"(subscription_token: {subscription_token}): "
-                                + repr(event)
-                            )
-
-                            if isinstance(event, EndOfConnectionEvent):
-                                player.subscription_token = ""
-                                logger.debug(
-                                    "Stopped subscription from "
-                                    f"player#{player_name} due to the presence"
-                                    f"of an {EndOfConnectionEvent.__name__}. "
-                                    f"(subscription_token: {subscription_token})"
-                                )
-                                return
-
-                    if player.subscription_token != subscription_token:
-                        break
-
-                    if (
-                        monotonic() - (player.last_sent_timestamp or 0)
-                        >= HEARTBEAT_GAP_SECONDS
-                    ):
-                        with player.message_context():
-                            yield f":\n\n"  # heartbeat
-                        # logger.debug(f"Heartbeat sent to player#{player_name}.")
-
-            if player.subscription_token:  # replaced by another subscription
-                event = SubscriptionChangeEvent()
-                with player.message_context():
-                    yield event.to_sse()
-                logger.debug(
-                    f"Event sent to player#{player_name} "
-                    f"(subscription_token: {subscription_token}): " + repr(event)
-                )
+                if end_of_connection:
+                    return
 
-            logger.info(
-                f"Subscription stopped for player#{player_name}. "
-                f"(subscription_token: {subscription_token})"
-            )
+            final_message = subscription.get_final_message()
+            with subscription.message_context(final_message, final=True) as data:
+                if data:  # unless empty and uncompressed
+                    yield data
 
-        response = Response(event_generator(), mimetype="text/event-stream")
+            logger.info(f"Subscription stopped for {subscription!r}.")
 
-        @response.call_on_close
-        def on_close() -> None:
-            with ThreadLockContext(player.lock):
-                if player.subscription_token == subscription_token:
-                    player.subscription_token = ""
-                    logger.info(
-                        f"Disconnected from player#{player_name}. "
-                        f"(subscription_token: {subscription_token})"
-                    )
+        response = Response(event_generator(), mimetype="text/event-stream")
+        response.vary.add("Accept-Encoding")
+        if content_encoding is not None:
+            response.content_encoding = content_encoding
+        response.call_on_close(subscription.close)
 
         return response
@@ -0,0 +1,39 @@
+from collections.abc import Callable
+from threading import Condition
+
+
+class ChangeNotifier:
+    """Wake up waiters when something (e.g. a game state) changes.
+
+    Threads wait with `wait_for()`, while consumers outside of threads
+    (e.g. coroutines) register wakers, as with `MessageQueue`.
+    """
+
+    __condition: Condition
+    __wakers: list[Callable[[], None]]
+
+    def __init__(self) -> None:
+        self.__condition = Condition()
+        self.__wakers = []
+
+    def notify(self) -> None:
+        with self.__condition:
+            self.__condition.notify_all()
+            for waker in self.__wakers:
+                waker()
+
+    def wait_for(self, predicate: Callable[[], bool], timeout_seconds: float) -> bool:
+        """Wait until `predicate()` becomes true, which is checked on every
+        change, and return its last result."""
+        with self.__condition:
+            return self.__condition.wait_for(predicate, timeout_seconds)
+
+    def add_waker(self, waker: Callable[[], None]) -> None:
+        """Register a callback to be called (in the notifying thread, so it
+        should return quickly) on every change."""
+        with self.__condition:
+            self.__wakers.append(waker)
+
+    def remove_waker(self, waker: Callable[[], None]) -> None:
+        with self.__condition:
+            self.__wakers.remove(waker)
@@ -0,0 +1,318 @@
+import json
+import os
+from collections.abc import Callable, Iterator
+from itertools import count
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Thread
+from traceback import format_exception
+from typing import Any, Literal, TextIO, TypedDict, cast
+
+from tuno.shared.rules import GameRules
+
+from .Logger import Logger
+
+SNAPSHOT_FILE_NAME = "snapshot.json"
+SEGMENT_FILE_PATTERN = "journal-*.jsonl"
+SNAPSHOT_FORMAT = 1
+
+
+type JournalAction = Literal[
+    "join",
+    "rules",
+    "start",
+    "play",
+    "kick",
+    "stop",
+    "leave",
+    "evict",
+]
+
+
+class JournalEntry(TypedDict):
+    seq: int  # increasing, and unique across rooms
+    room: str
+    action: JournalAction
+    args: dict[str, Any]
+
+
+class PlayerSnapshot(TypedDict):
+    name: str
+    is_bot: bool
+    cards: str  # hex of card codes
+    last_result: int
+
+
+class GameSnapshot(TypedDict):
+    seq: int  # of the last entry included
+    started: bool
+    rules: GameRules
+    players: list[PlayerSnapshot]
+    draw_pile: str  # hex of card codes
+    discard_pile: str
+    current_player_index: int
+    direction: int
+    lead_card: int | None
+    lead_color: str | None
+    draw_counter: int
+    skip_counter: int
+    turn_count: int
+    reshuffle_count: int
+    winner_index: int
+    state_version: int
+    seed: int  # of the last start
+
+
+class Snapshot(TypedDict):
+    format: int
+    segment: int  # the first segment to replay after the snapshot
+    games: dict[str, GameSnapshot]
+
+
+type SnapshotFactory = Callable[[], dict[str, GameSnapshot]]
+
+type JournalCommand = (
+    tuple[Literal["entry"], JournalEntry]
+    | tuple[Literal["rotate"], None]
+    | tuple[Literal["snapshot"], SnapshotFactory]
+    | tuple[Literal["stop"], None]
+)
+
+
+def get_segment_index(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+class Journal:
+    """An append-only journal of game actions, with snapshots.
+
+    Entries are appended by games when their transactions commit, which
+    only assigns a sequence number and puts the entry into a queue. A
+    background thread serializes the entries into the current segment
+    file and fsyncs once per batch of entries taken from the queue.
+
+    To compact the journal, a new segment is started (`rotate()`), then
+    the games are snapshotted and the snapshot is written (`write_snapshot()`),
+    after which the segments before the rotation are deleted. Recovery
+    (`load()`) reads the latest snapshot and the entries after it; an entry
+    is only replayed on a game whose snapshot doesn't include it yet.
+
+    If writing fails (e.g. the disk is full), the error is logged and the
+    journal is marked as `failed`: later entries are dropped instead of
+    piling up in the queue, and `append()` returns `None` for them.
+    """
+
+    directory: Path
+
+    __sequence: Iterator[int]
+    __last_seq: int
+    __segment_index: int
+    __first_segment_index: int  # of the last rotation
+    __queue: SimpleQueue[JournalCommand]
+    __thread: Thread | None
+    __failed: bool
+    __logger: Logger
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.__sequence = count(1)
+        self.__last_seq = 0
+        self.__segment_index = 0
+        self.__first_segment_index = 0
+        self.__queue = SimpleQueue()
+        self.__thread = None
+        self.__failed = False
+        self.__logger = Logger(__name__)
+
+    @property
+    def failed(self) -> bool:
+        """Whether writing has failed, after which nothing is journaled."""
+        return self.__failed
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the last entry appended (or loaded)."""
+        return self.__last_seq
+
+    def load(self) -> tuple[Snapshot | None, list[JournalEntry]]:
+        """Read the latest snapshot and the entries after it, and continue
+        numbering after them. (Should be called before `start()`.)"""
+
+        snapshot: Snapshot | None = None
+        snapshot_path = self.directory / SNAPSHOT_FILE_NAME
+        if snapshot_path.exists():
+            with snapshot_path.open(encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            assert snapshot is not None
+            if snapshot["format"] != SNAPSHOT_FORMAT:
+                raise ValueError(f"Unknown snapshot format: {snapshot['format']}")
+
+        first_segment_index = snapshot["segment"] if snapshot else 0
+        segment_paths = sorted(
+            self.directory.glob(SEGMENT_FILE_PATTERN),
+            key=get_segment_index,
+        )
+
+        entries: list[JournalEntry] = []
+        last_seq = max(
+            (game["seq"] for game in snapshot["games"].values()) if snapshot else (),
+            default=0,
+        )
+        for segment_path in segment_paths:
+            segment_index = get_segment_index(segment_path)
+            self.__segment_index = max(self.__segment_index, segment_index)
+            if segment_index < first_segment_index:
+                continue
+            with segment_path.open(encoding="utf-8") as segment_file:
+                for line in segment_file:
+                    try:
+                        entry: JournalEntry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # torn write of the last entry before a crash
+                        self.__logger.warn(
+                            f"Skipped the rest of {segment_path.name} "
+                            "after an incomplete entry."
+                        )
+                        break
+                    entries.append(entry)
+                    last_seq = max(last_seq, entry["seq"])
+
+        self.__last_seq = last_seq
+        self.__sequence = count(last_seq + 1)
+        return snapshot, entries
+
+    def start(self) -> None:
+        """Open a new segment and start writing entries in the background."""
+        self.__segment_index += 1
+        self.__first_segment_index = self.__segment_index
+        self.__thread = Thread(
+            target=self.__run,
+            args=(self.__open_segment(self.__segment_index),),
+            name="journal-writer",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def close(self) -> None:
+        """Write pending entries and stop the background thread."""
+        if self.__thread is not None:
+            self.__queue.put(("stop", None))
+            self.__thread.join()
+            self.__thread = None
+
+    def append(
+        self,
+        room_id: str,
+        action: JournalAction,
+        args: dict[str, Any],
+    ) -> int | None:
+        """Append an entry without blocking, and return its sequence number,
+        or `None` if the journal has failed and the entry is dropped.
+        (Entries of a room must be appended in order, e.g. under its lock.)"""
+        if self.__failed:
+            return None
+        seq = self.__last_seq = next(self.__sequence)
+        self.__queue.put(
+            ("entry", JournalEntry(seq=seq, room=room_id, action=action, args=args))
+        )
+        return seq
+
+    def rotate(self) -> None:
+        """Start a new segment for entries appended from now on."""
+        self.__queue.put(("rotate", None))
+
+    def write_snapshot(self, take_snapshot: SnapshotFactory) -> None:
+        """Snapshot the games by `take_snapshot()` after the last `rotate()`
+        and write the snapshot, then delete the segments before that
+        rotation. (This is done by the writer thread, so the caller
+        doesn't wait for the games.)"""
+        self.__queue.put(("snapshot", take_snapshot))
+
+    def __open_segment(self, index: int) -> TextIO:
+        path = self.directory / SEGMENT_FILE_PATTERN.replace("*", f"{index:06d}")
+        return path.open("a", encoding="utf-8")
+
+    def __run(self, segment_file: TextIO) -> None:
+
+        queue = self.__queue
+        commands: list[JournalCommand] = []
+
+        try:
+            while True:
+
+                commands = [queue.get()]
+                while not queue.empty():
+                    commands.append(queue.get())
+
+                for command_type, payload in commands:
+                    if command_type == "entry":
+                        segment_file.write(json.dumps(payload) + "\n")
+                    elif command_type == "rotate":
+                        self.__sync(segment_file)
+                        segment_file.close()
+                        self.__segment_index += 1
+                        self.__first_segment_index = self.__segment_index
+                        segment_file = self.__open_segment(self.__segment_index)
+                    elif command_type == "snapshot":
+                        self.__sync(segment_file)
+                        self.__take_snapshot(cast(SnapshotFactory, payload))
+                    elif command_type == "stop":
+                        self.__sync(segment_file)
+                        segment_file.close()
+                        return
+
+                self.__sync(segment_file)  # once per batch
+
+        except Exception as exception:
+            self.__failed = True
+            self.__logger.error(
+                "Failed to write the journal, so nothing is journaled from "
+                "now on (games are still hosted, but can't be recovered "
+                "after a restart):\n" + "".join(format_exception(exception))
+            )
+            try:
+                segment_file.close()
+            except Exception:
+                pass  # already reported
+
+        # discard the rest until stopped
+        if any(command_type == "stop" for command_type, _ in commands):
+            return
+        while queue.get()[0] != "stop":
+            pass
+
+    def __take_snapshot(self, take_snapshot: SnapshotFactory) -> None:
+        try:
+            games = take_snapshot()
+        except Exception as exception:
+            # the journal is still complete without the snapshot
+            self.__logger.error(
+                "Failed to snapshot games:\n" + "".join(format_exception(exception))
+            )
+            return
+        self.__write_snapshot_file(games)
+        self.__delete_segments_before(self.__first_segment_index)
+
+    def __sync(self, segment_file: TextIO) -> None:
+        segment_file.flush()
+        os.fsync(segment_file.fileno())
+
+    def __write_snapshot_file(self, games: dict[str, GameSnapshot]) -> None:
+        snapshot = Snapshot(
+            format=SNAPSHOT_FORMAT,
+            segment=self.__first_segment_index,
+            games=games,
+        )
+        path = self.directory / SNAPSHOT_FILE_NAME
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as temp_file:
+            json.dump(snapshot, temp_file, separators=(",", ":"))
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)  # atomically
+
+    def __delete_segments_before(self, index: int) -> None:
+        for segment_path in self.directory.glob(SEGMENT_FILE_PATTERN):
+            if get_segment_index(segment_path) < index:
+                segment_path.unlink()
@@ -0,0 +1,186 @@
+import atexit
+import json
+import sys
+from enum import IntEnum
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from time import localtime, strftime
+from typing import NamedTuple, TextIO
+
+import click
+
+
+class LogLevel(IntEnum):
+    DEBUG = 1
+    INFO = 2
+    WARN = 3
+    ERROR = 4
+
+
+LEVEL_STYLES: dict[LogLevel, tuple[str, str]] = {  # (fg, bg)
+    LogLevel.DEBUG: ("blue", "black"),
+    LogLevel.INFO: ("green", "black"),
+    LogLevel.WARN: ("yellow", "black"),
+    LogLevel.ERROR: ("red", "yellow"),
+}
+
+
+class LogRecord(NamedTuple):
+    timestamp: float  # seconds since the epoch
+    level: LogLevel
+    logger_name: str
+    message: str
+
+
+class LogWriter:
+    """Write log records in a background thread.
+
+    Loggers only put records into a queue, which never blocks, so that
+    threads holding locks (e.g. the game lock) don't wait for the console.
+    Records are written to the console with colors and, if a file is
+    opened by `open_json_file()`, to the file as JSON lines. Pending
+    records are flushed on exit, after which records are written
+    synchronously. (Writing a record takes no lock: the thread is started
+    once, and records put while closing are drained by whoever sees
+    them last.) Failures to write are reported to stderr (along with
+    the records, if they didn't reach the console) instead of stopping
+    the writer.
+    """
+
+    __queue: SimpleQueue[LogRecord | None]  # `None` stops the thread
+    __thread: Thread | None
+    __start_lock: Lock  # only taken to start the thread
+    __close_lock: Lock  # only taken to close
+    __closed: bool
+    __drained: bool  # whether the queue is drained on close (or being so)
+    __json_file: TextIO | None
+
+    def __init__(self) -> None:
+        self.__queue = SimpleQueue()
+        self.__thread = None
+        self.__start_lock = Lock()
+        self.__close_lock = Lock()
+        self.__closed = False
+        self.__drained = False
+        self.__json_file = None
+        atexit.register(self.close)
+
+    def open_json_file(self, path: str) -> None:
+        """Also write records to the file at `path` (appended, line-buffered)
+        as JSON lines."""
+        self.__json_file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, record: LogRecord) -> None:
+        if self.__closed:
+            self.__write_records([record])
+            return
+        if self.__thread is None:
+            self.__start()
+        self.__queue.put(record)
+        if self.__drained:  # closed meanwhile, so it may be missed
+            self.__drain()
+
+    def __start(self) -> None:
+        with self.__start_lock:
+            if self.__thread is None:  # not started meanwhile
+                thread = Thread(target=self.__run, name="log-writer", daemon=True)
+                thread.start()
+                self.__thread = thread
+
+    def close(self) -> None:
+        """Flush pending records and stop the background thread."""
+        with self.__close_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            with self.__start_lock:
+                thread = self.__thread
+            if thread is not None:
+                self.__queue.put(None)
+                thread.join()
+            # (set before draining, so that records put after this are
+            # drained by their writers)
+            self.__drained = True
+            self.__drain()
+            if self.__json_file is not None:
+                self.__json_file.close()
+                self.__json_file = None
+
+    def __run(self) -> None:
+        queue = self.__queue
+        while True:
+            # write all records available at once
+            records = [queue.get()]
+            while not queue.empty():
+                records.append(queue.get())
+            self.__write_records([record for record in records if record])
+            if None in records:
+                return  # records after it are drained by `close()`
+
+    def __drain(self) -> None:
+        """Write the records left in the queue synchronously."""
+        records: list[LogRecord] = []
+        while True:
+            try:
+                record = self.__queue.get_nowait()
+            except Empty:
+                break
+            if record is not None:
+                records.append(record)
+        self.__write_records(records)
+
+    def __write_records(self, records: list[LogRecord]) -> None:
+
+        if not records:
+            return
+
+        lines: list[str] = []
+        for record in records:
+            fg, bg = LEVEL_STYLES[record.level]
+            prefix = format_prefix(record)
+            lines.append(click.style(prefix, fg=fg, bg=bg) + " " + record.message)
+        try:
+            click.echo("\n".join(lines))
+        except Exception as error:
+            report_write_error(error, records)
+
+        json_file = self.__json_file
+        if json_file is not None:
+            try:
+                json_file.write(
+                    "".join(
+                        json.dumps(
+                            {
+                                "time": record.timestamp,
+                                "level": record.level.name,
+                                "logger": record.logger_name,
+                                "message": record.message,
+                            }
+                        )
+                        + "\n"
+                        for record in records
+                    )
+                )
+            except Exception as error:
+                report_write_error(error, [])
+
+
+def format_prefix(record: LogRecord) -> str:
+    timestamp = strftime("%Y-%m-%d %H:%M:%S", localtime(record.timestamp))
+    return f"[{timestamp}] {record.level.name:>5s} ({record.logger_name})"
+
+
+def report_write_error(error: Exception, unwritten_records: list[LogRecord]) -> None:
+    """Report a failure to write log records to stderr, along with the
+    records that are not written anywhere else."""
+    try:
+        sys.stderr.write(
+            f"Failed to write logs: {error!r}\n"
+            + "".join(
+                f"{format_prefix(record)} {record.message}\n"
+                for record in unwritten_records
+            )
+        )
+        sys.stderr.flush()
+    except Exception:
+        pass  # nowhere left to report
@@ -1,81 +1,46 @@
-from enum import IntEnum
-from functools import partialmethod
-from threading import RLock
-from time import strftime
+from collections.abc import Callable
+from time import time
 
-import click
+from .LogWriter import LogLevel, LogRecord, LogWriter
 
-from tuno.shared.ThreadLockContext import ThreadLockContext
-
-
-class LogLevel(IntEnum):
-    DEBUG = 1
-    INFO = 2
-    WARN = 3
-    ERROR = 4
+__all__ = ["LogLevel", "Logger"]  # LogLevel is re-exported for convenience
 
 
 class Logger:
+    """Log messages through the shared `LogWriter`.
+
+    A message can be given as a function returning it, which is only
+    called if the level is enabled, to skip costly formatting (e.g. of
+    debug messages) otherwise.
+    """
 
     name: str
     level: LogLevel = LogLevel.INFO
-    lock = RLock()  # cross-thread io lock
+    writer = LogWriter()  # shared by all loggers
 
     def __init__(self, name: str) -> None:
         self.name = name
 
-    def __log(
-        self,
-        content: str,
-        *,
-        level: LogLevel,
-        label: str,
-        fg: str,
-        bg: str,
-    ) -> None:
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        return level >= self.level
+
+    def __log(self, content: str | Callable[[], str], level: LogLevel) -> None:
         if level < self.level:
             return
-        timestamp = strftime("%Y-%m-%d %H:%M:%S")
-        message = (
-            click.style(
-                f"[{timestamp}] {label:>5s} ({self.name})",
-                fg=fg,
-                bg=bg,
-            )
-            + " "
-            + content
-        )
-        with ThreadLockContext(self.lock):
-            click.echo(message)
+        if callable(content):
+            content = content()
+        self.writer.write(LogRecord(time(), level, self.name, content))
+
+    # plain methods rather than `partialmethod`s, which are slower to call
 
-    debug = partialmethod(
-        __log,
-        level=LogLevel.DEBUG,
-        label="DEBUG",
-        fg="blue",
-        bg="black",
-    )
+    def debug(self, content: str | Callable[[], str]) -> None:
+        self.__log(content, LogLevel.DEBUG)
 
-    info = partialmethod(
-        __log,
-        level=LogLevel.INFO,
-        label="INFO",
-        fg="green",
-        bg="black",
-    )
+    def info(self, content: str | Callable[[], str]) -> None:
+        self.__log(content, LogLevel.INFO)
 
-    warn = partialmethod(
-        __log,
-        level=LogLevel.WARN,
-        label="WARN",
-        fg="yellow",
-        bg="black",
-    )
+    def warn(self, content: str | Callable[[], str]) -> None:
+        self.__log(content, LogLevel.WARN)
 
-    error = partialmethod(
-        __log,
-        level=LogLevel.ERROR,
-        label="ERROR",
-        fg="red",
-        bg="yellow",
-    )
+    def error(self, content: str | Callable[[], str]) -> None:
+        self.__log(content, LogLevel.ERROR)
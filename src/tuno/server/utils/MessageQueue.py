@@ -0,0 +1,144 @@
+from collections.abc import Callable, Hashable, Iterator
+from itertools import count
+from threading import Condition
+
+from tuno.server.metrics import MESSAGE_QUEUE_COALESCED, MESSAGE_QUEUE_DROPPED
+
+
+class MessageQueue[T]:
+    """A non-blocking, coalescing queue for pushing messages to a subscriber.
+
+    Unlike `queue.Queue`, the consumer waits for new messages and takes
+    all pending messages at once, and it can be woken up on demand
+    (e.g. when its subscription is replaced) so that it never has to poll.
+    Consumers outside of threads (e.g. coroutines) can register wakers,
+    which are called whenever they should check the queue again.
+
+    Producers never block: an item with a coalescing key (see `get_key`)
+    is merged with the pending item of the same key (see `merge`), and
+    other items are kept in order up to `maxsize`, beyond which the oldest
+    one is dropped and the queue is marked as overflowed, so that the
+    consumer can resynchronize instead (see `take_overflowed()`).
+
+    A merged item is moved to the end of the queue, as it is as recent as
+    the item just put. So items queued after the replaced one (e.g. the
+    notifications of a play) now come before it, which keeps event ids
+    increasing, as resumed streams require. (Clients don't rely on the
+    order of notifications and game states.)
+    """
+
+    maxsize: int
+
+    __items: dict[Hashable, T]  # in order; other items keyed by a counter
+    __unkeyed_count: int
+    __serial_numbers: Iterator[int]
+    __overflowed: bool
+    __get_key: Callable[[T], Hashable | None]
+    __merge: Callable[[T, T], T]
+    __condition: Condition
+    __wakers: list[Callable[[], None]]
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        get_key: Callable[[T], Hashable | None] = lambda item: None,
+        merge: Callable[[T, T], T] = lambda pending_item, item: item,
+    ) -> None:
+        """`get_key(item)` should return the coalescing key of the item,
+        or `None` if it shouldn't be coalesced. (Keys must not be ints.)
+        `merge(pending_item, item)` should return the item superseding
+        both, which is the latter one by default."""
+        self.maxsize = maxsize
+        self.__items = {}
+        self.__unkeyed_count = 0
+        self.__serial_numbers = count()
+        self.__overflowed = False
+        self.__get_key = get_key
+        self.__merge = merge
+        self.__condition = Condition()
+        self.__wakers = []
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def put(self, item: T) -> None:
+        """Put an item into the queue without blocking."""
+        key = self.__get_key(item)
+        with self.__condition:
+            items = self.__items
+            if key is None:
+                if self.__unkeyed_count >= self.maxsize:
+                    self.__drop_oldest_unkeyed()
+                else:
+                    self.__unkeyed_count += 1
+                items[next(self.__serial_numbers)] = item
+            else:
+                if key in items:
+                    item = self.__merge(items.pop(key), item)
+                    MESSAGE_QUEUE_COALESCED.inc()
+                items[key] = item
+            self.__notify()
+
+    def __drop_oldest_unkeyed(self) -> None:
+        for key in self.__items:
+            if isinstance(key, int):
+                del self.__items[key]
+                break
+        self.__overflowed = True
+        MESSAGE_QUEUE_DROPPED.inc()
+
+    def take_overflowed(self) -> bool:
+        """Check whether any item has been dropped since the last check."""
+        with self.__condition:
+            overflowed = self.__overflowed
+            self.__overflowed = False
+            return overflowed
+
+    def clear(self) -> None:
+        """Discard all pending items, along with the overflow mark."""
+        with self.__condition:
+            self.__items.clear()
+            self.__unkeyed_count = 0
+            self.__overflowed = False
+
+    def wake(self) -> None:
+        """Wake up waiting consumers so that they can re-check their state."""
+        with self.__condition:
+            self.__notify()
+
+    def add_waker(self, waker: Callable[[], None]) -> None:
+        """Register a callback to be called (in producer threads, so it
+        should return quickly) whenever waiting consumers are woken up."""
+        with self.__condition:
+            self.__wakers.append(waker)
+
+    def remove_waker(self, waker: Callable[[], None]) -> None:
+        with self.__condition:
+            self.__wakers.remove(waker)
+
+    def __notify(self) -> None:
+        self.__condition.notify_all()
+        for waker in self.__wakers:
+            waker()
+
+    def drain(
+        self,
+        timeout_seconds: float,
+        *,
+        is_active: Callable[[], bool],
+    ) -> list[T]:
+        """Wait until some items are available, then remove and return all of
+        them. An empty list is returned if the timeout expires or
+        `is_active()` becomes false before that."""
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: len(self.__items) > 0 or not is_active(),
+                timeout_seconds,
+            )
+            if not is_active():
+                return []
+            items = list(self.__items.values())
+            self.__items.clear()
+            self.__unkeyed_count = 0
+            return items
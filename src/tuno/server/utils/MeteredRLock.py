@@ -0,0 +1,42 @@
+from threading import RLock
+from time import perf_counter
+
+from tuno.server.metrics import Histogram
+
+
+class MeteredRLock:
+    """A reentrant lock which records how long it is waited for and held.
+
+    Only the outermost acquisition of each owner is recorded, so nested
+    locking (which is common in `Game`) adds little overhead.
+    """
+
+    __lock: RLock
+    __depth: int  # only changed by the owner
+    __acquired_timestamp: float
+    __wait_histogram: Histogram
+    __hold_histogram: Histogram
+
+    def __init__(self, *, wait_histogram: Histogram, hold_histogram: Histogram) -> None:
+        self.__lock = RLock()
+        self.__depth = 0
+        self.__acquired_timestamp = 0
+        self.__wait_histogram = wait_histogram
+        self.__hold_histogram = hold_histogram
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        timestamp_begin = perf_counter()
+        acquired = self.__lock.acquire(blocking, timeout)
+        if acquired:
+            self.__depth += 1
+            if self.__depth == 1:
+                timestamp = perf_counter()
+                self.__acquired_timestamp = timestamp
+                self.__wait_histogram.observe(timestamp - timestamp_begin)
+        return acquired
+
+    def release(self) -> None:
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.__hold_histogram.observe(perf_counter() - self.__acquired_timestamp)
+        self.__lock.release()
@@ -0,0 +1,61 @@
+import zlib
+from typing import Literal
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from tuno.server.config import (
+    SSE_COMPRESSION_LEVEL,
+    SSE_COMPRESSION_MEMORY_LEVEL,
+    SSE_COMPRESSION_WINDOW_BITS,
+)
+
+type ContentEncoding = Literal["gzip", "deflate"]
+
+CONTENT_ENCODINGS: tuple[ContentEncoding, ...] = ("gzip", "deflate")  # preferred first
+
+
+def negotiate_content_encoding(accept_encoding: str | None) -> ContentEncoding | None:
+    """Choose the content encoding of a stream by `Accept-Encoding`,
+    or `None` to send it uncompressed."""
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding, Accept)
+    for encoding in CONTENT_ENCODINGS:
+        if accept.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+class StreamCompressor:
+    """Compress a stream of chunks with one deflate context, so that later
+    chunks refer to earlier ones (e.g. game states repeating the same keys).
+    Each chunk is followed by a sync flush, so that it can be decoded as
+    soon as it's received.
+
+    The window and memory levels are lowered from the defaults of zlib,
+    as there's a context per subscriber: the window still spans a few
+    frames, while the memory per context shrinks from about 256 KiB to
+    about 40 KiB. (See `benchmarks/sse_compression.py`.)
+    """
+
+    encoding: ContentEncoding
+
+    __compressor: "zlib._Compress"
+
+    def __init__(self, encoding: ContentEncoding) -> None:
+        self.encoding = encoding
+        self.__compressor = zlib.compressobj(
+            SSE_COMPRESSION_LEVEL,
+            zlib.DEFLATED,
+            # +16 for a gzip header and trailer instead of zlib ones
+            SSE_COMPRESSION_WINDOW_BITS + (16 if encoding == "gzip" else 0),
+            SSE_COMPRESSION_MEMORY_LEVEL,
+        )
+
+    def compress(self, chunk: bytes, *, final: bool = False) -> bytes:
+        """Compress the chunk, and end the stream after it if `final`."""
+        compressor = self.__compressor
+        return compressor.compress(chunk) + compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
@@ -0,0 +1,253 @@
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from secrets import token_hex
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from tuno.server.config import HEARTBEAT_GAP, SUBSCRIPTION_TOKEN_BYTES
+from tuno.server.metrics import (
+    SSE_BYTES_SENT,
+    SSE_FRAMES_SENT,
+    SSE_HEARTBEATS_SENT,
+    SUBSCRIPTION_RESUMES,
+    SUBSCRIPTION_RESYNCS,
+)
+from tuno.server.utils.Logger import Logger
+from tuno.server.utils.StreamCompressor import ContentEncoding, StreamCompressor
+from tuno.shared.event_encoding import DEFAULT_EVENT_ENCODING, EventEncoding
+from tuno.shared.sse_events import (
+    EndOfConnectionEvent,
+    GameStateEvent,
+    GameStatePatchEvent,
+    ServerSentEvent,
+    SubscriptionChangeEvent,
+)
+from tuno.shared.ThreadLockContext import ThreadLockContext
+
+if TYPE_CHECKING:
+    from tuno.server.models.Game import Game
+    from tuno.server.models.Player import Player
+
+HEARTBEAT: bytes = b":\n\n"
+
+
+def encode_event_id(event_id: str) -> bytes:
+    """Encode a frame that only sets the last event id of the subscriber
+    (e.g. after events which are skipped or have no id)."""
+    return f"id: {event_id}\n\n".encode()
+
+
+class Subscription:
+    """The transport-independent part of a player subscription.
+
+    It owns the subscription token and turns queued events into the bytes
+    to be written, while the server backends (threaded or async) decide
+    how to wait for messages and how to write them.
+
+    Frames carry event ids, so a subscriber reconnecting with the header
+    `Last-Event-ID` is resumed with the events it missed if possible.
+    Events are encoded as the subscriber chooses (see `EventEncoding`),
+    and the stream may be compressed as a whole (see `StreamCompressor`).
+    """
+
+    game: "Game"
+    player: "Player"
+    token: str
+    last_event_id: str | None  # sent by the subscriber to resume
+    compressor: StreamCompressor | None
+    event_encoding: EventEncoding
+
+    __encode_event: Callable[[ServerSentEvent], bytes]
+    __state_version: int
+    __logger: Logger
+
+    def __init__(
+        self,
+        game: "Game",
+        player: "Player",
+        last_event_id: str | None = None,
+        content_encoding: ContentEncoding | None = None,
+        event_encoding: EventEncoding = DEFAULT_EVENT_ENCODING,
+    ) -> None:
+        self.game = game
+        self.player = player
+        self.token = token_hex(SUBSCRIPTION_TOKEN_BYTES)
+        self.last_event_id = last_event_id
+        self.compressor = (
+            None if content_encoding is None else StreamCompressor(content_encoding)
+        )
+        self.event_encoding = event_encoding
+        self.__encode_event = (
+            ServerSentEvent.encode
+            if event_encoding == DEFAULT_EVENT_ENCODING
+            else ServerSentEvent.encode_compact
+        )
+        self.__state_version = 0
+        self.__logger = Logger(__name__)
+        player.subscription_token = self.token
+        player.message_queue.wake()  # stop previous subscription if any
+        game.schedule_connection_check(player)
+
+    def __repr__(self) -> str:
+        return f"player#{self.player.name} (subscription_token: {self.token})"
+
+    @property
+    def active(self) -> bool:
+        return self.player.subscription_token == self.token
+
+    @property
+    def replaced(self) -> bool:
+        """Whether the subscription is replaced by another one."""
+        return (not self.active) and bool(self.player.subscription_token)
+
+    @contextmanager
+    def message_context(
+        self,
+        chunk: bytes,
+        *,
+        final: bool = False,
+    ) -> Generator[bytes]:
+        """Wrap the write of `chunk` to the subscriber, which is watched
+        so that the player gets disconnected if the write lasts too long.
+        The bytes to be written (compressed if negotiated) are given by
+        the context, and the stream is ended after them if `final`."""
+        compressor = self.compressor
+        data = chunk if compressor is None else compressor.compress(chunk, final=final)
+        with self.player.message_context():
+            self.game.watch_pending_write(self.player)
+            yield data
+        if chunk:  # written successfully
+            SSE_FRAMES_SENT.inc()
+            SSE_BYTES_SENT.inc(len(data))
+            if chunk is HEARTBEAT:
+                SSE_HEARTBEATS_SENT.inc()
+
+    def get_heartbeat_timeout(self) -> float:
+        """Get the seconds until next heartbeat is due."""
+        last_sent_timestamp = self.player.last_sent_timestamp or 0
+        heartbeat_timeout = HEARTBEAT_GAP.total_seconds() - (
+            monotonic() - last_sent_timestamp
+        )
+        return max(heartbeat_timeout, 0)
+
+    def get_initial_states(self) -> bytes:
+        """Get the bytes to be sent first, which are the events missed
+        since `last_event_id` if the subscription can be resumed, or full
+        states otherwise, followed by the id of the last event delivered."""
+
+        stream_start = self.game.open_event_stream(self.player, self.last_event_id)
+        missed_events = stream_start.missed_events
+
+        if missed_events is not None:
+            SUBSCRIPTION_RESUMES.inc()
+            self.__state_version = stream_start.state_version
+            chunk, _ = self.__encode_events(
+                missed_events,
+                final_event_id=stream_start.last_event_id,
+            )
+            self.__logger.debug(
+                lambda: f"Resumed {self!r} after event#{self.last_event_id} with "
+                f"{len(missed_events)} missed event(s)."
+            )
+            return chunk
+
+        if self.last_event_id:
+            self.__logger.debug(
+                lambda: f"Failed to resume {self!r} after event#{self.last_event_id}."
+            )
+        chunk = self.get_full_states()
+        if stream_start.last_event_id:
+            chunk += encode_event_id(stream_start.last_event_id)
+        return chunk
+
+    def get_full_states(self) -> bytes:
+        game_state_event = self.game.get_latest_game_state_event()
+        self.__state_version = game_state_event.data["version"]
+        cards_event = self.player.get_latest_cards_event()
+        encode_event = self.__encode_event
+        return encode_event(game_state_event) + encode_event(cards_event)
+
+    def encode_events(self, events: Iterable[ServerSentEvent]) -> tuple[bytes, bool]:
+        """Encode events to be sent at once. (Preceded by full states if
+        the message queue has overflowed since last time.)
+
+        Returns:
+            chunk (bytes): Bytes to be written.
+            end_of_connection (bool): Whether an `EndOfConnectionEvent` is
+                encountered, in which case the subscription is deactivated
+                and the rest events are dropped.
+        """
+
+        if not self.player.message_queue.take_overflowed():
+            return self.__encode_events(events)
+
+        SUBSCRIPTION_RESYNCS.inc()
+        full_states = self.get_full_states()
+        self.__logger.debug(lambda: f"Resynchronized {self!r} after overflow.")
+        chunk, end_of_connection = self.__encode_events(events)
+        return full_states + chunk, end_of_connection
+
+    def __encode_events(
+        self,
+        events: Iterable[ServerSentEvent],
+        *,
+        final_event_id: str | None = None,
+    ) -> tuple[bytes, bool]:
+
+        chunks: list[bytes] = []
+        end_of_connection = False
+        last_event_id = final_event_id  # of the events taken, or later
+        last_sent_event_id: str | None = None  # of the frames encoded
+
+        for event in events:
+
+            if final_event_id is None:
+                last_event_id = event.id or last_event_id
+
+            # keep game state versions continuous on client side
+            if isinstance(event, GameStatePatchEvent):
+                if event.data["version"] <= self.__state_version:
+                    continue  # covered by sent state
+                if event.data["base_version"] != self.__state_version:
+                    event = self.game.get_latest_game_state_event()  # keyframe
+            if isinstance(event, (GameStateEvent, GameStatePatchEvent)):
+                if event.data["version"] <= self.__state_version:
+                    continue  # already sent or outdated
+                self.__state_version = event.data["version"]
+
+            chunks.append(self.__encode_event(event))
+            last_sent_event_id = event.id
+            self.__logger.debug(lambda: f"Event sent to {self!r}: {event!r}")
+
+            if isinstance(event, EndOfConnectionEvent):
+                end_of_connection = True
+                self.player.subscription_token = ""
+                self.game.schedule_connection_check(self.player)
+                self.__logger.debug(
+                    lambda: f"Stopped subscription from {self!r} due to the "
+                    f"presence of an {EndOfConnectionEvent.__name__}."
+                )
+                break
+
+        # a keyframe sent in place of a patch may be numbered beyond the
+        # events taken, so the id of the last event taken is (re)set
+        if last_event_id and (last_event_id != last_sent_event_id):
+            chunks.append(encode_event_id(last_event_id))
+
+        return b"".join(chunks), end_of_connection
+
+    def get_final_message(self) -> bytes:
+        """Get the bytes to be sent when the subscription stops normally."""
+        if self.replaced:
+            event = SubscriptionChangeEvent()
+            self.__logger.debug(lambda: f"Event sent to {self!r}: {event!r}")
+            return self.__encode_event(event)
+        return b""
+
+    def close(self) -> None:
+        """Deactivate the subscription when the connection is closed."""
+        with ThreadLockContext(self.player.lock):
+            if self.active:
+                self.player.subscription_token = ""
+                self.game.schedule_connection_check(self.player)
+                self.__logger.info(f"Disconnected from {self!r}.")
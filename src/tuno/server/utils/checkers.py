@@ -1,7 +1,25 @@
-from tuno.server.exceptions import InvalidPlayerNameException
-from tuno.shared.constraints import PLAYER_NAME_PATTERN
+from typing import cast
+
+from tuno.server.exceptions import (
+    InvalidEventEncodingException,
+    InvalidPlayerNameException,
+    InvalidRoomIdException,
+)
+from tuno.shared.constraints import PLAYER_NAME_PATTERN, ROOM_ID_PATTERN
+from tuno.shared.event_encoding import EVENT_ENCODINGS, EventEncoding
 
 
 def check_player_name(player_name: str) -> None:
     if not PLAYER_NAME_PATTERN.fullmatch(player_name):
         raise InvalidPlayerNameException(player_name)
+
+
+def check_room_id(room_id: str) -> None:
+    if not ROOM_ID_PATTERN.fullmatch(room_id):
+        raise InvalidRoomIdException(room_id)
+
+
+def check_event_encoding(encoding: str) -> EventEncoding:
+    if encoding not in EVENT_ENCODINGS:
+        raise InvalidEventEncodingException(encoding)
+    return cast(EventEncoding, encoding)
@@ -0,0 +1,89 @@
+"""Conditional REST requests of versioned snapshots.
+
+A snapshot is the latest event published by a game (the game state or
+the cards of a player), whose data is serialized once and shared by all
+requests. Its ETag is derived from the version, so that an unchanged
+snapshot can be checked without building anything, and clients may
+long-poll for the next version with `If-None-Match` and `?wait=SECONDS`.
+"""
+
+from collections.abc import Callable
+from math import isfinite
+from typing import TYPE_CHECKING
+
+from flask import Response, request
+
+from tuno.server.config import LONG_POLL_MAX_WAIT
+from tuno.server.exceptions import InvalidWaitException
+from tuno.shared.sse_events import CardsEvent, ServerSentEvent
+
+if TYPE_CHECKING:
+    from tuno.server.models.Game import Game
+    from tuno.server.models.Player import Player
+
+type Snapshot = tuple[str, ServerSentEvent]  # (etag, event)
+
+
+def get_game_state_etag(game: "Game") -> str:
+    """Get the ETag of the latest game state. (Lock-free.)"""
+    return f"{game.epoch}-{game.latest_state_version}"
+
+
+def get_game_state_snapshot(game: "Game") -> Snapshot:
+    event = game.get_latest_game_state_event()
+    return (f"{game.epoch}-{event.data['version']}", event)
+
+
+def get_cards_etag(game: "Game", player: "Player") -> str:
+    """Get the ETag of the latest cards of the player. (Lock-free.)"""
+    latest_cards = player.latest_cards
+    version = 0 if latest_cards is None else latest_cards[0]
+    return f"{game.epoch}-c{version}"
+
+
+def get_cards_snapshot(game: "Game", player: "Player") -> Snapshot:
+    latest_cards = player.latest_cards
+    if latest_cards is None:  # nothing dealt yet
+        return (get_cards_etag(game, player), CardsEvent([]))
+    version, event = latest_cards
+    return (f"{game.epoch}-c{version}", event)
+
+
+def parse_wait_seconds(wait: str | None) -> float:
+    """Parse the `wait` query parameter, clamped to `LONG_POLL_MAX_WAIT`.
+    (0 if absent.)"""
+    if wait is None:
+        return 0
+    try:
+        wait_seconds = float(wait)
+    except ValueError:
+        raise InvalidWaitException(wait) from None
+    if not (isfinite(wait_seconds) and wait_seconds >= 0):
+        raise InvalidWaitException(wait)
+    return min(wait_seconds, LONG_POLL_MAX_WAIT.total_seconds())
+
+
+def respond_conditionally(
+    game: "Game",
+    get_etag: Callable[[], str],
+    get_snapshot: Callable[[], Snapshot],
+) -> Response:
+    """Respond with the snapshot, or 304 if it matches `If-None-Match`.
+    With `?wait=SECONDS`, a matching request waits for the next version
+    until timeout (`get_etag` is checked on every change of the game)."""
+
+    wait_seconds = parse_wait_seconds(request.args.get("wait"))
+    if wait_seconds > 0 and request.if_none_match.contains(get_etag()):
+        game.changes.wait_for(
+            lambda: not request.if_none_match.contains(get_etag()),
+            wait_seconds,
+        )
+
+    etag, event = get_snapshot()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(event.encode_data(), mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
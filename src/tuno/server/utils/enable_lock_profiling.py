@@ -0,0 +1,35 @@
+import atexit
+import json
+
+from tuno.server.config import LOCK_PROFILE_TOP_N
+from tuno.server.utils.Logger import Logger
+from tuno.shared.LockProfiler import LockOrderInversion, LockProfiler
+from tuno.shared.ThreadLockContext import set_lock_profiler
+
+logger = Logger(__name__)
+
+
+def enable_lock_profiling() -> LockProfiler:
+    """Profile locks acquired through `ThreadLockContext` from now on.
+
+    Lock-order inversions are logged once found, and the contention
+    hotspots are logged on exit (and exposed at `/api/metrics`).
+    """
+
+    def on_inversion(inversion: LockOrderInversion) -> None:
+        logger.warn(f"Lock-order inversion: {inversion}")
+
+    profiler = LockProfiler(on_inversion=on_inversion)
+    set_lock_profiler(profiler)
+
+    def report_hotspots() -> None:
+        hotspots = profiler.get_hotspots(LOCK_PROFILE_TOP_N)
+        logger.info(
+            "Lock contention hotspots:\n"
+            + "\n".join(json.dumps(stats.to_json()) for stats in hotspots)
+        )
+
+    atexit.register(report_hotspots)
+    logger.info("Lock profiling enabled.")
+
+    return profiler
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from flask import g
+
+from tuno.server.config import DEFAULT_ROOM_ID
+
+if TYPE_CHECKING:
+    from tuno.server.models.Game import Game
+
+
+def get_current_game() -> "Game":
+    """Get the game of the room addressed by current request."""
+
+    from tuno.server.models.GameRegistry import game_registry
+
+    room_id: str = g.get("room_id", DEFAULT_ROOM_ID)
+    return game_registry.get_game(room_id)
+
+
+def find_current_game() -> "Game":
+    """Get the existing game of the room addressed by current request,
+    for reading. (See `GameRegistry.find_game()`.)"""
+
+    from tuno.server.models.GameRegistry import game_registry
+
+    room_id: str = g.get("room_id", DEFAULT_ROOM_ID)
+    return game_registry.find_game(room_id)
@@ -0,0 +1,8 @@
+from random import Random
+
+
+def reshuffle_pile(pile: bytearray, *, seed: int, reshuffle_count: int) -> None:
+    """Shuffle the discard pile turned into the draw pile in place.
+    (Seeded by the seed of the start and the number of reshuffles so far,
+    so no generator state is kept.)"""
+    Random(f"{seed}/{reshuffle_count}").shuffle(pile)
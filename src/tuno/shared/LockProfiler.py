@@ -0,0 +1,206 @@
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+from .ThreadLockContext import LockTimeoutError, SupportsLocking
+
+
+class LockSiteStats:
+    """Contention statistics of a lock acquired at one site."""
+
+    lock_name: str
+    site: str
+    acquisition_count: int
+    contended_count: int  # acquisitions which had to wait
+    timeout_count: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    hold_seconds_total: float
+    hold_seconds_max: float
+
+    def __init__(self, lock_name: str, site: str) -> None:
+        self.lock_name = lock_name
+        self.site = site
+        self.acquisition_count = 0
+        self.contended_count = 0
+        self.timeout_count = 0
+        self.wait_seconds_total = 0
+        self.wait_seconds_max = 0
+        self.hold_seconds_total = 0
+        self.hold_seconds_max = 0
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "lock": self.lock_name,
+            "site": self.site,
+            "acquisitions": self.acquisition_count,
+            "contended": self.contended_count,
+            "timeouts": self.timeout_count,
+            "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            "hold_ms_total": round(self.hold_seconds_total * 1000, 3),
+            "hold_ms_max": round(self.hold_seconds_max * 1000, 3),
+        }
+
+
+class LockOrderInversion:
+    """Two named locks acquired in both orders, which may deadlock."""
+
+    first_order: tuple[str, str]  # lock names
+    first_sites: str
+    second_sites: str
+
+    def __init__(
+        self,
+        first_order: tuple[str, str],
+        first_sites: str,
+        second_sites: str,
+    ) -> None:
+        self.first_order = first_order
+        self.first_sites = first_sites
+        self.second_sites = second_sites
+
+    def __str__(self) -> str:
+        outer_name, inner_name = self.first_order
+        return (
+            f"{outer_name} -> {inner_name} ({self.first_sites}) vs. "
+            f"{inner_name} -> {outer_name} ({self.second_sites})"
+        )
+
+
+class LockProfiler:
+    """Record contention of locks acquired through `ThreadLockContext`.
+
+    Once enabled by `set_lock_profiler()`, every acquisition records its
+    wait and hold time under the name of the lock (see `name_lock()`) and
+    the site acquiring it. Orders of nested acquisitions of differently
+    named locks are remembered, so that an acquisition in the opposite
+    order is reported as a lock-order inversion.
+    """
+
+    __lock: Lock  # guards the fields below
+    __lock_names: WeakKeyDictionary[SupportsLocking, str]
+    __site_stats: dict[tuple[str, str], LockSiteStats]
+    __orders: dict[tuple[str, str], str]  # (outer, inner) -> sites
+    __inversions: list[LockOrderInversion]
+    __held_locks: local  # .stack: list[tuple[lock, name, site]]
+    __on_inversion: Callable[[LockOrderInversion], None] | None
+
+    def __init__(
+        self,
+        *,
+        on_inversion: Callable[[LockOrderInversion], None] | None = None,
+    ) -> None:
+        self.__lock = Lock()
+        self.__lock_names = WeakKeyDictionary()
+        self.__site_stats = {}
+        self.__orders = {}
+        self.__inversions = []
+        self.__held_locks = local()
+        self.__on_inversion = on_inversion
+
+    def name_lock(self, lock: SupportsLocking, name: str) -> None:
+        with self.__lock:
+            self.__lock_names[lock] = name
+
+    def get_lock_name(self, lock: SupportsLocking) -> str:
+        return self.__lock_names.get(lock) or type(lock).__name__
+
+    def get_hotspots(self, count: int) -> list[LockSiteStats]:
+        """Get the `count` sites with the longest total wait time."""
+        with self.__lock:
+            site_stats = list(self.__site_stats.values())
+        site_stats.sort(key=lambda stats: stats.wait_seconds_total, reverse=True)
+        return site_stats[:count]
+
+    def get_inversions(self) -> list[LockOrderInversion]:
+        with self.__lock:
+            return self.__inversions.copy()
+
+    @contextmanager
+    def profile(
+        self,
+        lock: SupportsLocking,
+        timeout_seconds: float,
+        site: str,
+    ) -> Generator[None, None, None]:
+
+        lock_name = self.get_lock_name(lock)
+        held_locks: list[tuple[SupportsLocking, str, str]]
+        held_locks = self.__held_locks.__dict__.setdefault("stack", [])
+        self.__check_order(lock, lock_name, site, held_locks)
+
+        timestamp_begin = perf_counter()
+        contended = not lock.acquire(blocking=False)
+        acquired = (not contended) or lock.acquire(timeout=timeout_seconds)
+        timestamp_acquired = perf_counter()
+        wait_seconds = timestamp_acquired - timestamp_begin
+
+        with self.__lock:
+            stats = self.__site_stats.get((lock_name, site))
+            if stats is None:
+                stats = LockSiteStats(lock_name, site)
+                self.__site_stats[(lock_name, site)] = stats
+            if acquired:
+                stats.acquisition_count += 1
+                stats.contended_count += contended
+                stats.wait_seconds_total += wait_seconds
+                stats.wait_seconds_max = max(stats.wait_seconds_max, wait_seconds)
+            else:
+                stats.timeout_count += 1
+
+        if not acquired:
+            raise LockTimeoutError(
+                f"Failed to acquire the {lock_name} lock at {site} "
+                f"within {timeout_seconds}s."
+            )
+
+        held_locks.append((lock, lock_name, site))
+        try:
+            yield
+        finally:
+            held_locks.pop()
+            lock.release()
+            hold_seconds = perf_counter() - timestamp_acquired
+            with self.__lock:
+                stats.hold_seconds_total += hold_seconds
+                stats.hold_seconds_max = max(stats.hold_seconds_max, hold_seconds)
+
+    def __check_order(
+        self,
+        lock: SupportsLocking,
+        lock_name: str,
+        site: str,
+        held_locks: list[tuple[SupportsLocking, str, str]],
+    ) -> None:
+
+        if any(held_lock is lock for held_lock, _, _ in held_locks):
+            return  # reentrant, so the order has been checked
+
+        for _, held_name, held_site in held_locks:
+
+            if held_name == lock_name:
+                continue
+
+            order = (held_name, lock_name)
+            if order in self.__orders:
+                continue
+
+            inversion: LockOrderInversion | None = None
+            with self.__lock:
+                if order in self.__orders:
+                    continue
+                sites = self.__orders[order] = f"{held_site} -> {site}"
+                reversed_sites = self.__orders.get((lock_name, held_name))
+                if reversed_sites is not None:
+                    inversion = LockOrderInversion(
+                        (lock_name, held_name),
+                        reversed_sites,
+                        sites,
+                    )
+                    self.__inversions.append(inversion)
+
+            if inversion and self.__on_inversion:
+                self.__on_inversion(inversion)
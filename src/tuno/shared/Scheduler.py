@@ -0,0 +1,167 @@
+from collections.abc import Callable
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Condition, Thread
+from time import monotonic
+from traceback import print_exception
+
+# the heap is rebuilt when at least this many entries are cancelled
+# and they make up more than half of the heap
+MIN_CANCELLED_COUNT_TO_COMPACT = 64
+
+
+class ScheduledTask:
+    """A handle of a callback scheduled by `Scheduler.schedule()`."""
+
+    deadline: float
+    callback: Callable[[], object]
+    cancelled: bool
+    done: bool  # whether the callback has been called or cancelled
+
+    __scheduler: "Scheduler"
+
+    def __init__(
+        self,
+        scheduler: "Scheduler",
+        deadline: float,
+        callback: Callable[[], object],
+    ) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self.done = False
+        self.__scheduler = scheduler
+
+    def cancel(self) -> None:
+        self.__scheduler.cancel(self)
+
+
+class Scheduler:
+    """Call callbacks at their deadlines in a single thread.
+
+    Pending tasks are kept in a heap ordered by deadline, and the thread
+    sleeps until the earliest deadline (or until an earlier task is
+    scheduled). Scheduling takes O(log n). Cancellation takes O(1) by
+    marking the task, and cancelled entries are dropped lazily.
+
+    Callbacks are called one by one, so they should return quickly.
+    If `on_task_done` is given, it's called after each task with the
+    lag of the call past the deadline and the duration of the callback.
+    """
+
+    thread: Thread
+
+    __condition: Condition
+    __heap: list[tuple[float, int, ScheduledTask]]
+    __counter: "count[int]"  # tie breaker for tasks with the same deadline
+    __cancelled_count: int
+    __stopped: bool
+    __on_error: Callable[[Exception], None]
+    __on_task_done: Callable[[float, float], None] | None
+
+    def __init__(
+        self,
+        *,
+        name: str = "scheduler",
+        on_error: Callable[[Exception], None] = print_exception,
+        on_task_done: Callable[[float, float], None] | None = None,
+    ) -> None:
+        self.thread = Thread(target=self.__run, name=name, daemon=True)
+        self.__condition = Condition()
+        self.__heap = []
+        self.__counter = count()
+        self.__cancelled_count = 0
+        self.__stopped = False
+        self.__on_error = on_error
+        self.__on_task_done = on_task_done
+
+    def __len__(self) -> int:
+        """Get the number of pending tasks."""
+        return len(self.__heap) - self.__cancelled_count
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread. (Pending tasks are discarded.)"""
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+
+    def schedule(
+        self,
+        delay_seconds: float,
+        callback: Callable[[], object],
+    ) -> ScheduledTask:
+        """Schedule `callback` to be called after `delay_seconds`."""
+
+        task = ScheduledTask(self, monotonic() + max(delay_seconds, 0), callback)
+
+        with self.__condition:
+            heappush(self.__heap, (task.deadline, next(self.__counter), task))
+            if self.__heap[0][2] is task:  # new earliest deadline
+                self.__condition.notify_all()
+
+        return task
+
+    def cancel(self, task: ScheduledTask) -> None:
+        """Cancel the task if it has not been called yet."""
+        with self.__condition:
+
+            if task.done:
+                return
+
+            task.cancelled = task.done = True
+            self.__cancelled_count += 1
+
+            heap = self.__heap
+            cancelled_count = self.__cancelled_count
+            if (cancelled_count >= MIN_CANCELLED_COUNT_TO_COMPACT) and (
+                cancelled_count * 2 > len(heap)
+            ):
+                self.__heap = [entry for entry in heap if not entry[2].cancelled]
+                heapify(self.__heap)
+                self.__cancelled_count = 0
+
+    def __run(self) -> None:
+
+        while True:
+
+            with self.__condition:
+
+                while True:
+
+                    if self.__stopped:
+                        return
+
+                    heap = self.__heap
+
+                    if heap and heap[0][2].cancelled:
+                        heappop(heap)
+                        self.__cancelled_count -= 1
+                        continue
+
+                    if not heap:
+                        self.__condition.wait()
+                        continue
+
+                    timeout_seconds = heap[0][0] - monotonic()
+                    if timeout_seconds <= 0:
+                        break
+
+                    self.__condition.wait(timeout_seconds)
+
+                task = heappop(heap)[2]
+                task.done = True
+
+            timestamp_begin = monotonic()
+            try:
+                task.callback()
+            except Exception as exception:
+                self.__on_error(exception)
+
+            if self.__on_task_done:
+                self.__on_task_done(
+                    timestamp_begin - task.deadline,
+                    monotonic() - timestamp_begin,
+                )
@@ -1,18 +1,104 @@
-from collections.abc import Generator
-from contextlib import contextmanager
-from threading import Lock, RLock
-from typing import Final
+import sys
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import TYPE_CHECKING, Final, Protocol
+
+if TYPE_CHECKING:
+    from .LockProfiler import LockProfiler
 
 DEFAULT_LOCK_TIMEOUT_SECONDS: Final[float] = 60.0
 
 
-@contextmanager
-def ThreadLockContext(
-    lock: Lock | RLock,
-    timeout_seconds: float = DEFAULT_LOCK_TIMEOUT_SECONDS,
-) -> Generator[None, None, None]:
-    lock.acquire(timeout=timeout_seconds)
-    try:
-        yield
-    finally:
-        lock.release()
+class SupportsLocking(Protocol):
+    """Locks like `threading.Lock` and `threading.RLock`."""
+
+    def acquire(self, blocking: bool = ..., timeout: float = ...) -> bool: ...
+
+    def release(self) -> None: ...
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a lock can't be acquired in time, which most likely
+    means a deadlock, instead of running the guarded code unlocked."""
+
+
+lock_profiler: "LockProfiler | None" = None
+
+
+def set_lock_profiler(profiler: "LockProfiler | None") -> None:
+    """Switch between the default mode (`None`), which adds nothing but
+    the timeout check, and the profiling mode using `profiler`.
+    (Should be called before any lock is created and acquired.)"""
+    global lock_profiler
+    lock_profiler = profiler
+
+
+def get_lock_profiler() -> "LockProfiler | None":
+    return lock_profiler
+
+
+def name_lock[T: SupportsLocking](lock: T, name: str) -> T:
+    """Name the lock for profiling (no-op in the default mode)."""
+    if lock_profiler is not None:
+        lock_profiler.name_lock(lock, name)
+    return lock
+
+
+def get_caller_site(depth: int) -> str:
+    frame = sys._getframe(depth + 1)
+    return f"{frame.f_code.co_qualname}:{frame.f_lineno}"
+
+
+class ThreadLockContext:
+    """Hold the lock within a `with` block, raising `LockTimeoutError` if
+    it can't be acquired in time. (A class rather than a generator-based
+    context manager, as it wraps every critical section.)"""
+
+    __slots__ = ("lock", "timeout_seconds", "caller_depth", "profile_context")
+
+    lock: SupportsLocking
+    timeout_seconds: float
+    caller_depth: int  # extra frames to skip (for wrappers) in site names
+    profile_context: AbstractContextManager[None] | None
+
+    def __init__(
+        self,
+        lock: SupportsLocking,
+        timeout_seconds: float = DEFAULT_LOCK_TIMEOUT_SECONDS,
+        *,
+        caller_depth: int = 0,
+    ) -> None:
+        self.lock = lock
+        self.timeout_seconds = timeout_seconds
+        self.caller_depth = caller_depth
+        self.profile_context = None
+
+    def __enter__(self) -> None:
+
+        if lock_profiler is not None:
+            # caller -> __enter__
+            site = get_caller_site(1 + self.caller_depth)
+            self.profile_context = lock_profiler.profile(
+                self.lock,
+                self.timeout_seconds,
+                site,
+            )
+            self.profile_context.__enter__()
+            return
+
+        if not self.lock.acquire(timeout=self.timeout_seconds):
+            raise LockTimeoutError(
+                f"Failed to acquire {self.lock!r} within {self.timeout_seconds}s."
+            )
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self.profile_context is not None:
+            self.profile_context.__exit__(exception_type, exception, traceback)
+            self.profile_context = None
+        else:
+            self.lock.release()
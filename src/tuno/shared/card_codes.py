@@ -0,0 +1,143 @@
+"""Compact integer encoding of cards.
+
+Each of the 108 cards in a deck is identified by a card code in
+`range(CARD_COUNT)`, so piles and hands can be stored as bytearrays.
+Card attributes are looked up from the precomputed tables below, and
+`Card` dicts are only produced at the API boundary (`CARDS[code]`).
+
+Codes are laid out color by color (numbers first, then functions),
+followed by wild cards, so sorting codes groups cards by color.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Final, Literal
+
+from .deck import (
+    BasicCardColor,
+    Card,
+    FunctionCard,
+    FunctionCardEffect,
+    NumberCard,
+    WildCard,
+    WildCardColor,
+    WildCardEffect,
+    basic_card_colors,
+    format_card,
+    function_card_effects,
+    wild_card_color,
+    wild_card_effects,
+)
+
+type CardType = Literal["number", "function", "wild"]
+
+CARD_COUNT: Final[int] = 108
+
+
+def _create_cards() -> list[Card]:
+
+    cards: list[Card] = []
+
+    def get_id() -> str:
+        return str(len(cards))
+
+    for color in basic_card_colors:
+
+        # number cards
+        for number in range(10):
+            for _ in range(1 if number == 0 else 2):
+                cards.append(
+                    NumberCard(id=get_id(), color=color, type="number", number=number)
+                )
+
+        # function cards
+        for function_card_effect in function_card_effects:
+            for _ in range(2):
+                cards.append(
+                    FunctionCard(
+                        id=get_id(),
+                        color=color,
+                        type="function",
+                        effect=function_card_effect,
+                    )
+                )
+
+    # wild cards
+    for wild_card_effect in wild_card_effects:
+        for _ in range(4):
+            cards.append(
+                WildCard(
+                    id=get_id(),
+                    color=wild_card_color,
+                    type="wild",
+                    effect=wild_card_effect,
+                )
+            )
+
+    assert len(cards) == CARD_COUNT
+
+    return cards
+
+
+# `Card` dict of each card code (shared, so they must not be mutated)
+CARDS: Final[tuple[Card, ...]] = tuple(_create_cards())
+
+# -- lookup tables indexed by card codes --
+CARD_IDS: Final[tuple[str, ...]] = tuple(card["id"] for card in CARDS)
+CARD_COLORS: Final[tuple[BasicCardColor | WildCardColor, ...]] = tuple(
+    card["color"] for card in CARDS
+)
+CARD_TYPES: Final[tuple[CardType, ...]] = tuple(card["type"] for card in CARDS)
+CARD_NUMBERS: Final[tuple[int | None, ...]] = tuple(
+    (card["number"] if card["type"] == "number" else None) for card in CARDS
+)
+CARD_EFFECTS: Final[tuple[FunctionCardEffect | WildCardEffect | None, ...]] = tuple(
+    (card["effect"] if card["type"] != "number" else None) for card in CARDS
+)
+CARD_NAMES: Final[tuple[str, ...]] = tuple(map(format_card, CARDS))
+
+# -- card faces --
+# (A face is what a card shows apart from its color, i.e. its number
+# or effect, e.g. all "+2" cards share the same face.)
+CARD_FACE_COUNT: Final[int] = 10 + len(function_card_effects) + len(wild_card_effects)
+
+
+def _get_card_face(card: Card) -> int:
+    if card["type"] == "number":
+        return card["number"]
+    elif card["type"] == "function":
+        return 10 + function_card_effects.index(card["effect"])
+    else:
+        return 10 + len(function_card_effects) + wild_card_effects.index(card["effect"])
+
+
+CARD_FACES: Final[bytes] = bytes(map(_get_card_face, CARDS))
+
+CARD_CODES_BY_ID: Final[dict[str, int]] = {
+    card_id: code for code, card_id in enumerate(CARD_IDS)
+}
+
+
+def encode_card(card: Card) -> int:
+    """Get the code of a card dict."""
+    return CARD_CODES_BY_ID[card["id"]]
+
+
+def get_card_mask(codes: Iterable[int]) -> int:
+    """Get the bitmask of card codes, in which bit `code` is set for
+    each given code."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+def iter_card_mask(mask: int) -> Iterator[int]:
+    """Iterate the card codes in a bitmask in ascending order."""
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def format_card_codes(codes: bytes | bytearray) -> str:
+    return ", ".join(CARD_NAMES[code] for code in codes)
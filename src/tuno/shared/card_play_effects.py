@@ -0,0 +1,45 @@
+"""Effects of played cards on the turn, looked up by card codes.
+
+Shared by `Game.play()` and the simulator, so that simulated games
+follow the same rules as real ones.
+"""
+
+from typing import Final, NamedTuple, assert_never
+
+from .card_codes import CARDS
+from .deck import Card
+
+
+class CardPlayEffect(NamedTuple):
+    draw_penalty: int  # cards drawn by the next player
+    skip: int  # players skipped
+    reverse: bool
+
+
+def _get_card_play_effect(card: Card) -> CardPlayEffect:
+    if card["type"] == "number":
+        return CardPlayEffect(0, 0, False)
+    elif card["type"] == "function":
+        if card["effect"] == "+2":
+            return CardPlayEffect(2, 1, False)
+        elif card["effect"] == "skip":
+            return CardPlayEffect(0, 1, False)
+        elif card["effect"] == "reverse":
+            return CardPlayEffect(0, 0, True)
+        else:
+            assert_never(card["effect"])
+    elif card["type"] == "wild":
+        if card["effect"] == "+4":
+            return CardPlayEffect(4, 1, False)
+        elif card["effect"] == "color":
+            return CardPlayEffect(0, 0, False)
+        else:
+            assert_never(card["effect"])
+    else:
+        assert_never(card["type"])
+
+
+# effect of each card code
+CARD_PLAY_EFFECTS: Final[tuple[CardPlayEffect, ...]] = tuple(
+    map(_get_card_play_effect, CARDS)
+)
@@ -1,5 +1,15 @@
+from collections.abc import Sequence
+from typing import Final
+
 from tuno.server.exceptions import ApiException
-from tuno.shared.deck import BasicCardColor, Card, Deck
+from tuno.shared.card_codes import (
+    CARD_COLORS,
+    CARD_COUNT,
+    CARD_FACE_COUNT,
+    CARD_FACES,
+    CARD_TYPES,
+)
+from tuno.shared.deck import BasicCardColor, basic_card_colors
 from tuno.shared.rules import GameRules
 
 
@@ -9,15 +19,75 @@ class InvalidPlayException(ApiException):
         super().__init__(400, message)
 
 
+def _is_playable(played_card: int, lead_face: int, lead_color: BasicCardColor) -> bool:
+    if CARD_TYPES[played_card] == "wild":
+        return True  # with a color claimed
+    if CARD_COLORS[played_card] == lead_color:
+        return True
+    # same number or function effect (wild lead cards have no faces in common)
+    return CARD_FACES[played_card] == lead_face
+
+
+# (lead card face x lead color) -> bitmask of playable card codes
+PLAYABLE_CARD_MASKS: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(
+        sum(
+            1 << played_card
+            for played_card in range(CARD_COUNT)
+            if _is_playable(played_card, lead_face, lead_color)
+        )
+        for lead_color in basic_card_colors
+    )
+    for lead_face in range(CARD_FACE_COUNT)
+)
+BASIC_CARD_COLOR_INDEXES: Final[dict[BasicCardColor, int]] = {
+    color: index for index, color in enumerate(basic_card_colors)
+}
+
+
+def playable_mask(
+    hand: int,
+    lead_card: int,
+    lead_color: BasicCardColor,
+    skip_counter: int,
+) -> int:
+    """Get all legal single-card plays at once.
+
+    Args:
+        hand: Bitmask of card codes in hand. (See `get_card_mask()`.)
+        lead_card: Code of the lead card.
+        lead_color: Current lead color.
+        skip_counter: Current skip counter.
+
+    Returns:
+        mask (int): Bitmask of the codes of playable cards in hand.
+            (Wild cards are playable with any color claimed.)
+
+    No rule affects which cards are playable (e.g. `any_last_play` only
+    decides what happens after a last play), so one table serves all rules.
+    """
+
+    if skip_counter > 0:
+        return 0
+
+    return (
+        hand
+        & PLAYABLE_CARD_MASKS[CARD_FACES[lead_card]][
+            BASIC_CARD_COLOR_INDEXES[lead_color]
+        ]
+    )
+
+
 def check_play(
-    play: Deck,
+    play: Sequence[int],
     play_color: BasicCardColor | None,
     *,
     lead_color: BasicCardColor,
-    lead_card: Card,
+    lead_card: int,
     skip_counter: int,
     rules: GameRules,
 ) -> None:
+    """Check a play given as card codes."""
 
     if len(play) == 0:
         raise InvalidPlayException("At least one card must be given in a play.")
@@ -30,36 +100,10 @@ def check_play(
 
     played_card = play[0]
 
-    if played_card["type"] != "wild":
-
-        if played_card["color"] == lead_color:
-            return
-
-        if (
-            (lead_card["type"] == "number")
-            and (played_card["type"] == "number")
-            and (played_card["number"] == lead_card["number"])
-        ):
-            return
-
-        if (
-            (lead_card["type"] == "function")
-            and (played_card["type"] == "function")
-            and (played_card["effect"] == lead_card["effect"])
-        ):
-            return
-
+    if not playable_mask(1 << played_card, lead_card, lead_color, skip_counter):
         raise InvalidPlayException(
             "Non-wild-card play must match the lead color, number or effect."
         )
 
-    else:
-
-        if not play_color:
-            raise InvalidPlayException(
-                "Wild cards must be played with a color claimed."
-            )
-
-        return
-
-    raise NotImplementedError()
+    if (CARD_TYPES[played_card] == "wild") and not play_color:
+        raise InvalidPlayException("Wild cards must be played with a color claimed.")
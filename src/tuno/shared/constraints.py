@@ -2,6 +2,7 @@ import re
 from typing import Final
 
 PLAYER_NAME_PATTERN: Final = re.compile(r"^[A-Za-z0-9_-]{1,20}$")
+ROOM_ID_PATTERN: Final = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
 
 MIN_PLAYER_CAPACITY: Final = 2
 MAX_PLAYER_CAPACITY: Final = 20
@@ -0,0 +1,188 @@
+"""Wire encodings of server-sent event data.
+
+Subscribers choose the encoding with `?encoding=` when subscribing:
+
+- `json` (default): data as JSON text, e.g. `Card` dicts and full rules.
+- `msgpack-v1`: data converted to a compact form (short keys, integer
+  card codes and color indices), packed with MessagePack and sent as
+  base64 in the `data:` field, as SSE frames are text.
+
+Decoding restores the JSON form, so events are handled the same way
+with either encoding. The compact forms below are version 1 of the
+schema; changing them requires a new version (and encoding name), so
+that clients never misread the data of another version.
+"""
+
+import json
+from base64 import b64decode, b64encode
+from collections.abc import Callable, Mapping
+from typing import Any, Final, Literal, get_args
+
+import msgpack
+
+from .card_codes import CARDS, encode_card
+from .deck import basic_card_colors
+
+type EventEncoding = Literal["json", "msgpack-v1"]
+EVENT_ENCODINGS: Final[tuple[EventEncoding, ...]] = get_args(EventEncoding.__value__)
+DEFAULT_EVENT_ENCODING: Final[EventEncoding] = "json"
+COMPACT_EVENT_ENCODING: Final[EventEncoding] = "msgpack-v1"
+
+type Codec = tuple[Callable[[Any], Any], Callable[[Any], Any]]  # (pack, unpack)
+
+# -- schema v1 --
+
+STATE_KEYS: Final[Mapping[str, str]] = {
+    "version": "v",
+    "started": "s",
+    "rules": "r",
+    "draw_pile_size": "dp",
+    "discard_pile_size": "dd",
+    "players": "p",
+    "current_player_index": "i",
+    "direction": "d",
+    "lead_card": "lc",
+    "lead_color": "c",
+    "draw_counter": "dc",
+    "skip_counter": "sc",
+}
+PLAYER_KEYS: Final[Mapping[str, str]] = {
+    "name": "n",
+    "connected": "c",
+    "card_count": "k",
+}
+RULE_KEYS: Final[Mapping[str, str]] = {
+    "player_capacity": "pc",
+    "shuffle_players": "sp",
+    "initial_hand_size": "ih",
+    "any_last_play": "al",
+    "bot_count": "bc",
+    "bot_play_delay": "bd",
+}
+PATCH_KEYS: Final[Mapping[str, str]] = {
+    "base_version": "b",
+    "version": "v",
+    "changes": "ch",
+    "player_count": "pc",
+    "player_changes": "pl",
+}
+NOTIFICATION_KEYS: Final[Mapping[str, str]] = {
+    "title": "t",
+    "message": "m",
+}
+
+
+def invert_keys(keys: Mapping[str, str]) -> dict[str, str]:
+    return {short_key: key for key, short_key in keys.items()}
+
+
+def rename_keys(data: Mapping[str, Any], keys: Mapping[str, str]) -> dict[str, Any]:
+    return {keys[key]: value for key, value in data.items()}
+
+
+def create_key_codec(keys: Mapping[str, str]) -> Codec:
+    long_keys = invert_keys(keys)
+    return (
+        lambda data: rename_keys(data, keys),
+        lambda data: rename_keys(data, long_keys),
+    )
+
+
+def identity(data: Any) -> Any:
+    return data
+
+
+PLAYER_CODEC = create_key_codec(PLAYER_KEYS)
+STATE_FIELD_CODECS: Final[Mapping[str, Codec]] = {
+    "rules": create_key_codec(RULE_KEYS),
+    "players": (
+        lambda players: list(map(PLAYER_CODEC[0], players)),
+        lambda players: list(map(PLAYER_CODEC[1], players)),
+    ),
+    "lead_card": (
+        lambda card: None if card is None else encode_card(card),
+        lambda code: None if code is None else CARDS[code].copy(),
+    ),
+    "lead_color": (
+        lambda color: None if color is None else basic_card_colors.index(color),
+        lambda index: None if index is None else basic_card_colors[index],
+    ),
+}
+STATE_LONG_KEYS: Final[Mapping[str, str]] = invert_keys(STATE_KEYS)
+PATCH_LONG_KEYS: Final[Mapping[str, str]] = invert_keys(PATCH_KEYS)
+
+
+def pack_state_fields(fields: Mapping[str, Any]) -> dict[str, Any]:
+    """Pack fields of a game state (all of them or the changed ones)."""
+    packed_fields: dict[str, Any] = {}
+    for key, value in fields.items():
+        codec = STATE_FIELD_CODECS.get(key)
+        packed_fields[STATE_KEYS[key]] = value if codec is None else codec[0](value)
+    return packed_fields
+
+
+def unpack_state_fields(packed_fields: Mapping[str, Any]) -> dict[str, Any]:
+    fields: dict[str, Any] = {}
+    for short_key, value in packed_fields.items():
+        key = STATE_LONG_KEYS[short_key]
+        codec = STATE_FIELD_CODECS.get(key)
+        fields[key] = value if codec is None else codec[1](value)
+    return fields
+
+
+def pack_patch(patch: Mapping[str, Any]) -> dict[str, Any]:
+    packed_patch = rename_keys(patch, PATCH_KEYS)
+    packed_patch["ch"] = pack_state_fields(patch["changes"])
+    packed_patch["pl"] = {
+        int(index): PLAYER_CODEC[0](changed_fields)
+        for index, changed_fields in patch["player_changes"].items()
+    }
+    return packed_patch
+
+
+def unpack_patch(packed_patch: Mapping[str, Any]) -> dict[str, Any]:
+    patch = rename_keys(packed_patch, PATCH_LONG_KEYS)
+    patch["changes"] = unpack_state_fields(packed_patch["ch"])
+    patch["player_changes"] = {
+        str(index): PLAYER_CODEC[1](changed_fields)
+        for index, changed_fields in packed_patch["pl"].items()
+    }
+    return patch
+
+
+EVENT_CODECS: Final[Mapping[str, Codec]] = {
+    "game_state": (pack_state_fields, unpack_state_fields),
+    "game_state_patch": (pack_patch, unpack_patch),
+    "cards": (
+        lambda cards: bytes(map(encode_card, cards)),
+        lambda codes: [CARDS[code].copy() for code in codes],
+    ),
+    "notification": create_key_codec(NOTIFICATION_KEYS),
+}
+
+# -- encoding --
+
+
+def encode_event_data(event_type: str, data: Any, encoding: EventEncoding) -> str:
+    """Encode the data of an event as the text of its `data:` field."""
+    if encoding == "json":
+        return json.dumps(data)
+    pack = EVENT_CODECS.get(event_type, (identity, identity))[0]
+    packed_data: bytes = msgpack.packb(pack(data))
+    return b64encode(packed_data).decode("ascii")
+
+
+def decode_event_data(event_type: str, text: str, encoding: EventEncoding) -> Any:
+    """Decode the text of the `data:` field of an event into the JSON form.
+    (Raises `ValueError` if the text is malformed.)"""
+
+    if encoding == "json":
+        return json.loads(text)
+
+    unpack = EVENT_CODECS.get(event_type, (identity, identity))[1]
+    try:
+        # map keys of player changes are ints
+        packed_data = msgpack.unpackb(b64decode(text), strict_map_key=False)
+        return unpack(packed_data)
+    except (msgpack.UnpackException, LookupError, TypeError) as error:
+        raise ValueError(f"Invalid {encoding} data of {event_type}: {error}") from error
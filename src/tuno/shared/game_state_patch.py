@@ -0,0 +1,109 @@
+from typing import Any, cast
+
+from tuno.shared.sse_events import GameStateEvent, GameStatePatchEvent
+
+
+def diff_game_state(
+    old_state: GameStateEvent.DataType,
+    new_state: GameStateEvent.DataType,
+) -> GameStatePatchEvent.DataType:
+    """Compute the patch that turns `old_state` into `new_state`."""
+
+    old_fields = cast(dict[str, Any], old_state)
+    changes = {
+        key: value
+        for key, value in new_state.items()
+        if (key not in ("version", "players")) and (old_fields[key] != value)
+    }
+
+    old_players = cast(list[dict[str, Any]], old_state["players"])
+    new_players = cast(list[dict[str, Any]], new_state["players"])
+    player_changes: dict[str, dict[str, Any]] = {}
+    for i, new_player in enumerate(new_players):
+        if i < len(old_players):
+            old_player = old_players[i]
+            changed_fields = {
+                key: value
+                for key, value in new_player.items()
+                if old_player[key] != value
+            }
+        else:
+            changed_fields = new_player
+        if changed_fields:
+            player_changes[str(i)] = changed_fields
+
+    return GameStatePatchEvent.DataType(
+        base_version=old_state["version"],
+        version=new_state["version"],
+        changes=changes,
+        player_count=len(new_players),
+        player_changes=player_changes,
+    )
+
+
+def apply_game_state_patch(
+    state: GameStateEvent.DataType,
+    patch: GameStatePatchEvent.DataType,
+) -> GameStateEvent.DataType:
+    """Return a new game state with the patch applied. (The given state
+    is not modified.)"""
+
+    if state["version"] != patch["base_version"]:
+        raise ValueError(
+            f"Cannot apply patch for version {patch['base_version']} "
+            f"to game state of version {state['version']}."
+        )
+
+    old_players = cast(list[dict[str, Any]], state["players"])
+    player_changes = patch["player_changes"]
+    players = [
+        {
+            **(old_players[i] if i < len(old_players) else {}),
+            **player_changes.get(str(i), {}),
+        }
+        for i in range(patch["player_count"])
+    ]
+
+    return cast(
+        GameStateEvent.DataType,
+        {
+            **state,
+            **patch["changes"],
+            "players": players,
+            "version": patch["version"],
+        },
+    )
+
+
+def compose_game_state_patches(
+    first_patch: GameStatePatchEvent.DataType,
+    second_patch: GameStatePatchEvent.DataType,
+) -> GameStatePatchEvent.DataType:
+    """Combine two consecutive patches into one which has the same effect
+    as applying them in order."""
+
+    if first_patch["version"] != second_patch["base_version"]:
+        raise ValueError(
+            f"Cannot compose patch for version {second_patch['base_version']} "
+            f"after patch to version {first_patch['version']}."
+        )
+
+    first_player_changes = first_patch["player_changes"]
+    second_player_changes = second_patch["player_changes"]
+    player_changes: dict[str, dict[str, Any]] = {}
+    for i in range(second_patch["player_count"]):
+        key = str(i)
+        changed_fields = {
+            **first_player_changes.get(key, {}),
+            **second_player_changes.get(key, {}),
+        }
+        if changed_fields:
+            player_changes[key] = changed_fields
+
+    return GameStatePatchEvent.DataType(
+        base_version=first_patch["base_version"],
+        version=second_patch["version"],
+        changes={**first_patch["changes"], **second_patch["changes"]},
+        player_count=second_patch["player_count"],
+        player_changes=player_changes,
+    )
@@ -1,24 +1,86 @@
 import json
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, TypedDict
+from typing import Any, ClassVar, TypedDict
 
 from tuno.shared.rules import GameRules
 
 from .deck import BasicCardColor, Card, Deck
+from .event_encoding import (
+    COMPACT_EVENT_ENCODING,
+    DEFAULT_EVENT_ENCODING,
+    EventEncoding,
+    encode_event_data,
+)
 
 
 class ServerSentEvent(ABC):
 
     type: str
     data: Any = None
-
-    def to_sse(self) -> str:
-        result = f"event: {self.type}\n"
+    coalescing_key: ClassVar[str | None] = None
+    """Events of the same non-`None` key supersede each other in queues."""
+    id: str | None = None
+    """The id of the event in the stream, assigned when it's sent (if ever)."""
+
+    # frames are cached with the ids they were encoded with, so that a frame
+    # encoded concurrently with `assign_id()` is never taken as current
+    __encoded: tuple[str | None, bytes] | None = None
+    __encoded_compact: tuple[str | None, bytes] | None = None
+    __encoded_data: bytes | None = None
+
+    def to_sse(self, encoding: EventEncoding = DEFAULT_EVENT_ENCODING) -> str:
+        return self.__to_sse(self.id, encoding)
+
+    def __to_sse(self, id: str | None, encoding: EventEncoding) -> str:
+        result = "" if id is None else f"id: {id}\n"
+        result += f"event: {self.type}\n"
         if self.data != None:
-            result += f"data: {json.dumps(self.data)}\n"
+            result += f"data: {encode_event_data(self.type, self.data, encoding)}\n"
         return result + "\n"
 
+    def encode(self) -> bytes:
+        """Return the SSE frame of this event as bytes.
+
+        The frame is serialized only once and cached on the event, so that
+        it can be shared by all subscribers. Therefore, the event (including
+        its data) must not be mutated after being encoded.
+        """
+        id = self.id
+        encoded = self.__encoded
+        if (encoded is None) or (encoded[0] != id):
+            encoded = self.__encoded = (
+                id,
+                self.__to_sse(id, DEFAULT_EVENT_ENCODING).encode(),
+            )
+        return encoded[1]
+
+    def encode_compact(self) -> bytes:
+        """Return the SSE frame of this event in the compact encoding
+        (see `tuno.shared.event_encoding`), which is cached like `encode()`."""
+        id = self.id
+        encoded = self.__encoded_compact
+        if (encoded is None) or (encoded[0] != id):
+            encoded = self.__encoded_compact = (
+                id,
+                self.__to_sse(id, COMPACT_EVENT_ENCODING).encode(),
+            )
+        return encoded[1]
+
+    def assign_id(self, id: str) -> None:
+        """Assign the id of the event, so that frames encoded before (e.g.
+        the latest game state encoded before being sent) are re-encoded
+        with the id. (Safe to call while other threads encode the event.)"""
+        self.id = id
+
+    def encode_data(self) -> bytes:
+        """Return the data of this event as JSON bytes, which is cached
+        like `encode()` (e.g. for conditional REST responses)."""
+        encoded_data = self.__encoded_data
+        if encoded_data is None:
+            encoded_data = self.__encoded_data = json.dumps(self.data).encode()
+        return encoded_data
+
 
 @dataclass
 class EndOfConnectionEvent(ServerSentEvent):
@@ -29,6 +91,7 @@ class EndOfConnectionEvent(ServerSentEvent):
     """
 
     type = "end_of_connection"
+    coalescing_key = "end_of_connection"  # never dropped
     data: str
     """A message that explains the end of connection."""
 
@@ -58,6 +121,7 @@ class GameStateEvent(ServerSentEvent):
         card_count: int
 
     class DataType(TypedDict):
+        version: int
         started: bool
         rules: GameRules
         draw_pile_size: int
@@ -71,10 +135,34 @@ class GameStateEvent(ServerSentEvent):
         skip_counter: int
 
     type = "game_state"
+    coalescing_key = "game_state"
+    data: DataType
+
+
+@dataclass
+class GameStatePatchEvent(ServerSentEvent):
+    """
+    This event carries only the changes of game state between two versions.
+    It should be applied only to a local state of exactly `base_version`;
+    otherwise, the receiver should wait for the next full `GameStateEvent`.
+    """
+
+    class DataType(TypedDict):
+        base_version: int
+        version: int
+        changes: dict[str, Any]
+        """Changed fields of game state except `players` and `version`."""
+        player_count: int
+        player_changes: dict[str, dict[str, Any]]
+        """Changed fields of each player, keyed by player index."""
+
+    type = "game_state_patch"
+    coalescing_key = "game_state"  # upgraded to a keyframe if unapplicable
     data: DataType
 
 
 @dataclass
 class CardsEvent(ServerSentEvent):
     type = "cards"
+    coalescing_key = "cards"
     data: Deck
@@ -0,0 +1,97 @@
+from collections import Counter
+from typing import Any
+
+
+class SimulationStats:
+    """Aggregate statistics of simulated games, which can be merged
+    across workers."""
+
+    player_count: int
+    game_count: int
+    turn_counts: Counter[int]  # turn count -> number of games
+    win_counts: list[int]  # by seat
+    reshuffle_count: int
+    reshuffled_game_count: int
+    out_of_cards_stop_count: int
+    turn_limit_stop_count: int
+
+    def __init__(self, player_count: int) -> None:
+        self.player_count = player_count
+        self.game_count = 0
+        self.turn_counts = Counter()
+        self.win_counts = [0] * player_count
+        self.reshuffle_count = 0
+        self.reshuffled_game_count = 0
+        self.out_of_cards_stop_count = 0
+        self.turn_limit_stop_count = 0
+
+    def add_game(
+        self,
+        *,
+        turn_count: int,
+        winner_index: int,
+        reshuffle_count: int,
+        turn_limit_reached: bool,
+    ) -> None:
+
+        self.game_count += 1
+        self.turn_counts[turn_count] += 1
+        self.reshuffle_count += reshuffle_count
+        if reshuffle_count > 0:
+            self.reshuffled_game_count += 1
+
+        if winner_index >= 0:
+            self.win_counts[winner_index] += 1
+        elif turn_limit_reached:
+            self.turn_limit_stop_count += 1
+        else:
+            self.out_of_cards_stop_count += 1
+
+    def merge(self, other: "SimulationStats") -> None:
+        assert other.player_count == self.player_count
+        self.game_count += other.game_count
+        self.turn_counts.update(other.turn_counts)
+        for seat, win_count in enumerate(other.win_counts):
+            self.win_counts[seat] += win_count
+        self.reshuffle_count += other.reshuffle_count
+        self.reshuffled_game_count += other.reshuffled_game_count
+        self.out_of_cards_stop_count += other.out_of_cards_stop_count
+        self.turn_limit_stop_count += other.turn_limit_stop_count
+
+    def get_turn_count_percentile(self, percentage: float) -> int:
+        rank = percentage / 100 * self.game_count
+        accumulated_count = 0
+        for turn_count in sorted(self.turn_counts):
+            accumulated_count += self.turn_counts[turn_count]
+            if accumulated_count >= rank:
+                return turn_count
+        return 0
+
+    def to_json(self) -> dict[str, Any]:
+
+        game_count = max(self.game_count, 1)  # avoid division by zero
+
+        return {
+            "games": self.game_count,
+            "turns": {
+                "mean": round(
+                    sum(
+                        turn_count * count
+                        for turn_count, count in self.turn_counts.items()
+                    )
+                    / game_count,
+                    2,
+                ),
+                "p50": self.get_turn_count_percentile(50),
+                "p90": self.get_turn_count_percentile(90),
+                "p99": self.get_turn_count_percentile(99),
+                "max": max(self.turn_counts, default=0),
+            },
+            "win_rates_by_seat": [
+                round(win_count / game_count, 4) for win_count in self.win_counts
+            ],
+            "reshuffles_per_game": round(self.reshuffle_count / game_count, 4),
+            "reshuffled_game_rate": round(self.reshuffled_game_count / game_count, 4),
+            "out_of_cards_stops": self.out_of_cards_stop_count,
+            "turn_limit_stops": self.turn_limit_stop_count,
+        }
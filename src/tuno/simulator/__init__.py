@@ -0,0 +1,137 @@
+import click
+
+from tuno.shared.constraints import (
+    DEFAULT_INITIAL_HAND_SIZE,
+    MAX_INITIAL_HAND_SIZE,
+    MAX_PLAYER_CAPACITY,
+    MIN_INITIAL_HAND_SIZE,
+    MIN_PLAYER_CAPACITY,
+)
+
+
+@click.command("simulate")
+@click.option(
+    "-n",
+    "--games",
+    "game_count",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Number of games to simulate",
+)
+@click.option(
+    "-p",
+    "--players",
+    "player_count",
+    type=click.IntRange(min=MIN_PLAYER_CAPACITY, max=MAX_PLAYER_CAPACITY),
+    default=4,
+    show_default=True,
+    help="Number of players (all played by bots)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "worker_count",
+    type=click.IntRange(min=1),
+    default=None,
+    show_default="CPU count",
+    help="Number of worker processes",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of games per batch (stats are printed after each batch)",
+)
+@click.option(
+    "--seed",
+    default=None,
+    help="Seed of random numbers (random if not given)",
+)
+@click.option(
+    "--initial-hand-size",
+    type=click.IntRange(min=MIN_INITIAL_HAND_SIZE, max=MAX_INITIAL_HAND_SIZE),
+    default=DEFAULT_INITIAL_HAND_SIZE,
+    show_default=True,
+    help="Rule: initial hand size",
+)
+@click.option(
+    "--any-last-play/--no-any-last-play",
+    default=True,
+    show_default=True,
+    help="Rule: allow non-number card as last play",
+)
+def start_simulator(
+    game_count: int,
+    player_count: int,
+    worker_count: int | None,
+    batch_size: int,
+    seed: str | None,
+    initial_hand_size: int,
+    any_last_play: bool,
+) -> None:
+    """Simulate games played by bots and print statistics.
+
+    Games are run in batches by a pool of worker processes, and the
+    aggregate statistics are printed as a JSON line after each batch.
+    (The last line contains the statistics of all games.)
+
+    Games follow the rules of the server, without its locks and events,
+    so up to the player capacity can be simulated. (Games in which not
+    all hands can be dealt are counted as out-of-cards stops.)
+    """
+
+    import json
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from functools import partial
+    from secrets import token_hex
+    from time import perf_counter
+
+    from .simulate_games import simulate_games
+    from .SimulationStats import SimulationStats
+
+    if seed is None:
+        seed = token_hex(8)
+    if worker_count is None:
+        worker_count = os.cpu_count() or 1
+
+    rules = {
+        "initial_hand_size": initial_hand_size,
+        "any_last_play": any_last_play,
+    }
+    simulate_batch = partial(simulate_games, player_count=player_count, rules=rules)
+    batch_sizes = [
+        min(batch_size, game_count - batch_begin)
+        for batch_begin in range(0, game_count, batch_size)
+    ]
+
+    stats = SimulationStats(player_count)
+    timestamp_begin = perf_counter()
+
+    def print_stats() -> None:
+        elapsed_seconds = perf_counter() - timestamp_begin
+        click.echo(
+            json.dumps(
+                {
+                    "seed": seed,
+                    "players": player_count,
+                    "rules": rules,
+                    "elapsed_seconds": round(elapsed_seconds, 3),
+                    "games_per_second": round(stats.game_count / elapsed_seconds, 1),
+                    **stats.to_json(),
+                }
+            )
+        )
+
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        futures = [
+            # each batch has its own seed, so results are
+            # reproducible regardless of the number of workers
+            executor.submit(simulate_batch, size, seed=f"{seed}/{batch_index}")
+            for batch_index, size in enumerate(batch_sizes)
+        ]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            print_stats()
@@ -0,0 +1,213 @@
+from collections.abc import Callable, Mapping
+from random import Random
+from typing import Final, NamedTuple
+
+from tuno.server.utils.create_deck import create_deck
+from tuno.server.utils.reshuffle_pile import reshuffle_pile
+from tuno.shared.card_codes import CARD_COLORS, CARD_FACES, CARD_TYPES
+from tuno.shared.card_play_effects import CARD_PLAY_EFFECTS
+from tuno.shared.check_play import PLAYABLE_CARD_MASKS
+from tuno.shared.deck import basic_card_colors
+
+from .SimulationStats import SimulationStats
+
+# games still going on after this many turns are stopped
+MAX_TURN_COUNT = 10000
+
+
+# -- per-code tables --
+IS_NUMBER: Final[tuple[bool, ...]] = tuple(
+    card_type == "number" for card_type in CARD_TYPES
+)
+# (wild cards have no color index, as their colors are claimed)
+COLOR_INDEXES: Final[tuple[int, ...]] = tuple(
+    basic_card_colors.index(color) if color in basic_card_colors else -1
+    for color in CARD_COLORS
+)
+# lead card code -> lead color index -> bitmask of playable codes
+PLAYABLE_CARD_MASKS_BY_LEAD: Final[tuple[tuple[int, ...], ...]] = tuple(
+    PLAYABLE_CARD_MASKS[face] for face in CARD_FACES
+)
+# single-card plays of each code, as (code, claimed color index)
+PLAYS: Final[tuple[tuple[tuple[int, int], ...], ...]] = tuple(
+    (
+        tuple((code, color_index) for color_index in range(len(basic_card_colors)))
+        if color_index < 0
+        else ((code, color_index),)
+    )
+    for code, color_index in enumerate(COLOR_INDEXES)
+)
+
+
+class GameResult(NamedTuple):
+    turn_count: int
+    winner_index: int  # -1 if not won
+    reshuffle_count: int
+    turn_limit_reached: bool
+
+
+def simulate_game(
+    random: Random,
+    *,
+    player_count: int,
+    initial_hand_size: int,
+    any_last_play: bool,
+) -> GameResult:
+    """Play a game of bots by the rules of `Game`, without its locks,
+    events and notifications.
+
+    Hands are bitmasks of card codes (see `get_card_mask()`), and bots
+    play like `Player.bot_play()`. Random numbers are drawn from `random`
+    as the real game draws them from the global generator, so the same
+    seed gives the same games as headless `Game`s do. (Card effects and
+    reshuffles are shared with `Game`, and the rest is checked against it
+    by `benchmarks/simulator_parity.py`.)
+    """
+
+    seed = random.getrandbits(64)
+    draw_pile = create_deck()
+    Random(seed).shuffle(draw_pile)
+    discard_pile = bytearray()
+    reshuffle_count = 0
+
+    def draw_cards(count: int, *, allow_shuffle: bool) -> int | None:
+        """Draw cards off the top of the draw pile and return their mask.
+        (`None` is returned if there are not enough cards to draw.)"""
+
+        nonlocal draw_pile, discard_pile, reshuffle_count
+
+        mask = 0
+        while count > 0:
+            if not draw_pile:
+                if allow_shuffle:
+                    draw_pile, discard_pile = discard_pile, draw_pile
+                    reshuffle_pile(
+                        draw_pile, seed=seed, reshuffle_count=reshuffle_count
+                    )
+                    if draw_pile:
+                        reshuffle_count += 1
+                if not draw_pile:
+                    return None
+            drawn_count = min(count, len(draw_pile))
+            for code in draw_pile[-drawn_count:]:
+                mask |= 1 << code
+            del draw_pile[-drawn_count:]
+            count -= drawn_count
+        return mask
+
+    # -- dispatch initial cards --
+    hands: list[int] = []
+    for _ in range(player_count):
+        hand = draw_cards(initial_hand_size, allow_shuffle=False)
+        if hand is None:
+            return GameResult(0, -1, reshuffle_count, False)
+        hands.append(hand)
+
+    # -- set lead card --
+    while True:
+        if not draw_pile:
+            return GameResult(0, -1, reshuffle_count, False)
+        lead_card = draw_pile.pop()
+        discard_pile.append(lead_card)
+        if IS_NUMBER[lead_card]:
+            break
+    lead_color_index = COLOR_INDEXES[lead_card]
+
+    choice: Callable[[list[tuple[int, int]]], tuple[int, int]] = random.choice
+    current_player_index = 0
+    direction = 1
+    turn_count = 0
+
+    while turn_count < MAX_TURN_COUNT:
+
+        hand = hands[current_player_index]
+        # (skip counters are reset after each turn, so skipped players
+        # never get to play, and their playable cards are not masked)
+        playable_cards = hand & PLAYABLE_CARD_MASKS_BY_LEAD[lead_card][lead_color_index]
+        draw_counter = 0
+        skip_counter = 0
+        out_of_cards = False
+
+        if playable_cards:
+
+            candidates: list[tuple[int, int]] = []
+            while playable_cards:
+                lowest_bit = playable_cards & -playable_cards
+                candidates.extend(PLAYS[lowest_bit.bit_length() - 1])
+                playable_cards ^= lowest_bit
+            lead_card, lead_color_index = choice(candidates)
+
+            hand ^= 1 << lead_card
+            discard_pile.append(lead_card)
+            draw_counter, skip_counter, reverse = CARD_PLAY_EFFECTS[lead_card]
+            if reverse:
+                direction = -direction
+
+            if not hand:
+                if any_last_play or IS_NUMBER[lead_card]:
+                    return GameResult(
+                        turn_count, current_player_index, reshuffle_count, False
+                    )
+                # (there is at least the played card to draw)
+                hand = draw_cards(1, allow_shuffle=True) or 0
+
+        else:  # pass
+            drawn_cards = draw_cards(1, allow_shuffle=True)
+            if drawn_cards is None:
+                out_of_cards = True
+            else:
+                hand |= drawn_cards
+
+        hands[current_player_index] = hand
+
+        if draw_counter > 0:
+            next_player_index = (current_player_index + direction) % player_count
+            drawn_cards = draw_cards(draw_counter, allow_shuffle=True)
+            if drawn_cards is None:
+                out_of_cards = True
+            else:
+                hands[next_player_index] |= drawn_cards
+
+        current_player_index = (
+            current_player_index + direction * (skip_counter + 1)
+        ) % player_count
+        turn_count += 1
+
+        if out_of_cards:  # the game is stopped after the turn
+            return GameResult(turn_count, -1, reshuffle_count, False)
+
+    return GameResult(turn_count, -1, reshuffle_count, True)
+
+
+def simulate_games(
+    game_count: int,
+    *,
+    player_count: int,
+    rules: Mapping[str, object],
+    seed: str,
+) -> SimulationStats:
+    """Simulate games played by bots only (see `simulate_game()`)."""
+
+    random = Random(seed)
+    initial_hand_size = rules["initial_hand_size"]
+    any_last_play = rules["any_last_play"]
+    assert isinstance(initial_hand_size, int)
+    assert isinstance(any_last_play, bool)
+
+    stats = SimulationStats(player_count)
+
+    for _ in range(game_count):
+        result = simulate_game(
+            random,
+            player_count=player_count,
+            initial_hand_size=initial_hand_size,
+            any_last_play=any_last_play,
+        )
+        stats.add_game(
+            turn_count=result.turn_count,
+            winner_index=result.winner_index,
+            reshuffle_count=result.reshuffle_count,
+            turn_limit_reached=result.turn_limit_reached,
+        )
+
+    return stats
@@ -0,0 +1,60 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from tuno.server.models.Game import Game
+from tuno.server.models.GameRegistry import GameRegistry
+from tuno.server.models.Player import Player
+from tuno.server.utils.Logger import Logger, LogLevel
+
+
+def set_connected(game: Game, player: Player, connected: bool) -> None:
+    """Subscribe or unsubscribe the player as the subscription route does."""
+    player.subscription_token = "token" if connected else ""
+    game.check_connection(player)
+
+
+# rooms idle for no time are evicted right away
+@patch("tuno.server.models.GameRegistry.ROOM_IDLE_TIMEOUT", timedelta(0))
+class TestRoomEviction(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Logger.level = LogLevel.ERROR
+        self.registry = GameRegistry()  # its scheduler is not started
+        self.game = self.registry.get_game("room")
+        self.game.update_rules(
+            {"bot_count": 1},
+            operator_name=None,
+            operator_is_player=False,
+        )
+        self.player = self.game.get_player("player", allow_creation=True)
+        set_connected(self.game, self.player, True)
+
+    def test_room_with_connected_player_is_kept(self) -> None:
+        self.game.start("player")
+        self.registry.evict_idle_games()
+        self.assertEqual(self.registry.game_count, 1)
+        self.assertTrue(self.game.started)
+
+    def test_abandoned_started_room_is_evicted(self) -> None:
+        self.game.start("player")
+        set_connected(self.game, self.player, False)
+        self.assertIn(self.player, self.game.get_players())  # kept in the game
+        self.registry.evict_idle_games()
+        self.assertEqual(self.registry.game_count, 0)
+        self.assertFalse(self.game.started)
+
+    def test_abandoned_started_room_waits_for_timeout(self) -> None:
+        self.game.start("player")
+        set_connected(self.game, self.player, False)
+        with patch(
+            "tuno.server.models.GameRegistry.ROOM_IDLE_TIMEOUT",
+            timedelta(minutes=5),
+        ):
+            self.registry.evict_idle_games()
+        self.assertEqual(self.registry.game_count, 1)
+        self.assertTrue(self.game.started)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from time import sleep
+
+from tuno.server import create_app
+from tuno.server.models.GameRegistry import game_registry
+from tuno.server.utils.Logger import LogLevel
+
+
+class TestReadRoutes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = create_app(log_level=LogLevel.ERROR).test_client()
+
+    def test_missing_room_is_not_created(self) -> None:
+        game_count = game_registry.game_count
+        for path in (
+            "/api/rooms/missing/game/state",
+            "/api/rooms/missing/player/someone/cards",
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(game_registry.game_count, game_count)
+
+    def test_existing_room_is_read_without_being_accessed(self) -> None:
+        game = game_registry.get_game("existing")
+        game.get_player("someone", allow_creation=True)  # not connected
+        sleep(0.1)
+        for path in (
+            "/api/rooms/existing/game/state",
+            "/api/rooms/existing/player/someone/cards",
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+        self.assertTrue(game.is_idle(0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()